@@ -4,7 +4,12 @@
             ENDPOINTS: {
                 GET_ACTIVITIES: '/activities',
                 REGISTER_ACTIVITY: '/activities/register'
-            }
+            },
+            // field ที่ card ใช้จริง (ส่งเป็น ?fields= ให้ API อ่าน/ส่งเฉพาะเท่านี้)
+            ACTIVITY_CARD_FIELDS: [
+                'activityId', 'name', 'description', 'startDateTime', 'endDateTime',
+                'skillCategory', 'level', 'skillLevel', 'plo', 'imageUrl', 'locationId', 'locationName'
+            ]
         };
         
         // Global variables
@@ -92,10 +97,13 @@
             // Build API URL
             let apiUrl = CONFIG.API_BASE_URL + CONFIG.ENDPOINTS.GET_ACTIVITIES;
 
+            const params = new URLSearchParams({ fields: CONFIG.ACTIVITY_CARD_FIELDS.join(',') });
+
             // Add PLO filter (จาก tab) ถ้ามี
             if (skillType && skillType !== 'all') {
-            apiUrl += `?plo=${encodeURIComponent(skillType)}`;
+            params.set('plo', skillType);
             }
+            apiUrl += `?${params.toString()}`;
 
             console.log('[ADVISOR-ACT] Fetch URL =', apiUrl);
 
@@ -30,6 +30,35 @@
       loadStudentData(currentStudentId);
     });
 
+    // แสดงข้อมูลนักศึกษาบนหน้าเว็บ
+    function renderStudentInfo(data) {
+      document.getElementById('student-name').textContent = data.name || '-';
+      document.getElementById('student-year').textContent = data.yearLevel || '-';
+      document.getElementById('student-faculty').textContent = 'วิทยาศาสตร์และเทคโนโลยี';
+      document.getElementById('student-department').textContent = data.department || 'วิทยาการคอมพิวเตอร์';
+    }
+
+    // ดึงข้อมูลทั้งหมดของนักศึกษาในครั้งเดียว (info, requiredSkills, activities, skills)
+    async function fetchStudentOverview(studentId) {
+      const response = await fetch(`${API_BASE_URL}/students/${studentId}/overview`, {
+        headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+      });
+      
+      if (!response.ok) throw new Error(`API error ${response.status}`);
+      return await response.json();
+    }
+
+    // ดึงข้อมูลทีละส่วนแบบเดิม (ใช้เมื่อ /overview ใช้งานไม่ได้)
+    async function fetchStudentDataSeparately(studentId) {
+      const studentInfo = await fetchStudentInfo(studentId);
+      const [requiredSkills, activities, completedSkills] = await Promise.all([
+        fetchRequiredSkills(studentInfo.yearLevel),
+        fetchStudentActivities(studentId),
+        fetchCompletedSkills(studentId)
+      ]);
+      return { studentInfo, requiredSkills, activities, completedSkills };
+    }
+
     // ฟังก์ชันดึงข้อมูลนักศึกษาจาก API
     async function fetchStudentInfo(studentId) {
       try {
@@ -47,11 +76,7 @@
         
         const data = await response.json();
         
-        // Update student info on webpage
-        document.getElementById('student-name').textContent = data.name || '-';
-        document.getElementById('student-year').textContent = data.yearLevel || '-';
-        document.getElementById('student-faculty').textContent = 'วิทยาศาสตร์และเทคโนโลยี';
-        document.getElementById('student-department').textContent = data.department || 'วิทยาการคอมพิวเตอร์';
+        renderStudentInfo(data);
         
         return data;
         
@@ -161,17 +186,19 @@
     // ฟังก์ชันหลักที่โหลดข้อมูลนักศึกษา
     async function loadStudentData(studentId) {
       try {
-        // ดึงข้อมูลนักศึกษา
-        const studentInfo = await fetchStudentInfo(studentId);
-        
-        // ดึงทักษะบังคับสำหรับชั้นปี
-        const requiredSkills = await fetchRequiredSkills(studentInfo.yearLevel);
-        
-        // ดึงกิจกรรมที่นักศึกษาเข้าร่วม
-        const activities = await fetchStudentActivities(studentId);
-        
-        // ดึงทักษะที่ได้รับจริงๆ (ผ่านแบบทดสอบแล้ว)
-        const completedSkills = await fetchCompletedSkills(studentId);
+        // ดึงข้อมูลนักศึกษา ทักษะบังคับ กิจกรรม และทักษะที่ได้รับ ในคำขอเดียว
+        let studentInfo, requiredSkills, activities, completedSkills;
+        try {
+          const overview = await fetchStudentOverview(studentId);
+          studentInfo = overview.info;
+          requiredSkills = overview.requiredSkills;
+          activities = overview.activities;
+          completedSkills = overview.skills;
+          renderStudentInfo(studentInfo);
+        } catch (error) {
+          console.error('Error fetching student overview, falling back:', error);
+          ({ studentInfo, requiredSkills, activities, completedSkills } = await fetchStudentDataSeparately(studentId));
+        }
         
         // นับจำนวนกิจกรรมต่อทักษะ (ต้องทำแบบประเมินเสร็จ)
         const skillActivityCount = countActivitiesPerSkill(activities, requiredSkills);
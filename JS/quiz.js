@@ -5,6 +5,7 @@
     let currentUser = null;
     let skillId = null;
     let questions = [];
+    let quizToken = null;
     let currentQuestionIndex = 0;
     let answers = {};
     let startTime = null;
@@ -49,6 +50,7 @@
         
         const data = await response.json();
         questions = data.questions;
+        quizToken = data.quizToken;
         timeLimit = data.timeLimit || 15;
         
         // Update UI with skill name from API
@@ -214,7 +216,8 @@
             studentId: currentUser.studentId || currentUser.userId,
             skillId: skillId,
             answers: answersArray,
-            startedAt: startTime
+            startedAt: startTime,
+            quizToken: quizToken
           })
         });
         
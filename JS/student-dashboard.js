@@ -51,31 +51,24 @@ async function loadAllSkillData(studentId) {
             throw new Error("ไม่สามารถคำนวณชั้นปีของนักศึกษาได้ (จาก auth-check.js)");
         }
 
-        // 2. เรียก API (getStudentSkillsSummary.py)
-        const skillsApiUrl = `${API_BASE_URL}/students/${studentId}/skills?yearLevel=${studentYear}`;
-        console.log("📡 student-dashboard.js: Calling API:", skillsApiUrl); // LOG 6: กำลังเรียก API
-        
-        const skillsResponse = await fetch(skillsApiUrl, {
-             headers: {
-                'Authorization': `Bearer ${window.userToken}`
-            }
-        });
-        
-        console.log("📈 student-dashboard.js: API response status:", skillsResponse.status); // LOG 7: สถานะ API
-
-        if (!skillsResponse.ok) {
-             throw new Error(`API call failed with status: ${skillsResponse.status}`);
+        // 2. เรียก API (getStudentDashboard.py) ได้ info + summary ในคำขอเดียว
+        //    ถ้าใช้ไม่ได้ให้กลับไปใช้ getStudentSkillsSummary.py แบบเดิม (ข้อมูลส่วนตัวใช้ของ auth-check.js)
+        let summary;
+        try {
+            const dashboardApiUrl = `${API_BASE_URL}/students/${studentId}/dashboard`;
+            console.log("📡 student-dashboard.js: Calling API:", dashboardApiUrl); // LOG 6: กำลังเรียก API
+            const dashboard = await fetchSkillSummary(dashboardApiUrl, result => result.data);
+            displayStudentInfo(dashboard.info);
+            summary = dashboard.summary;
+        } catch (bootstrapError) {
+            console.warn('⚠️ student-dashboard.js: Dashboard bootstrap failed, falling back:', bootstrapError);
+            const skillsApiUrl = `${API_BASE_URL}/students/${studentId}/skills?yearLevel=${studentYear}`;
+            console.log("📡 student-dashboard.js: Calling API:", skillsApiUrl);
+            summary = await fetchSkillSummary(skillsApiUrl, result => result.data);
         }
-        
-        const result = await skillsResponse.json(); 
-        console.log("📊 student-dashboard.js: API response data:", result); // LOG 8: ข้อมูลที่ได้รับ
 
-        if (result.success && result.data) {
-            // 3. ส่ง "ผลสรุป" (Summary) ไปแสดงผล
-            displaySkillProgress(result.data);
-        } else {
-            throw new Error(result.error || "รูปแบบข้อมูลที่ได้รับจาก API ไม่ถูกต้อง");
-        }
+        // 3. ส่ง "ผลสรุป" (Summary) ไปแสดงผล
+        displaySkillProgress(summary);
 
     } catch (error) {
         console.error('❌ student-dashboard.js: Error loading skill data:', error); // LOG ERROR
@@ -84,6 +77,45 @@ async function loadAllSkillData(studentId) {
     }
 }
 
+// เรียก API แล้วดึง "ผลสรุป" ออกจาก response ด้วย pickSummary
+async function fetchSkillSummary(apiUrl, pickSummary) {
+    const response = await fetch(apiUrl, {
+         headers: {
+            'Authorization': `Bearer ${window.userToken}`
+        }
+    });
+    
+    console.log("📈 student-dashboard.js: API response status:", response.status); // LOG 7: สถานะ API
+
+    if (!response.ok) {
+         throw new Error(`API call failed with status: ${response.status}`);
+    }
+    
+    const result = await response.json(); 
+    console.log("📊 student-dashboard.js: API response data:", result); // LOG 8: ข้อมูลที่ได้รับ
+
+    if (!result.success || !result.data) {
+        throw new Error(result.error || "รูปแบบข้อมูลที่ได้รับจาก API ไม่ถูกต้อง");
+    }
+    return pickSummary(result);
+}
+
+// แสดงข้อมูลนักศึกษาจากตาราง Students (ทับค่าที่ auth-check.js ใส่ไว้จาก token)
+function displayStudentInfo(info) {
+    if (!info) return;
+    const fields = {
+        'student-name': info.name,
+        'student-year': info.yearLevel ? `ปี ${info.yearLevel}` : '',
+        'student-department': info.department
+    };
+    Object.keys(fields).forEach(id => {
+        const element = document.getElementById(id);
+        if (element && fields[id]) {
+            element.textContent = fields[id];
+        }
+    });
+}
+
 // ฟังก์ชันแสดงความคืบหน้า (รับ "ผลสรุป" มาแสดงผล)
 function displaySkillProgress(summary) {
     console.log("✍️ student-dashboard.js: displaySkillProgress() called with summary:", summary); // LOG 9: เริ่มแสดงผล
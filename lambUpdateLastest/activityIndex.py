@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import bisect
+import threading
+from dynamoUtils import client_scan_items
+from activityTime import activity_epochs, to_epoch
+
+# Facet index ของ Activities ในหน่วยความจำ (สร้างครั้งเดียวต่อ warm container)
+# - กิจกรรมเรียงตาม activityId แล้วใช้ลำดับเป็นตำแหน่ง bit
+# - postings[facet][value] = bitmap (int) ของกิจกรรมที่มีค่านั้น
+# filter หลายตัว = AND ของ bitmap, หลายค่าใน facet เดียว (?plo=PLO1,PLO2) = OR
+# ช่วงเวลา (?from=&to=&upcoming=) ใช้ startEpoch/endEpoch ที่เรียงไว้ + bisect
+# สร้างใหม่เมื่อ version ของ Activities เปลี่ยน (refCache.bump_version) หรือเมื่อเกิน TTL ถ้าไม่มี version
+
+ACTIVITY_INDEX_TTL = int(os.getenv('ACTIVITY_INDEX_TTL', '60'))   # วินาที (ใช้เมื่อไม่ได้ตั้ง REF_VERSION_TABLE)
+
+FACETS = ('plo', 'skillCategory', 'yearLevel', 'level', 'skillId')
+
+# ที่นั่งที่ลงทะเบียนแล้วเปลี่ยนทุกครั้งที่มีคนลงทะเบียน/ยกเลิก ไม่เก็บใน index (ซึ่ง cache ตาม version)
+# หน้าเว็บอ่านที่นั่งคงเหลือจาก getActivitySeats แทน
+SEAT_FIELDS = ('registeredCount',)
+
+_index = None
+_lock = threading.Lock()
+
+
+def normalize_category(cat):
+    """ ทำให้ category ทุกแบบ normalize เป็นค่าเดียวกัน """
+    if not cat:
+        return ''
+    c = cat.strip().lower().replace('_', '-').replace(' ', '-')
+    if c in ['hardskill', 'hard-skill', 'hard']:
+        return 'hard skill'
+    if c in ['softskill', 'soft-skill', 'soft']:
+        return 'soft skill'
+    if c in ['multi', 'multi-skill', 'multiskill', 'multi-skill']:
+        return 'multi-skill'
+    return cat.strip().lower()
+
+
+def _plo_codes(raw):
+    # รองรับทั้ง list, string JSON '["PLO1","PLO2"]' และ string "PLO1,PLO2"
+    if isinstance(raw, str):
+        try:
+            parsed = json.loads(raw)
+            raw = parsed if isinstance(parsed, list) else [parsed]
+        except ValueError:
+            raw = raw.split(',')
+    return {str(code).strip().upper() for code in raw or [] if str(code).strip()}
+
+
+def _year_level(value):
+    return str(int(value))
+
+
+def _facet_values(activity):
+    """ค่าของแต่ละ facet ของกิจกรรม (normalize แบบเดียวกับค่าที่มากับ query string)"""
+    values = {
+        'plo': _plo_codes(activity.get('plo')),
+        'skillCategory': {normalize_category(activity.get('skillCategory'))},
+        'level': {str(activity.get('level') or '').strip()},
+        # รองรับของเก่า activityGroup
+        'skillId': {str(activity.get('skillId') or activity.get('activityGroup') or '').strip()},
+        'yearLevel': set(),
+    }
+    try:
+        values['yearLevel'] = {_year_level(activity['yearLevel'])}
+    except (KeyError, TypeError, ValueError):
+        pass    # ไม่มี yearLevel หรือไม่ใช่ตัวเลข
+    return {facet: {value for value in facet_values if value} for facet, facet_values in values.items()}
+
+
+def _sorted_by_time(entries):
+    entries.sort()
+    return [epoch for epoch, _ in entries], [position for _, position in entries]
+
+
+def build_index(activities):
+    activities = sorted(
+        ({k: v for k, v in activity.items() if k not in SEAT_FIELDS} for activity in activities),
+        key=lambda activity: activity.get('activityId', '')
+    )
+    postings = {facet: {} for facet in FACETS}
+    starts, ends = [], []
+    for position, activity in enumerate(activities):
+        bit = 1 << position
+        for facet, values in _facet_values(activity).items():
+            for value in values:
+                postings[facet][value] = postings[facet].get(value, 0) | bit
+
+        start_epoch, end_epoch = activity_epochs(activity)
+        if start_epoch is not None:
+            starts.append((start_epoch, position))
+            ends.append((end_epoch if end_epoch is not None else start_epoch, position))
+
+    start_epochs, start_positions = _sorted_by_time(starts)
+    end_epochs, end_positions = _sorted_by_time(ends)
+    return {
+        'activities': activities,
+        'ids': [activity.get('activityId', '') for activity in activities],
+        'postings': postings,
+        'all': (1 << len(activities)) - 1,
+        'startEpochs': start_epochs,
+        'startPositions': start_positions,
+        'endEpochs': end_epochs,
+        'endPositions': end_positions,
+    }
+
+
+def _is_fresh(index, version):
+    if index is None:
+        return False
+    if version is not None:
+        return index['version'] == version
+    return time.time() - index['loadedAt'] < ACTIVITY_INDEX_TTL
+
+
+def get_activity_index(version=None):
+    """
+    index ของ container นี้
+    version = refCache.read_version('Activities') ถ้าไม่เท่าเดิมจะสร้างใหม่ (None = ใช้ TTL แทน)
+    """
+    global _index
+    index = _index
+    if _is_fresh(index, version):
+        return index
+
+    with _lock:
+        index = _index
+        if _is_fresh(index, version):
+            return index
+
+        started = time.time()
+        index = build_index(client_scan_items('Activities'))
+        index.update(version=version, loadedAt=time.time())
+        _index = index
+        print(f"[activityIndex] indexed {len(index['activities'])} activities "
+              f"in {round((time.time() - started) * 1000)} ms (version={version})")
+        return index
+
+
+def parse_filters(query_params):
+    """
+    แปลง query string เป็น {facet: {values}} (ไม่ระบุ หรือ 'all' = ไม่ filter facet นั้น)
+    yearLevel ที่ไม่ใช่ตัวเลข -> ValueError
+    """
+    normalizers = {
+        'plo': lambda v: v.upper(),
+        'skillCategory': normalize_category,
+        'yearLevel': _year_level,
+        'level': lambda v: v,
+        'skillId': lambda v: v,
+    }
+    params = dict(query_params)
+    if not params.get('skillId') and params.get('activityGroup'):
+        params['skillId'] = params['activityGroup']
+
+    filters = {}
+    for facet, normalize in normalizers.items():
+        raw = (params.get(facet) or '').strip()
+        if not raw or raw.lower() == 'all':
+            continue
+        filters[facet] = {normalize(value.strip()) for value in raw.split(',') if value.strip()}
+    return filters
+
+
+def _query_epoch(value, end_of_day=False):
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    epoch = to_epoch(value)
+    # วันที่อย่างเดียว (YYYY-MM-DD) ของ to = รวมทั้งวันนั้น
+    if end_of_day and len(value) == 10:
+        epoch += 24 * 60 * 60 - 1
+    return epoch
+
+
+def parse_time_window(query_params, now=None):
+    """
+    ?from=&to= (ISO 8601 หรือ epoch seconds) = กิจกรรมที่ช่วงเวลาคาบเกี่ยวกับ [from, to]
+    ?upcoming=true = กิจกรรมที่ยังไม่เริ่ม
+    คืน {'startMin', 'startMax', 'endMin'} เฉพาะเงื่อนไขที่มี อ่านเวลาไม่ได้ -> ValueError
+    """
+    window = {}
+    if query_params.get('from'):
+        window['endMin'] = _query_epoch(query_params['from'])
+    if query_params.get('to'):
+        window['startMax'] = _query_epoch(query_params['to'], end_of_day=True)
+    if query_params.get('upcoming') == 'true':
+        # ปัดเป็นนาที ให้ ETag ของ request ในนาทีเดียวกันตรงกัน
+        window['startMin'] = int(now if now is not None else time.time()) // 60 * 60
+    return window
+
+
+def _positions_mask(positions):
+    mask = 0
+    for position in positions:
+        mask |= 1 << position
+    return mask
+
+
+def window_mask(index, window):
+    """bitmap ของกิจกรรมในช่วงเวลา (window จาก parse_time_window, {} = ทุกกิจกรรม)"""
+    mask = index['all']
+    if 'startMin' in window or 'startMax' in window:
+        epochs = index['startEpochs']
+        lo = bisect.bisect_left(epochs, window['startMin']) if 'startMin' in window else 0
+        hi = bisect.bisect_right(epochs, window['startMax']) if 'startMax' in window else len(epochs)
+        mask &= _positions_mask(index['startPositions'][lo:hi])
+    if 'endMin' in window:
+        lo = bisect.bisect_left(index['endEpochs'], window['endMin'])
+        mask &= _positions_mask(index['endPositions'][lo:])
+    return mask
+
+
+def match(index, filters, skip=None, base=None):
+    """
+    bitmap ของกิจกรรมที่ผ่านทุก filter (skip = facet ที่ไม่ต้องนับ ใช้ตอนนับ facet)
+    base = bitmap ตั้งต้น เช่นจาก window_mask (None = ทุกกิจกรรม)
+    """
+    mask = index['all'] if base is None else base
+    for facet, values in filters.items():
+        if facet == skip:
+            continue
+        postings = index['postings'][facet]
+        facet_mask = 0
+        for value in values:
+            facet_mask |= postings.get(value, 0)
+        mask &= facet_mask
+    return mask
+
+
+def _count(mask):
+    return bin(mask).count('1')
+
+
+def facet_counts(index, filters, base=None):
+    """
+    จำนวนกิจกรรมต่อค่าของแต่ละ facet สำหรับ sidebar
+    นับโดยใช้ filter ของ facet อื่นทั้งหมด (ยกเว้นตัวเอง) ให้เลือกค่าอื่นใน facet เดียวกันเพิ่มได้
+    """
+    counts = {}
+    for facet in FACETS:
+        mask = match(index, filters, skip=facet, base=base)
+        counts[facet] = {
+            value: count
+            for value, count in ((value, _count(posting & mask)) for value, posting in index['postings'][facet].items())
+            if count
+        }
+    return counts
+
+
+def select(index, mask, after=None, limit=None):
+    """
+    กิจกรรมตาม bitmap เรียงตาม activityId
+    after = activityId ตัวสุดท้ายของหน้าก่อน คืน (activities, มีหน้าถัดไปหรือไม่)
+    """
+    if after is not None:
+        start = bisect.bisect_right(index['ids'], after)
+        mask &= ~((1 << start) - 1)
+
+    activities = []
+    while mask:
+        if limit is not None and len(activities) == limit:
+            return activities, True
+        lowest = mask & -mask
+        activities.append(index['activities'][lowest.bit_length() - 1])
+        mask ^= lowest
+    return activities, False
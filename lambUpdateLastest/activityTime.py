@@ -0,0 +1,41 @@
+from datetime import datetime, timezone, timedelta
+
+# เวลาใน Activities เก็บเป็น ISO string หลายแบบ ('Z', '+07:00', ไม่มี timezone = เวลาไทย)
+# startEpoch/endEpoch (epoch seconds) ที่ addActivities เขียนไว้ใช้เทียบช่วงเวลาได้ตรง ๆ ไม่ต้อง parse string
+
+THAI_TZ = timezone(timedelta(hours=7))
+
+
+def parse_activity_time(value):
+    """
+    แปลงเวลาใน database เป็น datetime (เวลาไทย)
+    รองรับ 'Z' (UTC), '+07:00' และแบบไม่มี timezone (ถือว่าเป็นเวลาไทย)
+    """
+    if value.endswith('Z'):
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc).astimezone(THAI_TZ)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=THAI_TZ)
+    return parsed
+
+
+def to_epoch(value):
+    """ISO string -> epoch seconds (อ่านไม่ได้ -> ValueError)"""
+    return int(parse_activity_time(value).timestamp())
+
+
+def activity_epochs(activity):
+    """
+    (startEpoch, endEpoch) ของกิจกรรม ใช้ค่าที่เก็บไว้ถ้ามี ไม่งั้นคำนวณจาก startDateTime/endDateTime
+    ค่าที่ไม่มีหรืออ่านไม่ได้เป็น None
+    """
+    epochs = []
+    for epoch_key, text_key in (('startEpoch', 'startDateTime'), ('endEpoch', 'endDateTime')):
+        if activity.get(epoch_key) is not None:
+            epochs.append(int(activity[epoch_key]))
+            continue
+        try:
+            epochs.append(to_epoch(activity[text_key]))
+        except (KeyError, TypeError, ValueError):
+            epochs.append(None)
+    return tuple(epochs)
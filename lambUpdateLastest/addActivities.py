@@ -1,17 +1,21 @@
 import json
 import os
 import uuid
-import boto3
 import datetime
-from decimal import Decimal
 from botocore.exceptions import ClientError
+from awsClients import dynamodb
+from jsonUtils import dumps, event_body, JSON_CONTENT_TYPE
+from refCache import bump_version
+from activityTime import to_epoch
 
-dynamodb = boto3.resource('dynamodb')
 ACTIVITIES_TABLE = os.getenv('ACTIVITIES_TABLE', 'Activities')
 SKILLS_TABLE = os.getenv('SKILLS_TABLE', 'Skills')
 
 ALLOWED_LEVELS = {'พื้นฐาน', 'ปานกลาง', 'ขั้นสูง'}
 
+# ช่วงเวลาสแกน QR ยืนยันการเข้าร่วม (ก่อน/หลังเวลาเริ่มกิจกรรม)
+CHECKIN_WINDOW_MINUTES = 30
+
 
 def _now_iso():
     return datetime.datetime.utcnow().replace(
@@ -41,21 +45,16 @@ def compute_category_from_plos(plos):
     return ''
 
 
-def _to_json_compat(o):
-    if isinstance(o, Decimal):
-        return int(o) if o % 1 == 0 else float(o)
-    raise TypeError
-
-
 def json_response(status, body):
     return {
         'statusCode': status,
         'headers': {
             'Access-Control-Allow-Origin': '*',
+            'Content-Type': JSON_CONTENT_TYPE,
             'Access-Control-Allow-Headers': 'Content-Type,Authorization',
             'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
         },
-        'body': json.dumps(body, default=_to_json_compat),
+        'body': dumps(body),
     }
 
 
@@ -68,7 +67,7 @@ def lambda_handler(event, context):
         return json_response(405, {'error': 'Method Not Allowed'})
 
     try:
-        body = json.loads(event.get('body') or '{}')
+        body = json.loads(event_body(event) or '{}')
 
         # ===== ข้อมูลหลัก =====
         name = (body.get('name') or '').strip()
@@ -82,10 +81,11 @@ def lambda_handler(event, context):
         if not endDateTime:
             return json_response(400, {'error': 'endDateTime is required (ISO string)'})
 
+        # parse ด้วยกติกาเดียวกับฝั่ง query (activityTime): ไม่มี timezone = เวลาไทย
         try:
-            start_dt = datetime.datetime.fromisoformat(startDateTime.replace('Z', '+00:00'))
-            end_dt = datetime.datetime.fromisoformat(endDateTime.replace('Z', '+00:00'))
-            if end_dt <= start_dt:
+            start_epoch = to_epoch(startDateTime)
+            end_epoch = to_epoch(endDateTime)
+            if end_epoch <= start_epoch:
                 return json_response(400, {'error': 'endDateTime must be after startDateTime'})
         except Exception:
             return json_response(400, {'error': 'Invalid datetime format (must be ISO 8601)'})
@@ -122,6 +122,11 @@ def lambda_handler(event, context):
         if year_level is None:
             year_level = _parse_int(body.get('suitableYearLevel'), default=None)
 
+        # capacity (จำนวนที่นั่ง) ไม่ระบุ = ไม่จำกัด
+        capacity = _parse_int(body.get('capacity'), default=None)
+        if capacity is not None and capacity <= 0:
+            return json_response(400, {'error': 'capacity must be a positive integer'})
+
         # activityGroup ไม่ใช้แล้ว แต่เผื่อรับจาก frontend เก่าเอาไว้เป็น fallback
         skillId = (body.get('skillId') or '').strip() or None
 
@@ -142,8 +147,16 @@ def lambda_handler(event, context):
             #'activityGroup': activityGroup,
             'yearLevel': year_level,
             'requiredActivities': body.get('requiredActivities'),
+            'capacity': capacity,
+            'registeredCount': 0 if capacity else None,
             'imageUrl': body.get('imageUrl'),
             'organizerId': body.get('organizerId'),
+            # epoch seconds ของเวลาเริ่ม/จบ ใช้ query ช่วงเวลา (?from=&to=&upcoming=) โดยไม่ต้อง parse ISO string
+            'startEpoch': start_epoch,
+            'endEpoch': end_epoch,
+            # คำนวณช่วงเวลายืนยันไว้ล่วงหน้า (epoch seconds) ให้ verifyActivityCode ใช้ตรง ๆ
+            'confirmStartEpoch': start_epoch - CHECKIN_WINDOW_MINUTES * 60,
+            'confirmEndEpoch': start_epoch + CHECKIN_WINDOW_MINUTES * 60,
             'createdAt': _now_iso(),
             'updatedAt': _now_iso(),
         }
@@ -153,6 +166,8 @@ def lambda_handler(event, context):
 
         table = dynamodb.Table(ACTIVITIES_TABLE)
         table.put_item(Item=item)
+        # ให้ ETag ของ getActivities / getActivityDetail เปลี่ยนตาม
+        bump_version(ACTIVITIES_TABLE)
 
         return json_response(201, {'success': True, 'activity': item})
 
@@ -0,0 +1,38 @@
+import os
+import threading
+import boto3
+from botocore.config import Config
+
+# boto3 session/client กลางของทุก Lambda (สร้างครั้งเดียวต่อ container แล้วใช้ซ้ำทุก invocation)
+# ค่าเริ่มต้นของ botocore: retry แบบ legacy, pool 10 connection, ไม่มี keep-alive, read timeout 60 วินาที
+
+# ต้องพอสำหรับ ioPool.gather (IO_POOL_SIZE) + parallel scan (SCAN_SEGMENTS) ที่รันพร้อมกัน
+MAX_POOL_CONNECTIONS = int(os.getenv('MAX_POOL_CONNECTIONS', '25'))
+CONNECT_TIMEOUT = float(os.getenv('AWS_CONNECT_TIMEOUT', '2'))    # วินาที
+READ_TIMEOUT = float(os.getenv('AWS_READ_TIMEOUT', '5'))          # วินาที
+MAX_ATTEMPTS = int(os.getenv('AWS_MAX_ATTEMPTS', '5'))
+
+CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': MAX_ATTEMPTS},
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+    tcp_keepalive=True,
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+)
+
+_session = boto3.session.Session()
+
+# DynamoDB ใช้ทุก handler จึงสร้างตอน import (ช่วง init ของ Lambda ไม่นับเวลา invocation แรก)
+dynamodb = _session.resource('dynamodb', config=CLIENT_CONFIG)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def client(service_name):
+    """low-level client ของ service อื่น (เช่น s3) สร้างครั้งแรกที่เรียกแล้วเก็บไว้ใช้ซ้ำ"""
+    if service_name not in _clients:
+        with _clients_lock:
+            if service_name not in _clients:
+                _clients[service_name] = _session.client(service_name, config=CLIENT_CONFIG)
+    return _clients[service_name]
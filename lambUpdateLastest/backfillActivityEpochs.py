@@ -0,0 +1,70 @@
+from botocore.exceptions import ClientError
+from dynamoUtils import scan_items
+from activityTime import to_epoch
+from refCache import bump_version
+from awsClients import dynamodb
+from jsonUtils import dumps
+
+# Migration: เติม startEpoch/endEpoch ให้กิจกรรมเดิม (กิจกรรมใหม่ addActivities เขียนให้แล้ว)
+# คำนวณจาก startDateTime/endDateTime ('Z', '+07:00' หรือไม่มี timezone = เวลาไทย)
+# รันซ้ำได้: แถวที่ค่าถูกต้องอยู่แล้วจะไม่ถูกเขียนทับ
+
+ACTIVITIES_TABLE = 'Activities'
+
+
+def backfill_activity_epochs():
+    table = dynamodb.Table(ACTIVITIES_TABLE)
+    updated = skipped = 0
+
+    for activity in scan_items(
+        ACTIVITIES_TABLE,
+        ProjectionExpression='activityId, startDateTime, endDateTime, startEpoch, endEpoch'
+    ):
+        activity_id = activity['activityId']
+        try:
+            start_epoch = to_epoch(activity['startDateTime'])
+            end_epoch = to_epoch(activity['endDateTime']) if activity.get('endDateTime') else start_epoch
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Skip {activity_id}: cannot parse start/end time ({e})")
+            skipped += 1
+            continue
+
+        if activity.get('startEpoch') == start_epoch and activity.get('endEpoch') == end_epoch:
+            continue
+
+        table.update_item(
+            Key={'activityId': activity_id},
+            UpdateExpression='SET startEpoch = :start, endEpoch = :end',
+            ConditionExpression='attribute_exists(activityId)',
+            ExpressionAttributeValues={':start': start_epoch, ':end': end_epoch}
+        )
+        updated += 1
+
+    if updated:
+        # ให้ activityIndex / ETag ของกิจกรรมรู้ว่าข้อมูลเปลี่ยน
+        bump_version(ACTIVITIES_TABLE)
+
+    print(f"Backfilled startEpoch/endEpoch on {updated} activities (skipped {skipped})")
+    return updated, skipped
+
+
+def lambda_handler(event, context):
+    """
+    Backfill job (เรียกเองครั้งเดียวหลัง deploy)
+    """
+    try:
+        updated, skipped = backfill_activity_epochs()
+        return {
+            'statusCode': 200,
+            'body': dumps({'success': True, 'updated': updated, 'skipped': skipped})
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    backfill_activity_epochs()
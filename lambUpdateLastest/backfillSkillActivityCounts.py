@@ -0,0 +1,83 @@
+import os
+from datetime import datetime, timezone, timedelta
+from botocore.exceptions import ClientError
+from dynamoUtils import batch_get_items, scan_items
+from awsClients import dynamodb
+from jsonUtils import dumps
+
+
+SKILL_COUNTS_TABLE = os.getenv('SKILL_COUNTS_TABLE', 'StudentSkillActivityCounts')
+
+
+def rebuild_skill_counts():
+    """
+    สร้างตัวนับกิจกรรมที่ยืนยันแล้วต่อ (studentId, skillId) ใหม่ทั้งหมด
+    จาก ActivityParticipations (isConfirmed = true) + skillId ของ Activities
+    """
+    confirmed = list(scan_items(
+        'ActivityParticipations',
+        FilterExpression='isConfirmed = :confirmed',
+        ExpressionAttributeValues={':confirmed': True},
+        ProjectionExpression='studentId, activityId'
+    ))
+    print(f"Found {len(confirmed)} confirmed participations")
+
+    activity_map = batch_get_items(
+        'Activities', 'activityId', [p.get('activityId') for p in confirmed]
+    )
+
+    # (studentId, skillId) -> activityId ที่ยืนยันแล้ว (verifyActivityCode ใช้กันนับซ้ำ)
+    counts = {}
+    for participation in confirmed:
+        activity = activity_map.get(participation.get('activityId'))
+        skill_id = activity.get('skillId') if activity else None
+        if skill_id and participation.get('studentId'):
+            counts.setdefault((participation['studentId'], skill_id), set()).add(participation['activityId'])
+
+    updated_at = datetime.now(timezone(timedelta(hours=7))).isoformat()
+    counts_table = dynamodb.Table(SKILL_COUNTS_TABLE)
+
+    # ตัวนับเก่าที่ไม่มีกิจกรรมยืนยันแล้วรองรับ (เช่นกิจกรรมถูกย้าย skill) ต้องลบทิ้ง
+    stale_keys = [
+        item for item in scan_items(SKILL_COUNTS_TABLE, ProjectionExpression='studentId, skillId')
+        if (item['studentId'], item['skillId']) not in counts
+    ]
+
+    # เขียนทับค่าเดิมทั้งหมด (ค่าที่ได้คือค่าที่ถูกต้องจากข้อมูลจริง)
+    with counts_table.batch_writer(overwrite_by_pkeys=['studentId', 'skillId']) as batch:
+        for key in stale_keys:
+            batch.delete_item(Key={'studentId': key['studentId'], 'skillId': key['skillId']})
+        for (student_id, skill_id), activity_ids in counts.items():
+            batch.put_item(Item={
+                'studentId': student_id,
+                'skillId': skill_id,
+                'confirmedCount': len(activity_ids),
+                'activityIds': activity_ids,
+                'updatedAt': updated_at
+            })
+
+    print(f"Wrote {len(counts)} skill activity counters to {SKILL_COUNTS_TABLE} "
+          f"(removed {len(stale_keys)} stale)")
+    return len(counts)
+
+
+def lambda_handler(event, context):
+    """
+    Backfill job (เรียกเองครั้งเดียว หรือรันซ้ำเมื่อต้องการซ่อมตัวนับ)
+    """
+    try:
+        written = rebuild_skill_counts()
+        return {
+            'statusCode': 200,
+            'body': dumps({'success': True, 'countersWritten': written})
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    rebuild_skill_counts()
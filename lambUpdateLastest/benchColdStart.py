@@ -0,0 +1,58 @@
+import sys
+import json
+import time
+import importlib
+
+# วัดเวลา cold start ของ client กลาง (awsClients) เทียบกับ boto3.resource แบบค่าเริ่มต้น
+# - import: เวลาสร้าง session + resource ตอน import module
+# - firstCall: request แรก (DNS + TLS handshake + credential lookup)
+# - warmCall: request ถัดไปบน connection เดิม (keep-alive)
+# ผลที่ได้จะตรงกับ cold start จริงเฉพาะเมื่อรันใน container ใหม่ (invocation แรก หรือรันเป็น script)
+BENCH_CALLS = 5
+
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _time_calls(dynamodb_client):
+    started = time.perf_counter()
+    dynamodb_client.describe_limits()
+    first_call = _ms(started)
+
+    warm_calls = []
+    for _ in range(BENCH_CALLS):
+        started = time.perf_counter()
+        dynamodb_client.describe_limits()
+        warm_calls.append(_ms(started))
+
+    return {'firstCall': first_call, 'warmCall': sorted(warm_calls)[len(warm_calls) // 2]}
+
+
+def bench_cold_start():
+    results = {}
+
+    cold_import = 'awsClients' not in sys.modules
+    started = time.perf_counter()
+    aws_clients = importlib.import_module('awsClients')
+    results['shared'] = {'import': _ms(started), 'coldImport': cold_import,
+                         **_time_calls(aws_clients.dynamodb.meta.client)}
+
+    import boto3
+    started = time.perf_counter()
+    default_resource = boto3.session.Session().resource('dynamodb')
+    results['default'] = {'import': _ms(started), **_time_calls(default_resource.meta.client)}
+
+    print(json.dumps(results, indent=2))
+    return results
+
+
+def lambda_handler(event, context):
+    return {
+        'statusCode': 200,
+        'body': json.dumps(bench_cold_start())
+    }
+
+
+if __name__ == '__main__':
+    bench_cold_start()
@@ -0,0 +1,63 @@
+import os
+import sys
+import gzip
+import json
+import time
+
+# Benchmark: เวลา CPU ที่ใช้บีบอัดเทียบกับจำนวน bytes ที่ลดได้ ของ response getActivities ขนาดต่าง ๆ
+# ใช้กิจกรรมจาก export (AWSDynamoDB/Activities) ทำซ้ำให้ได้จำนวนตาม BENCH_SIZES
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')   # ไม่ได้เรียก AWS จริง แต่ boto3 ต้องมี region ตอนสร้าง resource
+
+from dynamoUtils import deserialize_item
+from jsonUtils import dumps
+from benchDeserializer import load_export_items
+from httpCompression import brotli
+
+BENCH_SIZES = (10, 100, 1000, 10000)
+BENCH_ROUNDS = 5
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 5, 11)
+
+
+def _best_ms(func):
+    best = None
+    for _ in range(BENCH_ROUNDS):
+        started = time.process_time()
+        func()
+        elapsed = (time.process_time() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def bench_compression(sizes=BENCH_SIZES):
+    activities = [deserialize_item(item) for item in load_export_items('Activities')]
+
+    codecs = {f'gzip-{level}': (lambda data, level=level: gzip.compress(data, compresslevel=level))
+              for level in GZIP_LEVELS}
+    if brotli is not None:
+        codecs.update({f'br-{quality}': (lambda data, quality=quality: brotli.compress(data, quality=quality))
+                       for quality in BROTLI_QUALITIES})
+
+    results = {}
+    for size in sizes:
+        payload = (activities * (size // len(activities) + 1))[:size]
+        data = dumps(payload).encode('utf-8')
+        results[size] = {'bytes': len(data)}
+        for name, compress in codecs.items():
+            results[size][name] = {
+                'cpuMs': _best_ms(lambda: compress(data)),
+                'bytes': len(compress(data)),
+            }
+        print(f"{size} activities: {json.dumps(results[size])}")
+    return results
+
+
+def lambda_handler(event, context):
+    return {
+        'statusCode': 200,
+        'body': json.dumps(bench_compression())
+    }
+
+
+if __name__ == '__main__':
+    bench_compression([int(size) for size in sys.argv[1:]] or BENCH_SIZES)
@@ -0,0 +1,102 @@
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import decimal
+
+# Microbenchmark: resource path (TypeDeserializer -> Decimal -> DecimalEncoder)
+# เทียบกับ client path (dynamoUtils.deserialize_item -> json.dumps ตรง ๆ)
+# ใช้ item จริงจาก export ใน AWSDynamoDB/<table>/data/*.json.gz แล้วทำซ้ำให้ได้ BENCH_ITEMS รายการ
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')   # ไม่ได้เรียก AWS จริง แต่ boto3 ต้องมี region ตอนสร้าง resource
+
+from boto3.dynamodb.types import TypeDeserializer
+from dynamoUtils import deserialize_item
+
+EXPORT_DIR = os.getenv('EXPORT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'AWSDynamoDB'))
+BENCH_TABLES = ('Activities', 'Students', 'QuizQuestions', 'ActivityParticipations')
+BENCH_ITEMS = int(os.getenv('BENCH_ITEMS', '5000'))
+BENCH_ROUNDS = 5
+
+
+class DecimalEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, decimal.Decimal):
+            return float(o) if o % 1 > 0 else int(o)
+        if isinstance(o, set):
+            return list(o)
+        return super(DecimalEncoder, self).default(o)
+
+
+def _plain_default(o):
+    # client path ได้ int/float แล้ว เหลือแค่ set และ Decimal ที่เกิน 15 หลัก
+    if isinstance(o, set):
+        return list(o)
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def load_export_items(table_name):
+    items = []
+    for path in glob.glob(os.path.join(EXPORT_DIR, table_name, 'data', '*.json.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            items.extend(json.loads(line)['Item'] for line in f if line.strip())
+    return items
+
+
+def _best_ms(func):
+    best = None
+    for _ in range(BENCH_ROUNDS):
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2)
+
+
+def bench_table(table_name):
+    items = load_export_items(table_name)
+    if not items:
+        return None
+    items = (items * (BENCH_ITEMS // len(items) + 1))[:BENCH_ITEMS]
+    deserializer = TypeDeserializer()
+
+    def resource_path():
+        rows = [{k: deserializer.deserialize(v) for k, v in item.items()} for item in items]
+        json.dumps(rows, cls=DecimalEncoder)
+
+    def client_path():
+        rows = [deserialize_item(item) for item in items]
+        json.dumps(rows, default=_plain_default)
+
+    resource_ms = _best_ms(resource_path)
+    client_ms = _best_ms(client_path)
+    return {
+        'items': len(items),
+        'resourceMs': resource_ms,
+        'clientMs': client_ms,
+        'speedup': round(resource_ms / client_ms, 2) if client_ms else None
+    }
+
+
+def bench_deserializer(tables=BENCH_TABLES):
+    results = {}
+    for table_name in tables:
+        result = bench_table(table_name)
+        if result:
+            results[table_name] = result
+            print(f"{table_name}: {json.dumps(result)}")
+    return results
+
+
+def lambda_handler(event, context):
+    return {
+        'statusCode': 200,
+        'body': json.dumps(bench_deserializer())
+    }
+
+
+if __name__ == '__main__':
+    bench_deserializer(sys.argv[1:] or BENCH_TABLES)
@@ -0,0 +1,124 @@
+import os
+import json
+import random
+from benchUtils import require_local_endpoint, create_table, put_items, percentiles, timed_ms, add_latency
+
+# Benchmark: p50/p99 ของ handler ที่อ่านหลายตารางผ่าน ioPool.gather เทียบกับอ่านทีละตัว (แบบเดิม)
+# - issueCertification: participation + certificate + activity + student
+# - getActivityDetail: activity + PLOs + Locations (PLOs/Locations มาจาก refCache หลัง request แรก)
+# แบบ sequential แทน gather ของ handler ด้วยการเรียกทีละ call ตามลำดับ (ผลเหมือนกัน)
+# BENCH_LATENCY_MS หน่วงทุก request เพื่อจำลอง round trip ไป DynamoDB จริง (endpoint ในเครื่องแทบไม่มี latency)
+#
+# ผลที่วัดได้ (moto_server บนเครื่อง 1 vCPU, 200 request, p50 / p99 ms):
+#   BENCH_LATENCY_MS=0:  issueCertification sequential 63.5 / 98.4   gather 60.2 / 108.3
+#                        getActivityDetail  sequential 7.3 / 21.9    gather 7.7 / 12.0
+#   BENCH_LATENCY_MS=10: issueCertification sequential 114.7 / 182.3 gather 78.7 / 111.5
+#                        getActivityDetail  sequential 19.8 / 32.4   gather 20.4 / 38.2
+#   getActivityDetail ไม่เร็วขึ้นเพราะหลัง request แรก PLOs/Locations มาจาก cache เหลือ I/O จริงแค่ get_item เดียว
+BENCH_REQUESTS = int(os.getenv('BENCH_REQUESTS', '200'))
+BENCH_LATENCY_MS = float(os.getenv('BENCH_LATENCY_MS', '0'))
+BENCH_STUDENTS = 50
+BENCH_ACTIVITIES = 20
+
+
+def sequential_gather(calls, timeout=None, timeouts=None):
+    return {name: func() for name, func in calls.items()}
+
+
+def seed_tables(dynamodb, make_participation_id, participation_index):
+    students = [f'65{n:08d}' for n in range(BENCH_STUDENTS)]
+    activities = [f'ACT{n:04d}' for n in range(BENCH_ACTIVITIES)]
+
+    put_items(create_table(dynamodb, 'Students', [('studentId', 'HASH')], {'studentId': 'S'}), (
+        {'studentId': student_id, 'name': f'Student {student_id}', 'yearLevel': 2} for student_id in students
+    ))
+    put_items(create_table(dynamodb, 'Activities', [('activityId', 'HASH')], {'activityId': 'S'}), (
+        {
+            'activityId': activity_id,
+            'name': f'Activity {activity_id}',
+            'plo': ['PLO1', 'PLO2'],
+            'locationId': 'LOC1',
+            'startDateTime': '2026-01-01T09:00:00+07:00',
+        }
+        for activity_id in activities
+    ))
+    put_items(create_table(dynamodb, 'PLOs', [('plo', 'HASH')], {'plo': 'S'}), (
+        {'plo': plo, 'ploFullName': f'{plo} full name', 'skillCategory': 'hard skill'} for plo in ('PLO1', 'PLO2')
+    ))
+    put_items(create_table(dynamodb, 'Locations', [('locationId', 'HASH')], {'locationId': 'S'}), [
+        {'locationId': 'LOC1', 'locationName': 'Main hall'}
+    ])
+    put_items(create_table(
+        dynamodb, 'ActivityParticipations',
+        [('participationId', 'HASH'), ('activityId', 'RANGE')],
+        {'participationId': 'S', 'activityId': 'S', 'studentId': 'S'},
+        indexes=[(participation_index, [('studentId', 'HASH'), ('activityId', 'RANGE')])]
+    ), (
+        {
+            'participationId': make_participation_id(student_id, activity_id),
+            'studentId': student_id,
+            'activityId': activity_id,
+            'isConfirmed': True,
+            'surveyCompleted': True,
+        }
+        for student_id in students for activity_id in activities
+    ))
+    # มี certificate อยู่แล้ว handler จะไม่เขียนอะไรเพิ่ม (วัดเฉพาะการอ่าน)
+    put_items(create_table(
+        dynamodb, 'Certificates', [('studentId', 'HASH'), ('activityId', 'RANGE')],
+        {'studentId': 'S', 'activityId': 'S'}
+    ), (
+        {
+            'studentId': student_id,
+            'activityId': activity_id,
+            'certificateId': f'{student_id}-{activity_id}',
+            'issuedAt': '2026-01-01T12:00:00+07:00',
+            'status': 'issued',
+        }
+        for student_id in students for activity_id in activities
+    ))
+    return students, activities
+
+
+def bench_gather():
+    require_local_endpoint()
+    # import หลังตรวจ endpoint: awsClients สร้าง client ตอน import
+    from awsClients import dynamodb
+    from participationUtils import make_participation_id, PARTICIPATION_INDEX
+    import ioPool
+    import issueCertification
+    import getActivityDetail
+
+    students, activities = seed_tables(dynamodb, make_participation_id, PARTICIPATION_INDEX)
+    add_latency(dynamodb, BENCH_LATENCY_MS)
+
+    requests = {
+        'issueCertification': lambda student_id, activity_id: issueCertification.lambda_handler({
+            'pathParameters': {'activityId': activity_id}, 'queryStringParameters': {'studentId': student_id}
+        }, None),
+        'getActivityDetail': lambda student_id, activity_id: getActivityDetail.lambda_handler({
+            'pathParameters': {'activityId': activity_id}
+        }, None),
+    }
+    modules = {'issueCertification': issueCertification, 'getActivityDetail': getActivityDetail}
+
+    results = {}
+    for name, request in requests.items():
+        results[name] = {}
+        for mode, gather in (('sequential', sequential_gather), ('gather', ioPool.gather)):
+            modules[name].gather = gather
+            request(students[0], activities[0])    # warm refCache / connection
+            samples = []
+            for _ in range(BENCH_REQUESTS):
+                response, elapsed = timed_ms(request, random.choice(students), random.choice(activities))
+                if response['statusCode'] != 200:
+                    raise AssertionError(f"{name} returned {response['statusCode']}: {response['body']}")
+                samples.append(elapsed)
+            results[name][mode] = percentiles(samples)
+        modules[name].gather = ioPool.gather
+        print(f"{name} (latency={BENCH_LATENCY_MS} ms): {json.dumps(results[name])}")
+    return results
+
+
+if __name__ == '__main__':
+    bench_gather()
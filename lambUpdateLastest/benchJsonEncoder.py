@@ -0,0 +1,66 @@
+import sys
+import json
+import time
+import decimal
+from boto3.dynamodb.types import TypeDeserializer
+from benchDeserializer import load_export_items
+import jsonUtils
+
+# Benchmark: DecimalEncoder แบบเดิม (JSONEncoder subclass) เทียบกับ jsonUtils.dumps
+# ใช้ payload รายการกิจกรรมจาก export (AWSDynamoDB/Activities) ที่แปลงแบบ resource API (ตัวเลขเป็น Decimal)
+BENCH_SIZES = (1000, 10000)
+BENCH_ROUNDS = 5
+
+
+class DecimalEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, decimal.Decimal):
+            return float(o) if o % 1 > 0 else int(o)
+        return super(DecimalEncoder, self).default(o)
+
+
+def _best_ms(func, payload):
+    best = None
+    for _ in range(BENCH_ROUNDS):
+        started = time.perf_counter()
+        func(payload)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2)
+
+
+def bench_json_encoder(sizes=BENCH_SIZES):
+    deserializer = TypeDeserializer()
+    activities = [
+        {k: deserializer.deserialize(v) for k, v in item.items()}
+        for item in load_export_items('Activities')
+    ]
+
+    encoders = {
+        'decimalEncoder': lambda payload: json.dumps(payload, cls=DecimalEncoder),
+        'jsonUtilsStdlib': jsonUtils._encoder.encode,
+    }
+    if jsonUtils.orjson is not None:
+        encoders['jsonUtilsOrjson'] = jsonUtils.dumps
+
+    results = {}
+    for size in sizes:
+        payload = (activities * (size // len(activities) + 1))[:size]
+        results[size] = {name: _best_ms(encode, payload) for name, encode in encoders.items()}
+        results[size]['bytes'] = {
+            'decimalEncoder': len(json.dumps(payload, cls=DecimalEncoder).encode('utf-8')),
+            'jsonUtils': len(jsonUtils.dumps(payload).encode('utf-8')),
+        }
+        print(f"{size} activities: {json.dumps(results[size])}")
+    return results
+
+
+def lambda_handler(event, context):
+    return {
+        'statusCode': 200,
+        'body': json.dumps(bench_json_encoder())
+    }
+
+
+if __name__ == '__main__':
+    bench_json_encoder([int(size) for size in sys.argv[1:]] or BENCH_SIZES)
@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import random
+from benchUtils import require_local_endpoint, create_table, put_items, percentiles, timed_ms
+
+# Benchmark: latency ของการหา participation หนึ่งแถวตาม (studentId, activityId) เมื่อตารางโตขึ้น
+# - gsi: participationUtils.find_participation (query บน studentId-activityId-index)
+# - scan: แบบเดิม scan ทั้งตารางด้วย FilterExpression (วัดเฉพาะตารางไม่เกิน BENCH_SCAN_MAX_ROWS แถว)
+# ใส่ข้อมูลเพิ่มทีละขั้นตาม BENCH_SIZES ในตาราง ActivityParticipations ของ DynamoDB จำลองในเครื่อง
+#
+# ผลที่วัดได้ (moto_server บนเครื่อง 1 vCPU, p50 / p99 ms):
+#   1,000 แถว:  gsi 50.7 / 72.8    scan 83.0 / 89.6
+#   10,000 แถว: gsi 556 / 1,182   scan 764 / 2,148
+#   50,000 แถว: gsi 3,115 / 4,348 (ไม่ได้วัด scan)
+#   moto ไม่มี index จริง (query บน GSI ไล่ทุก item) latency ของ gsi จึงยังโตตามจำนวนแถว
+#   ต้องรันกับ DynamoDB Local หรือ DynamoDB จริงถึงจะเห็น latency คงที่ (ยังไม่ได้วัด รวมถึงที่ 1M แถว)
+BENCH_SIZES = (1000, 10000, 100000)
+BENCH_LOOKUPS = int(os.getenv('BENCH_LOOKUPS', '200'))
+BENCH_SCAN_LOOKUPS = int(os.getenv('BENCH_SCAN_LOOKUPS', '5'))
+BENCH_SCAN_MAX_ROWS = int(os.getenv('BENCH_SCAN_MAX_ROWS', '10000'))
+ACTIVITIES_PER_STUDENT = 10
+
+
+def _row(n, make_participation_id):
+    student_id = f'65{n // ACTIVITIES_PER_STUDENT:08d}'
+    activity_id = f'ACT{n % 997:04d}'
+    return {
+        'participationId': make_participation_id(student_id, activity_id),
+        'studentId': student_id,
+        'activityId': activity_id,
+        'registeredAt': f'2026-01-01T00:00:{n % 60:02d}.{n:06d}Z',
+        'isConfirmed': False,
+    }
+
+
+def bench_participation_lookup(sizes=BENCH_SIZES):
+    require_local_endpoint()
+    # import หลังตรวจ endpoint: awsClients สร้าง client ตอน import
+    from awsClients import dynamodb
+    from dynamoUtils import scan_items
+    from participationUtils import (
+        PARTICIPATIONS_TABLE, PARTICIPATION_INDEX, ACTIVITY_PARTICIPATION_INDEX,
+        find_participation, make_participation_id
+    )
+
+    table = create_table(
+        dynamodb, PARTICIPATIONS_TABLE,
+        [('participationId', 'HASH'), ('activityId', 'RANGE')],
+        {'participationId': 'S', 'activityId': 'S', 'studentId': 'S', 'registeredAt': 'S'},
+        indexes=[
+            (PARTICIPATION_INDEX, [('studentId', 'HASH'), ('activityId', 'RANGE')]),
+            (ACTIVITY_PARTICIPATION_INDEX, [('activityId', 'HASH'), ('registeredAt', 'RANGE')]),
+        ]
+    )
+
+    def scan_lookup(student_id, activity_id):
+        return next(scan_items(
+            PARTICIPATIONS_TABLE,
+            FilterExpression='studentId = :studentId AND activityId = :activityId',
+            ExpressionAttributeValues={':studentId': student_id, ':activityId': activity_id}
+        ), None)
+
+    results = {}
+    seeded = 0
+    for size in sorted(sizes):
+        put_items(table, (_row(n, make_participation_id) for n in range(seeded, size)))
+        seeded = size
+
+        targets = [_row(random.randrange(size), make_participation_id) for _ in range(BENCH_LOOKUPS)]
+        samples = []
+        for target in targets:
+            found, elapsed = timed_ms(find_participation, target['studentId'], target['activityId'])
+            if not found:
+                raise AssertionError(f"missing participation {target['participationId']}")
+            samples.append(elapsed)
+        results[size] = {'gsi': percentiles(samples)}
+
+        if size <= BENCH_SCAN_MAX_ROWS:
+            samples = [timed_ms(scan_lookup, t['studentId'], t['activityId'])[1] for t in targets[:BENCH_SCAN_LOOKUPS]]
+            results[size]['scan'] = percentiles(samples)
+
+        print(f"rows={size}: {json.dumps(results[size])}")
+    return results
+
+
+if __name__ == '__main__':
+    bench_participation_lookup(tuple(int(arg) for arg in sys.argv[1:]) or BENCH_SIZES)
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import time
+from benchUtils import require_local_endpoint, create_table, put_items
+
+# Benchmark: throughput ของ dynamoUtils.scan_items ตามจำนวน segment (parallel scan)
+# สร้างตาราง BENCH_TABLE ใน DynamoDB จำลองในเครื่อง ใส่ BENCH_ROWS แถว (ขนาดราว BENCH_ITEM_BYTES)
+# แล้ว scan ทั้งตารางด้วย segments = 1, 2, 4, 8 วัด items/s (ดีที่สุดจาก BENCH_ROUNDS รอบ)
+# ตัวเลขจาก DynamoDB Local / moto บอกแนวโน้มเท่านั้น: server จำลองใช้ CPU เครื่องเดียวกับ client
+# ขณะที่ DynamoDB จริงแต่ละ segment อ่านจาก partition ของตัวเองพร้อมกันได้
+#
+# ผลที่วัดได้ (moto_server บนเครื่อง 1 vCPU, 20,000 แถว x ~1 KB, ดีที่สุดจาก 3 รอบ):
+#   segments=1: 1,492 items/s, 2: 1,572 items/s, 4: 1,636 items/s, 8: 1,406 items/s
+#   แทบไม่เพิ่มเพราะ server จำลองกับ client ใช้ CPU core เดียวกัน (ไม่ได้วัดกับ DynamoDB จริง)
+BENCH_TABLE = os.getenv('BENCH_TABLE', 'BenchScanSegments')
+BENCH_ROWS = int(os.getenv('BENCH_ROWS', '20000'))
+BENCH_ITEM_BYTES = int(os.getenv('BENCH_ITEM_BYTES', '1000'))
+BENCH_SEGMENTS = (1, 2, 4, 8)
+BENCH_ROUNDS = 3
+
+
+def seed_table(dynamodb):
+    table = create_table(dynamodb, BENCH_TABLE, [('id', 'HASH')], {'id': 'S'})
+    padding = 'x' * BENCH_ITEM_BYTES
+    put_items(table, ({'id': f'item{n:08d}', 'n': n, 'padding': padding} for n in range(BENCH_ROWS)))
+    return table
+
+
+def bench_scan_segments(segment_counts=BENCH_SEGMENTS):
+    require_local_endpoint()
+    # import หลังตรวจ endpoint: awsClients สร้าง client ตอน import
+    from awsClients import dynamodb
+    from dynamoUtils import scan_items
+
+    seed_table(dynamodb)
+    results = {}
+    for segments in segment_counts:
+        best = None
+        for _ in range(BENCH_ROUNDS):
+            started = time.perf_counter()
+            count = sum(1 for _ in scan_items(BENCH_TABLE, segments=segments))
+            elapsed = time.perf_counter() - started
+            if count != BENCH_ROWS:
+                raise AssertionError(f'segments={segments} returned {count} of {BENCH_ROWS} items')
+            best = elapsed if best is None else min(best, elapsed)
+        results[segments] = {'seconds': round(best, 3), 'itemsPerSecond': round(BENCH_ROWS / best)}
+        print(f"segments={segments}: {json.dumps(results[segments])}")
+    return results
+
+
+if __name__ == '__main__':
+    bench_scan_segments(tuple(int(arg) for arg in sys.argv[1:]) or BENCH_SEGMENTS)
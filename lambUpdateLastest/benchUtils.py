@@ -0,0 +1,87 @@
+import os
+import time
+
+# ของกลางสำหรับ benchmark / load test ที่รันกับ DynamoDB จำลองในเครื่อง
+# (DynamoDB Local หรือ moto_server) ผ่าน AWS_ENDPOINT_URL_DYNAMODB ที่ boto3 อ่านเองตอนสร้าง client เช่น
+#   AWS_ENDPOINT_URL_DYNAMODB=http://localhost:8000 AWS_ACCESS_KEY_ID=local AWS_SECRET_ACCESS_KEY=local \
+#   AWS_DEFAULT_REGION=us-east-1 python benchScanSegments.py
+# script พวกนี้สร้าง/ลบตารางเอง จึงไม่ยอมรันถ้าไม่ได้ชี้ไปที่ endpoint ในเครื่อง
+LOCAL_ENDPOINT_ENV = 'AWS_ENDPOINT_URL_DYNAMODB'
+LOCAL_HOSTS = ('localhost', '127.0.0.1', 'dynamodb-local')
+
+
+def require_local_endpoint():
+    """คืน endpoint ในเครื่อง ถ้าไม่ได้ตั้งหรือไม่ใช่เครื่องตัวเองจะ raise RuntimeError"""
+    endpoint = os.getenv(LOCAL_ENDPOINT_ENV, '')
+    if not any(host in endpoint for host in LOCAL_HOSTS):
+        raise RuntimeError(f'{LOCAL_ENDPOINT_ENV} must point to a local DynamoDB (got {endpoint!r})')
+    return endpoint
+
+
+def create_table(dynamodb, table_name, key_schema, attribute_types, indexes=()):
+    """
+    สร้างตารางใหม่ (ลบของเดิมก่อน) แบบ PAY_PER_REQUEST
+    key_schema: [(name, 'HASH'|'RANGE')], attribute_types: {name: 'S'|'N'}
+    indexes: [(index_name, [(name, 'HASH'|'RANGE')])] เป็น GSI ที่ project ALL
+    """
+    client = dynamodb.meta.client
+    if table_name in client.list_tables()['TableNames']:
+        client.delete_table(TableName=table_name)
+        client.get_waiter('table_not_exists').wait(TableName=table_name)
+
+    def keys(schema):
+        return [{'AttributeName': name, 'KeyType': key_type} for name, key_type in schema]
+
+    params = {
+        'TableName': table_name,
+        'KeySchema': keys(key_schema),
+        'AttributeDefinitions': [{'AttributeName': name, 'AttributeType': t} for name, t in attribute_types.items()],
+        'BillingMode': 'PAY_PER_REQUEST',
+    }
+    if indexes:
+        params['GlobalSecondaryIndexes'] = [
+            {'IndexName': index_name, 'KeySchema': keys(schema), 'Projection': {'ProjectionType': 'ALL'}}
+            for index_name, schema in indexes
+        ]
+    client.create_table(**params)
+    client.get_waiter('table_exists').wait(TableName=table_name)
+    return dynamodb.Table(table_name)
+
+
+def put_items(table, items):
+    with table.batch_writer() as writer:
+        for item in items:
+            writer.put_item(Item=item)
+
+
+def percentiles(samples_ms):
+    """p50 / p99 / max (มิลลิวินาที) ของ list เวลา"""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {}
+
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+
+    return {'count': len(ordered), 'p50': pick(0.50), 'p99': pick(0.99), 'max': round(ordered[-1], 2)}
+
+
+def timed_ms(func, *args, **kwargs):
+    """เรียก func แล้วคืน (ผลลัพธ์, เวลาที่ใช้เป็นมิลลิวินาที)"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def add_latency(dynamodb, latency_ms):
+    """
+    หน่วงทุก request ของ client ไว้ latency_ms ก่อนส่ง (จำลอง round trip ไป DynamoDB จริง ซึ่ง endpoint ในเครื่องไม่มี)
+    ใช้ event before-send ของ botocore กับ client ที่ awsClients สร้างไว้
+    """
+    if latency_ms <= 0:
+        return
+
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+
+    dynamodb.meta.client.meta.events.register('before-send.dynamodb', delay)
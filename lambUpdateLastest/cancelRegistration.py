@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timezone, timedelta
+from botocore.exceptions import ClientError
+from dynamoUtils import cancellation_reasons
+from participationUtils import find_participation, release_seat
+from awsClients import dynamodb
+from jsonUtils import dumps, event_body, JSON_CONTENT_TYPE
+
+
+def lambda_handler(event, context):
+    """
+    POST /activities/{activityId}/cancel
+    ยกเลิกการลงทะเบียนกิจกรรม และเลื่อนรายชื่อสำรองขึ้นมาแทนอัตโนมัติ
+    """
+
+    # CORS headers
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+        'Access-Control-Allow-Methods': 'POST,OPTIONS'
+    }
+
+    # Handle preflight OPTIONS request
+    if event.get('httpMethod') == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': ''
+        }
+
+    try:
+        activity_id = (event.get('pathParameters') or {}).get('activityId')
+        request_body = json.loads(event_body(event) or '{}')
+        student_id = request_body.get('studentId')
+
+        if not activity_id or not student_id:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': dumps({'success': False, 'message': 'activityId และ studentId จำเป็นต้องระบุ'})
+            }
+
+        participation = find_participation(student_id, activity_id)
+        if not participation:
+            return {
+                'statusCode': 404,
+                'headers': headers,
+                'body': dumps({'success': False, 'message': 'ไม่พบการลงทะเบียนกิจกรรมนี้'})
+            }
+
+        if participation.get('isConfirmed', False):
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': dumps({'success': False, 'message': 'ไม่สามารถยกเลิกกิจกรรมที่ยืนยันการเข้าร่วมแล้วได้'})
+            }
+
+        # ลบ participation (กิจกรรมจำกัดที่นั่ง: ส่งที่นั่งต่อให้รายชื่อสำรองลำดับแรก หรือคืนที่นั่งถ้าไม่มีคิว)
+        promoted = None
+        activity = dynamodb.Table('Activities').get_item(Key={'activityId': activity_id}).get('Item', {})
+        if activity.get('capacity'):
+            now_str = datetime.now(timezone(timedelta(hours=7))).isoformat()
+            try:
+                promoted = release_seat(participation, now_str)
+            except ClientError as e:
+                if not cancellation_reasons(e):
+                    raise
+                # participation ถูกเปลี่ยนระหว่างยกเลิก (เช่น ยืนยันการเข้าร่วมพร้อมกัน หรือถูกยกเลิกไปแล้ว)
+                print(f'Cancel of {student_id} for {activity_id} conflicted: {str(e)}')
+                return {
+                    'statusCode': 409,
+                    'headers': headers,
+                    'body': dumps({
+                        'success': False,
+                        'message': 'สถานะการลงทะเบียนเปลี่ยนไประหว่างยกเลิก กรุณาโหลดข้อมูลใหม่แล้วลองอีกครั้ง'
+                    })
+                }
+        else:
+            dynamodb.Table('ActivityParticipations').delete_item(
+                Key={'participationId': participation['participationId'], 'activityId': activity_id}
+            )
+
+        print(f'Cancelled registration of {student_id} for {activity_id}')
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': dumps({
+                'success': True,
+                'message': 'ยกเลิกการลงทะเบียนสำเร็จ',
+                'promotedStudentId': promoted.get('studentId') if promoted else None
+            })
+        }
+
+    except json.JSONDecodeError:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'success': False, 'message': 'รูปแบบ JSON ไม่ถูกต้อง'})
+        }
+    except ClientError as e:
+        print('DynamoDB Error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'success': False, 'message': 'เกิดข้อผิดพลาดในฐานข้อมูล', 'details': str(e)})
+        }
+    except Exception as e:
+        print('Unexpected error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'success': False, 'message': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
+        }
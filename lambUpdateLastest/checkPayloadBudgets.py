@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+
+# ตรวจขนาด response body (bytes) ของ endpoint ที่มีข้อความภาษาไทยเยอะ โดยใช้ข้อมูลจาก export (AWSDynamoDB)
+# เทียบกับงบใน payloadBudgets.json ถ้าเกินงบจะ exit 1 (ใช้ใน CI / ก่อน deploy)
+#   python checkPayloadBudgets.py            ตรวจตามงบ
+#   python checkPayloadBudgets.py --update   บันทึกขนาดปัจจุบัน + BUDGET_HEADROOM เป็นงบใหม่
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')   # ไม่ได้เรียก AWS จริง แต่ boto3 ต้องมี region ตอนสร้าง resource
+
+from dynamoUtils import deserialize_item
+from jsonUtils import dumps
+from getStudentActivities import combine_participation
+from benchDeserializer import load_export_items
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'payloadBudgets.json')
+BUDGET_HEADROOM = 0.10      # เผื่อข้อมูลโตได้ 10% ก่อนจะนับว่าเกินงบ
+
+
+def _size(payload):
+    return len(dumps(payload).encode('utf-8'))
+
+
+def measure_payloads():
+    """ขนาด response body (bytes) ต่อ endpoint สำหรับกรณีที่ใหญ่ที่สุดใน export"""
+    activities = [deserialize_item(item) for item in load_export_items('Activities')]
+    skills = [deserialize_item(item) for item in load_export_items('Skills')]
+    participations = [deserialize_item(item) for item in load_export_items('ActivityParticipations')]
+
+    activity_map = {activity['activityId']: activity for activity in activities}
+    by_student = {}
+    for participation in participations:
+        activity = activity_map.get(participation.get('activityId'))
+        if activity:
+            by_student.setdefault(participation.get('studentId'), []).append(
+                combine_participation(activity, participation)
+            )
+
+    year_levels = {skill.get('yearLevel') for skill in skills}
+    required_by_year = [
+        [skill for skill in skills if skill.get('isRequired') is True and skill.get('yearLevel') == year]
+        for year in year_levels
+    ]
+
+    return {
+        'getActivities': _size(activities),
+        'getAllSkills': _size(skills),
+        'getRequiredSkills': max((_size(required) for required in required_by_year), default=0),
+        'getStudentActivities': max((_size(rows) for rows in by_student.values()), default=0),
+    }
+
+
+def check_payload_budgets(update=False):
+    sizes = measure_payloads()
+
+    if update:
+        budgets = {endpoint: int(size * (1 + BUDGET_HEADROOM)) for endpoint, size in sizes.items()}
+        with open(BUDGETS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Updated {BUDGETS_FILE}")
+
+    with open(BUDGETS_FILE, encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    over_budget = []
+    for endpoint, size in sorted(sizes.items()):
+        budget = budgets.get(endpoint)
+        status = 'OK' if budget is None or size <= budget else 'OVER'
+        print(f"{endpoint:<22} {size:>8} bytes  budget {budget}  {status}")
+        if status == 'OVER':
+            over_budget.append(endpoint)
+
+    return over_budget
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_payload_budgets(update='--update' in sys.argv[1:]) else 0)
@@ -0,0 +1,35 @@
+from botocore.exceptions import ClientError
+from verifyActivityCode import QR_CODE_INDEX
+from indexMigration import create_missing_indexes
+from jsonUtils import dumps
+
+# Migration: เพิ่ม GSI qrCode ให้ตาราง Activities
+# verifyActivityCode หา activity จาก QR Code ด้วย query บน index นี้ (ถ้ายังไม่มีจะ scan ทั้งตาราง)
+ACTIVITIES_TABLE = 'Activities'
+ACTIVITY_QR_INDEXES = [
+    (QR_CODE_INDEX, 'qrCode', None),
+]
+
+
+def create_activity_qr_index():
+    """สร้าง GSI qrCode ถ้ายังไม่มี คืนสถานะของ index"""
+    return create_missing_indexes(ACTIVITIES_TABLE, ACTIVITY_QR_INDEXES)
+
+
+def lambda_handler(event, context):
+    try:
+        statuses = create_activity_qr_index()
+        return {
+            'statusCode': 200,
+            'body': dumps({'success': True, 'indexes': statuses})
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    create_activity_qr_index()
@@ -0,0 +1,37 @@
+from botocore.exceptions import ClientError
+from participationUtils import PARTICIPATIONS_TABLE, PARTICIPATION_INDEX, ACTIVITY_PARTICIPATION_INDEX
+from indexMigration import create_missing_indexes
+from jsonUtils import dumps
+
+# Migration: เพิ่ม GSI ให้ตาราง ActivityParticipations
+# - (studentId, activityId): หา participation ของนักศึกษา
+# - (activityId, registeredAt): รายชื่อผู้เข้าร่วมกิจกรรมแบบแบ่งหน้า
+# สร้างได้ครั้งละ 1 index: รันซ้ำหลังตัวก่อนหน้า ACTIVE เพื่อสร้างตัวถัดไป (ดู indexMigration.py)
+PARTICIPATION_INDEXES = [
+    (PARTICIPATION_INDEX, 'studentId', 'activityId'),
+    (ACTIVITY_PARTICIPATION_INDEX, 'activityId', 'registeredAt'),
+]
+
+
+def create_participation_index():
+    """สร้าง GSI ตัวแรกที่ยังไม่มี คืนสถานะของแต่ละ index"""
+    return create_missing_indexes(PARTICIPATIONS_TABLE, PARTICIPATION_INDEXES)
+
+
+def lambda_handler(event, context):
+    try:
+        statuses = create_participation_index()
+        return {
+            'statusCode': 200,
+            'body': dumps({'success': True, 'indexes': statuses})
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    create_participation_index()
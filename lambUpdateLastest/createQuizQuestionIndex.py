@@ -0,0 +1,35 @@
+from botocore.exceptions import ClientError
+from getQuizQuestions import QUESTIONS_SKILL_INDEX
+from indexMigration import create_missing_indexes
+from jsonUtils import dumps
+
+# Migration: เพิ่ม GSI skillId ให้ตาราง QuizQuestions
+# getQuizQuestions โหลดคลังคำถามของ skill ด้วย query บน index นี้ (ถ้ายังไม่มีจะ scan ทั้งตาราง)
+QUIZ_QUESTIONS_TABLE = 'QuizQuestions'
+QUIZ_QUESTION_INDEXES = [
+    (QUESTIONS_SKILL_INDEX, 'skillId', None),
+]
+
+
+def create_quiz_question_index():
+    """สร้าง GSI skillId ถ้ายังไม่มี คืนสถานะของ index"""
+    return create_missing_indexes(QUIZ_QUESTIONS_TABLE, QUIZ_QUESTION_INDEXES)
+
+
+def lambda_handler(event, context):
+    try:
+        statuses = create_quiz_question_index()
+        return {
+            'statusCode': 200,
+            'body': dumps({'success': True, 'indexes': statuses})
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    create_quiz_question_index()
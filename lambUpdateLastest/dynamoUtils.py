@@ -0,0 +1,446 @@
+import os
+import re
+import json
+import base64
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from awsClients import dynamodb, client
+
+# Shared DynamoDB helpers ที่ทุก Lambda ใช้ร่วมกัน (client กลางอยู่ใน awsClients)
+
+BATCH_GET_LIMIT = 100       # BatchGetItem รับได้สูงสุด 100 key ต่อครั้ง
+BATCH_MAX_RETRIES = 5
+BATCH_BASE_DELAY = 0.05     # วินาที (exponential backoff)
+
+# จำนวน segment เริ่มต้นสำหรับ parallel scan (1 = scan ทีละหน้าแบบเดิม)
+DEFAULT_SCAN_SEGMENTS = int(os.getenv('SCAN_SEGMENTS', '1'))
+
+# API แบบแบ่งหน้า (?limit=&nextToken=)
+PAGE_MAX_LIMIT = 500
+PAGE_MAX_READS = int(os.getenv('PAGE_MAX_READS', '5'))   # อ่านไม่เกินกี่ครั้งต่อหน้า (คุม latency เมื่อมี filter)
+
+# ?fields= (ตัด attribute ที่ไม่ใช้ตั้งแต่ตอนอ่านจาก DynamoDB)
+MAX_FIELDS = 50
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+_SEGMENT_DONE = object()
+_serializer = TypeSerializer()
+
+
+def _batch_get_request(request_items):
+    """
+    ส่ง BatchGetItem หนึ่งชุด (ไม่เกิน 100 key) แล้ว retry UnprocessedKeys แบบ backoff
+    คืนค่า Responses รวม {table_name: [items]}
+    """
+    responses = {}
+    attempt = 0
+    while request_items:
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+
+        for table_name, items in response.get('Responses', {}).items():
+            responses.setdefault(table_name, []).extend(items)
+
+        request_items = response.get('UnprocessedKeys') or {}
+        if not request_items:
+            break
+
+        attempt += 1
+        if attempt > BATCH_MAX_RETRIES:
+            raise ClientError(
+                {'Error': {
+                    'Code': 'UnprocessedKeys',
+                    'Message': f'BatchGetItem on {sorted(request_items)} still has unprocessed keys after {BATCH_MAX_RETRIES} retries'
+                }},
+                'BatchGetItem'
+            )
+        time.sleep(BATCH_BASE_DELAY * (2 ** (attempt - 1)))
+
+    return responses
+
+
+def batch_get_keys(keys_by_table, attributes_by_table=None):
+    """
+    ดึง item จากหลายตารางพร้อมกันด้วย BatchGetItem
+    keys_by_table: {table_name: [key dict, ...]}
+    attributes_by_table: (ไม่บังคับ) {table_name: [attribute, ...]} อ่านเฉพาะ attribute ที่ระบุ (ดู with_projection)
+    คืนค่า {table_name: [items]} (ลำดับไม่รับประกัน, key ที่ไม่พบจะไม่มีใน list)
+    """
+    pending = [(table_name, key) for table_name, keys in keys_by_table.items() for key in keys]
+    found = {table_name: [] for table_name in keys_by_table}
+    attributes_by_table = attributes_by_table or {}
+
+    for start in range(0, len(pending), BATCH_GET_LIMIT):
+        request_items = {}
+        for table_name, key in pending[start:start + BATCH_GET_LIMIT]:
+            if table_name not in request_items:
+                request_items[table_name] = with_projection(attributes_by_table.get(table_name), {'Keys': []})
+            request_items[table_name]['Keys'].append(key)
+
+        for table_name, items in _batch_get_request(request_items).items():
+            found[table_name].extend(items)
+
+    return found
+
+
+def batch_get_items(table_name, key_name, key_values, attributes=None):
+    """
+    ดึง item จากตาราง table_name ด้วย BatchGetItem
+    - ตัด key ที่ซ้ำ/ว่างออกก่อน
+    - แบ่งเป็นชุดละ 100 key
+    - retry UnprocessedKeys แบบ backoff
+    - attributes: (ไม่บังคับ) อ่านเฉพาะ attribute ที่ระบุ (key_name จะถูกอ่านเสมอ)
+    คืนค่าเป็น dict {key_value: item} (key ที่ไม่พบจะไม่อยู่ใน dict)
+    """
+    unique_keys = list(dict.fromkeys(k for k in key_values if k))
+    if attributes:
+        attributes = list(dict.fromkeys([key_name, *attributes]))
+    items = batch_get_keys(
+        {table_name: [{key_name: k} for k in unique_keys]},
+        {table_name: attributes} if attributes else None
+    )[table_name]
+    return {item[key_name]: item for item in items}
+
+
+def _scan_pages(scan, scan_kwargs):
+    """scan ทีละหน้าจนครบ โดยตาม LastEvaluatedKey (scan = table.scan หรือ client.scan)"""
+    kwargs = dict(scan_kwargs)
+    while True:
+        response = scan(**kwargs)
+        yield response.get('Items', [])
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def _scan_all(scan, segments, scan_kwargs):
+    segments = segments or DEFAULT_SCAN_SEGMENTS
+
+    if segments <= 1:
+        for page in _scan_pages(scan, scan_kwargs):
+            yield from page
+        return
+
+    pages = queue.Queue()
+    stop = threading.Event()   # ให้ worker หยุดเมื่อผู้เรียกเลิกอ่านกลางทาง
+
+    def scan_segment(segment):
+        try:
+            segment_kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=segments)
+            for page in _scan_pages(scan, segment_kwargs):
+                if stop.is_set():
+                    break
+                pages.put(page)
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(_SEGMENT_DONE)
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        for segment in range(segments):
+            executor.submit(scan_segment, segment)
+
+        try:
+            remaining = segments
+            while remaining:
+                page = pages.get()
+                if page is _SEGMENT_DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop.set()
+
+
+def scan_items(table_name, segments=None, **scan_kwargs):
+    """
+    Generator ที่ scan ทั้งตาราง (ตาม pagination ครบทุกหน้า) แล้ว yield ทีละ item
+    - segments > 1 จะแบ่งงานเป็น Segment/TotalSegments แล้วรันบน thread pool
+    - scan_kwargs ส่งต่อให้ table.scan() ตรง ๆ (FilterExpression, ProjectionExpression, ...)
+    """
+    return _scan_all(dynamodb.Table(table_name).scan, segments, scan_kwargs)
+
+
+def query_items(table_name, **query_kwargs):
+    """Generator ที่ query ครบทุกหน้า (ตาม LastEvaluatedKey) แล้ว yield ทีละ item"""
+    table = dynamodb.Table(table_name)
+    kwargs = dict(query_kwargs)
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get('Items', [])
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def _serialize_values(values):
+    return {k: _serializer.serialize(v) for k, v in values.items()}
+
+
+def transact_write_items(actions):
+    """
+    TransactWriteItems โดยรับค่าแบบ Python ปกติ (เหมือน Table API) แล้วแปลงเป็น DynamoDB JSON ให้
+    actions: [{'Put': {...}}, {'Update': {...}}, {'Delete': {...}}, {'ConditionCheck': {...}}]
+    ถ้าเงื่อนไขไม่ผ่านจะ raise ClientError (TransactionCanceledException) ใช้ cancellation_reasons() อ่านเหตุผล
+    """
+    serialized = []
+    for action in actions:
+        (action_type, params), = action.items()
+        params = dict(params)
+        for field in ('Item', 'Key', 'ExpressionAttributeValues'):
+            if field in params:
+                params[field] = _serialize_values(params[field])
+        serialized.append({action_type: params})
+    return client('dynamodb').transact_write_items(TransactItems=serialized)
+
+
+def cancellation_reasons(error):
+    """คืน list ของ Code ต่อ action จาก TransactionCanceledException (เช่น ['None', 'ConditionalCheckFailed'])"""
+    if error.response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+        return []
+    return [reason.get('Code', 'None') for reason in error.response.get('CancellationReasons', [])]
+
+
+# error ที่ได้เมื่อ query GSI ที่ยังไม่ได้สร้าง (หรือยังสร้างไม่เสร็จ)
+INDEX_MISSING_ERRORS = ('ValidationException', 'ResourceNotFoundException')
+
+
+def index_missing(error):
+    """True ถ้า ClientError มาจาก GSI ที่ยังไม่มี (ควร scan แทน) ส่วน error อื่น เช่น throttling ให้ raise ต่อ"""
+    return error.response.get('Error', {}).get('Code') in INDEX_MISSING_ERRORS
+
+
+# ---------- low-level client path ----------
+# resource API แปลงทุก attribute ผ่าน TypeDeserializer และให้ตัวเลขเป็น Decimal
+# ซึ่ง handler ต้องแปลงกลับเป็น int/float อีกรอบตอน json.dumps
+# ทางนี้อ่านผ่าน client แล้วแปลง DynamoDB JSON เป็น Python ตรง ๆ ในรอบเดียว
+# ต้องเป็น client แยก (awsClients.client): dynamodb.meta.client ของ resource แปลง input/output ให้อัตโนมัติอยู่แล้ว
+
+FLOAT_SAFE_DIGITS = 15      # float (double) เก็บเลขนัยสำคัญได้แม่นยำ 15 หลัก
+
+
+def _number(raw):
+    if '.' not in raw and 'e' not in raw and 'E' not in raw:
+        return int(raw)
+    # ความยาวรวมเครื่องหมาย/จุดทศนิยม ถ้าไม่เกินนี้เลขนัยสำคัญไม่เกิน 15 หลักแน่นอน
+    if len(raw) <= FLOAT_SAFE_DIGITS + 1:
+        return float(raw)
+    return Decimal(raw)
+
+
+def _deserialize(value):
+    (tag, raw), = value.items()
+    if tag == 'S':
+        return raw
+    if tag == 'N':
+        return _number(raw)
+    if tag == 'BOOL':
+        return raw
+    if tag == 'M':
+        return {k: _deserialize(v) for k, v in raw.items()}
+    if tag == 'L':
+        return [_deserialize(v) for v in raw]
+    if tag == 'NULL':
+        return None
+    if tag == 'SS':
+        return set(raw)
+    if tag == 'NS':
+        return {_number(n) for n in raw}
+    if tag == 'B':
+        return bytes(raw)
+    if tag == 'BS':
+        return {bytes(b) for b in raw}
+    raise TypeError(f'Unknown DynamoDB type {tag}')
+
+
+def deserialize_item(item):
+    """แปลง item แบบ DynamoDB JSON ({'name': {'S': ...}}) เป็น dict ของ Python (ตัวเลขเป็น int/float)"""
+    return {k: _deserialize(v) for k, v in item.items()}
+
+
+def with_projection(attributes, kwargs=None):
+    """
+    เพิ่ม ProjectionExpression ของ attributes ลงใน kwargs ของ get_item/query/scan
+    ใช้ alias (#p0, #p1, ...) ทุกชื่อ กันชน reserved word เช่น name, location, level
+    """
+    kwargs = dict(kwargs or {})
+    if attributes:
+        names = dict(kwargs.get('ExpressionAttributeNames') or {})
+        aliases = []
+        for i, attribute in enumerate(attributes):
+            names[f'#p{i}'] = attribute
+            aliases.append(f'#p{i}')
+        kwargs['ProjectionExpression'] = ', '.join(aliases)
+        kwargs['ExpressionAttributeNames'] = names
+    return kwargs
+
+
+def _client_kwargs(attributes, kwargs):
+    """
+    แปลง kwargs ให้ใช้กับ client ได้
+    - ExpressionAttributeValues รับเป็นค่า Python ปกติแล้วแปลงให้ (expression ต้องเป็น string ไม่ใช่ Key()/Attr())
+    - attributes: รายชื่อ attribute ที่ต้องการ -> ProjectionExpression (ดู with_projection)
+    """
+    kwargs = dict(kwargs)
+    if 'ExpressionAttributeValues' in kwargs:
+        kwargs['ExpressionAttributeValues'] = _serialize_values(kwargs['ExpressionAttributeValues'])
+    return with_projection(attributes, kwargs)
+
+
+def client_scan_items(table_name, attributes=None, segments=None, **scan_kwargs):
+    """เหมือน scan_items แต่อ่านผ่าน client และ yield item ที่แปลงด้วย deserialize_item"""
+    scan = partial(client('dynamodb').scan, TableName=table_name)
+    for item in _scan_all(scan, segments, _client_kwargs(attributes, scan_kwargs)):
+        yield deserialize_item(item)
+
+
+def client_query_items(table_name, attributes=None, **query_kwargs):
+    """เหมือน query_items แต่อ่านผ่าน client (KeyConditionExpression ต้องเป็น string)"""
+    kwargs = _client_kwargs(attributes, query_kwargs)
+    kwargs['TableName'] = table_name
+    while True:
+        response = client('dynamodb').query(**kwargs)
+        for item in response.get('Items', []):
+            yield deserialize_item(item)
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def _cursor_default(o):
+    if isinstance(o, Decimal):
+        return {'__d': str(o)}
+    raise TypeError(f'Object of type {type(o).__name__} is not cursor serializable')
+
+
+def _cursor_hook(o):
+    return Decimal(o['__d']) if set(o) == {'__d'} else o
+
+
+def encode_cursor(position):
+    """แปลงตำแหน่ง (เช่น LastEvaluatedKey หรือ offset) เป็น nextToken แบบ opaque"""
+    if position is None:
+        return None
+    raw = json.dumps(position, default=_cursor_default, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """แปลง nextToken กลับเป็นตำแหน่งเดิม (token ว่าง -> None, token เสีย -> ValueError)"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        return json.loads(raw, object_hook=_cursor_hook)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'invalid nextToken: {e}')
+
+
+def cursor_offset(token):
+    """
+    offset จาก nextToken แบบ {'offset': n} (ไม่มี token -> 0)
+    token ที่ไม่ใช่รูปแบบนี้ หรือ offset ไม่ใช่จำนวนเต็มที่ไม่ติดลบ -> ValueError
+    """
+    position = decode_cursor(token)
+    if position is None:
+        return 0
+    offset = position.get('offset') if isinstance(position, dict) else None
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise ValueError('invalid nextToken: expected a non-negative offset')
+    return offset
+
+
+def cursor_after(token):
+    """
+    key ตัวสุดท้ายของหน้าก่อน จาก nextToken แบบ {'after': '...'} (ไม่มี token -> None)
+    token ที่ไม่ใช่รูปแบบนี้ -> ValueError
+    """
+    position = decode_cursor(token)
+    if position is None:
+        return None
+    after = position.get('after') if isinstance(position, dict) else None
+    if not isinstance(after, str):
+        raise ValueError('invalid nextToken: expected an activityId to continue after')
+    return after
+
+
+def cursor_key(token, key_sets):
+    """
+    ExclusiveStartKey จาก nextToken (ไม่มี token -> None)
+    key_sets: ชุดชื่อ attribute ที่ยอมรับ เช่น [(hash, range, index_hash, index_range), (hash, range)]
+    token ต้องเป็น dict ที่มี attribute ตรงกับชุดใดชุดหนึ่งพอดีและค่าเป็น string ไม่งั้น -> ValueError
+    """
+    position = decode_cursor(token)
+    if position is None:
+        return None
+    if not isinstance(position, dict) or set(position) not in [set(keys) for keys in key_sets]:
+        raise ValueError('invalid nextToken: unexpected key attributes')
+    if not all(isinstance(value, str) for value in position.values()):
+        raise ValueError('invalid nextToken: key attributes must be strings')
+    return position
+
+
+def parse_fields(value):
+    """
+    แปลง ?fields=a,b,c เป็นรายชื่อ attribute (ไม่ระบุ -> None = ทุก field)
+    ชื่อต้องเป็นตัวอักษร/ตัวเลข/_ เท่านั้น และไม่เกิน MAX_FIELDS ชื่อ ไม่งั้น ValueError
+    """
+    if not value:
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    if not fields or len(fields) > MAX_FIELDS:
+        raise ValueError(f'fields must list 1..{MAX_FIELDS} attribute names')
+    invalid = [field for field in fields if not FIELD_NAME_PATTERN.match(field)]
+    if invalid:
+        raise ValueError(f'invalid field names: {", ".join(invalid)}')
+    return fields
+
+
+def pick_fields(item, fields):
+    """ตัด item ให้เหลือเฉพาะ fields (fields = None -> คืน item เดิม)"""
+    if fields is None:
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def parse_limit(value, maximum=PAGE_MAX_LIMIT):
+    """แปลง ?limit= เป็น int ในช่วง 1..maximum (ไม่ใช่ตัวเลข -> ValueError)"""
+    return max(1, min(int(value), maximum))
+
+
+def read_page(read, limit, start_key=None, keep=None, **read_kwargs):
+    """
+    อ่าน 1 หน้าสำหรับ API แบบ cursor (read = table.query / table.scan)
+    - ขอแต่ละครั้งด้วย Limit เท่าที่ยังขาด ทำให้ต่อหน้าถัดไปจาก LastEvaluatedKey ได้โดยไม่ข้าม item
+    - keep: filter ฝั่ง Python (ถ้ามี)
+    - อ่านไม่เกิน PAGE_MAX_READS ครั้ง ถ้า filter ทิ้งไปเยอะจนยังไม่ครบ จะคืนเท่าที่ได้พร้อม key ให้อ่านต่อ
+    คืน (items, last_key) โดย last_key = None เมื่ออ่านครบแล้ว
+    """
+    items = []
+    kwargs = dict(read_kwargs)
+    last_key = start_key
+    for _ in range(PAGE_MAX_READS):
+        if last_key:
+            kwargs['ExclusiveStartKey'] = last_key
+        kwargs['Limit'] = limit - len(items)
+        response = read(**kwargs)
+        items.extend(item for item in response.get('Items', []) if keep is None or keep(item))
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key or len(items) >= limit:
+            break
+    return items, last_key
+
@@ -1,36 +1,18 @@
-import json
-import boto3
-import decimal
-from botocore.exceptions import ClientError
-from datetime import datetime
-
-dynamodb = boto3.resource('dynamodb')
-
-
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            return float(o) if o % 1 > 0 else int(o)
-        return super(DecimalEncoder, self).default(o)
-
-
-def normalize_category(cat):
-    """ ทำให้ category ทุกแบบ normalize เป็นค่าเดียวกัน """
-    if not cat:
-        return ''
-    c = cat.strip().lower().replace('_', '-').replace(' ', '-')
-    if c in ['hardskill', 'hard-skill', 'hard']: 
-        return 'hard skill'
-    if c in ['softskill', 'soft-skill', 'soft']: 
-        return 'soft skill'
-    if c in ['multi', 'multi-skill', 'multiskill', 'multi-skill']: 
-        return 'multi-skill'
-    return cat.strip().lower()
+from dynamoUtils import parse_limit, parse_fields, pick_fields, encode_cursor, cursor_after
+from activityIndex import (
+    get_activity_index, parse_filters, parse_time_window, window_mask, match, select, facet_counts
+)
+from refCache import read_version
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+from httpCompression import with_compression
+from httpCache import cacheable_response, not_modified, etag_matches, version_etag, CACHE_ACTIVITIES
 
 
+@with_compression
 def lambda_handler(event, context):
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -41,63 +23,59 @@ def lambda_handler(event, context):
     try:
         query_params = event.get('queryStringParameters') or {}
 
-        skill_category_filter = normalize_category(query_params.get('skillCategory'))
-        plo_filter = query_params.get('plo')
-        activity_group = query_params.get('activityGroup')
-
-        print("\n====== [DEBUG] Incoming Filters ======")
-        print(f"skillCategory (normalized) => {skill_category_filter}")
-        print(f"plo => {plo_filter}")
-        print(f"activityGroup => {activity_group}")
-        print("=====================================\n")
-
-        activities_table = dynamodb.Table('Activities')
-        plos_table = dynamodb.Table('PLOs')
-
-        activities = activities_table.scan().get('Items', [])
-        plos = plos_table.scan().get('Items', [])
-
-        plo_category_map = {p['plo']: p.get('skillCategory', '') for p in plos}
-
-        filtered_activities = []
-
-        for activity in activities:
-
-            # Normalize skillCategory ของกิจกรรมด้วย
-            raw_cat = activity.get('skillCategory', '')
-            normalized_cat = normalize_category(raw_cat)
-
-            # log รายกิจกรรม
-            print(f"[ACTIVITY] {activity.get('activityId')} | skillCategory(raw)= {raw_cat} => normalized={normalized_cat} | plo={activity.get('plo')}")
-
-            # ------------ Filter PLO (advisor-activities) ------------
-            if plo_filter and plo_filter.lower() != 'all':
-                plos_list = activity.get('plo') or []
-                if plo_filter.upper() not in [p.upper() for p in plos_list]:
-                    print(f"  [SKIP] ไม่ match PLO {plo_filter}")
-                    continue
-
-            # ------------ Filter skillCategory (recommend-activities) ------------
-            if skill_category_filter and skill_category_filter != 'all':
-                if normalized_cat != skill_category_filter:
-                    print(f"  [SKIP] ไม่ match skillCategory {skill_category_filter} (ของกิจกรรม = {normalized_cat})")
-                    continue
-
-            # ถ้าไม่ skip ก็ผ่าน
-            filtered_activities.append(activity)
-
-        print(f"\n====== [DEBUG] Final Count: {len(filtered_activities)} ======\n")
+        # filter: ?plo=&skillCategory=&yearLevel=&level=&skillId= (หลายค่าคั่นด้วย , ได้)
+        filters = parse_filters(query_params)
+        # ช่วงเวลา: ?from=&to= (คาบเกี่ยวช่วง) และ ?upcoming=true (ยังไม่เริ่ม)
+        window = parse_time_window(query_params)
+        # ?fields=activityId,name,... ส่งเฉพาะ field ที่หน้าเว็บใช้
+        fields = parse_fields(query_params.get('fields'))
+        print(f"[getActivities] filters={filters} window={window}")
+
+        # ถ้ามี version ของ Activities: ETag มาจาก version + query string ตอบ 304 ได้โดยไม่ต้องอ่านอะไรเพิ่ม
+        version = read_version('Activities')
+        etag = (
+            version_etag('Activities', version, sorted(query_params.items()), sorted(window.items()))
+            if version is not None else None
+        )
+        if etag and etag_matches(event, etag):
+            return not_modified(headers, etag, CACHE_ACTIVITIES)
+
+        # filter ด้วย facet index ในหน่วยความจำ (scan ตารางเฉพาะตอนสร้าง index ใหม่)
+        index = get_activity_index(version)
+        base = window_mask(index, window)
+        mask = match(index, filters, base=base)
+
+        # แบบเดิม (ไม่มี limit/facets): คืน array ของกิจกรรมทั้งหมดที่ผ่าน filter
+        if not query_params.get('limit') and query_params.get('facets') != 'true':
+            filtered_activities = [pick_fields(activity, fields) for activity in select(index, mask)[0]]
+            print(f"[getActivities] {len(filtered_activities)} activities")
+            return cacheable_response(event, headers, dumps(filtered_activities), CACHE_ACTIVITIES, etag=etag)
+
+        # แบ่งหน้า (?limit=&nextToken=) เรียงตาม activityId, nextToken = activityId ตัวสุดท้ายของหน้า
+        limit = parse_limit(query_params['limit']) if query_params.get('limit') else None
+        after = cursor_after(query_params.get('nextToken'))
+        activities, has_more = select(index, mask, after=after, limit=limit)
+        page = {
+            'activities': [pick_fields(activity, fields) for activity in activities],
+            'total': bin(mask).count('1'),
+            'nextToken': encode_cursor({'after': activities[-1].get('activityId')}) if has_more else None
+        }
+        # ?facets=true: จำนวนกิจกรรมต่อค่าของแต่ละ filter สำหรับ sidebar
+        if query_params.get('facets') == 'true':
+            page['facets'] = facet_counts(index, filters, base=base)
+        return cacheable_response(event, headers, dumps(page), CACHE_ACTIVITIES, etag=etag)
 
+    except ValueError as e:
+        # yearLevel, from/to, limit, nextToken หรือ fields ไม่ถูกต้อง
         return {
-            'statusCode': 200,
+            'statusCode': 400,
             'headers': headers,
-            'body': json.dumps(filtered_activities, cls=DecimalEncoder)
+            'body': dumps({'error': 'พารามิเตอร์ filter, limit, nextToken หรือ fields ไม่ถูกต้อง', 'details': str(e)})
         }
-
     except Exception as e:
         print("[ERROR]", str(e))
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': str(e)})
+            'body': dumps({'error': str(e)})
         }
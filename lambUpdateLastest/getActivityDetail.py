@@ -1,19 +1,42 @@
 import json
-import boto3
-import decimal
 from botocore.exceptions import ClientError
-
-dynamodb = boto3.resource('dynamodb')
-
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            return float(o) if o % 1 > 0 else int(o)
-        return super(DecimalEncoder, self).default(o)
+from awsClients import dynamodb
+from refCache import get_reference_map, read_version
+from dynamoUtils import with_projection, parse_fields, pick_fields
+from ioPool import gather
+from httpCache import cacheable_response, not_modified, etag_matches, version_etag, CACHE_ACTIVITY_DETAIL
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+
+# field ใน response ที่สร้างจากหลาย attribute ของ Activities (field อื่นอ่านจาก attribute ชื่อเดียวกัน)
+DETAIL_FIELD_SOURCES = {
+    'locationName': ['locationId', 'locationName', 'location'],
+    'skillCategory': ['skillCategory', 'plo'],
+    'skillId': ['skillId', 'activityGroup'],
+    'ploFullNames': ['plo'],
+    'ploDescriptions': ['plo', 'ploDescriptions'],
+    'skill': ['skillCategory', 'plo', 'level', 'ploDescriptions'],
+}
+
+
+def detail_attributes(fields):
+    """attribute ของ Activities ที่ต้องอ่านเพื่อสร้าง fields ที่ขอ (None = อ่านทั้ง item)"""
+    if fields is None:
+        return None
+    attributes = ['activityId']
+    for field in fields:
+        attributes.extend(DETAIL_FIELD_SOURCES.get(field, [field]))
+    return list(dict.fromkeys(attributes))
+
+
+def load_location_map():
+    # ถ้าอ่าน Locations ไม่ได้ ยังแสดงกิจกรรมได้ด้วยชื่อสถานที่ที่เก็บไว้ในกิจกรรม
+    # (refCache จำผลว่างไว้ตาม TTL ไม่ scan ซ้ำทุก request)
+    return get_reference_map('Locations', 'locationId', optional=True)
 
 def lambda_handler(event, context):
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,OPTIONS'
     }
@@ -29,21 +52,35 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': 'ต้องระบุรหัสกิจกรรม'})
+                'body': dumps({'error': 'ต้องระบุรหัสกิจกรรม'})
             }
 
+        # ?fields=name,startDateTime,... อ่าน/ส่งเฉพาะ field ที่หน้าเว็บใช้
+        fields = parse_fields((event.get('queryStringParameters') or {}).get('fields'))
+
         print(f'Fetching activity: {activity_id}')
         activities_table = dynamodb.Table('Activities')
-        plos_table = dynamodb.Table('PLOs')
-        locations_table = dynamodb.Table('Locations')
 
-        # ---------- 2) ดึงกิจกรรมจาก Activities ----------
-        activity_res = activities_table.get_item(Key={'activityId': activity_id})
+        # ถ้ามี version ของ Activities: เทียบ ETag ก่อน ตอบ 304 ได้โดยไม่ต้องอ่านกิจกรรม
+        version = read_version('Activities')
+        etag = version_etag('Activities', version, activity_id, fields) if version is not None else None
+        if etag and etag_matches(event, etag):
+            return not_modified(headers, etag, CACHE_ACTIVITY_DETAIL)
+
+        # ---------- 2) ดึงกิจกรรมจาก Activities (พร้อมกับ PLOs/Locations จาก cache) ----------
+        reads = gather({
+            'activity': lambda: activities_table.get_item(
+                Key={'activityId': activity_id}, **with_projection(detail_attributes(fields))
+            ),
+            'plos': lambda: get_reference_map('PLOs', 'plo'),
+            'locations': load_location_map,
+        })
+        activity_res = reads['activity']
         if 'Item' not in activity_res:
             return {
                 'statusCode': 404,
                 'headers': headers,
-                'body': json.dumps({'error': 'ไม่พบกิจกรรมที่ระบุ'})
+                'body': dumps({'error': 'ไม่พบกิจกรรมที่ระบุ'})
             }
 
         activity = activity_res['Item']
@@ -63,13 +100,12 @@ def lambda_handler(event, context):
 
         plos = raw_plos
 
-        # ดึงข้อมูลจากตาราง PLOs ทั้งหมด แล้ว map เป็น dict
-        plos_items = plos_table.scan().get('Items', [])
-        plo_map = {item['plo']: item for item in plos_items}
+        # ข้อมูล PLOs ทั้งหมดจาก cache (map เป็น dict)
+        plo_map = reads['plos']
 
         plo_full_names = []
         # ถ้า activity มี ploDescriptions อยู่แล้วใช้ของเดิมก่อน
-        plo_descriptions = activity.get('ploDescriptions') or []
+        plo_descriptions = list(activity.get('ploDescriptions') or [])
 
         for idx, plo_code in enumerate(plos):
             info = plo_map.get(plo_code, {})
@@ -104,13 +140,9 @@ def lambda_handler(event, context):
         location_name = activity.get('locationName') or activity.get('location')
 
         if location_id:
-            try:
-                loc_res = locations_table.get_item(Key={'locationId': location_id})
-                loc_item = loc_res.get('Item')
-                if loc_item:
-                    location_name = loc_item.get('locationName', location_name)
-            except ClientError as e:
-                print('Error fetching location from Locations table:', str(e))
+            loc_item = reads['locations'].get(location_id)
+            if loc_item:
+                location_name = loc_item.get('locationName', location_name)
 
         location_info = {
             'locationId': location_id,
@@ -157,13 +189,17 @@ def lambda_handler(event, context):
         }
 
         # ล้างค่า None
-        clean_data = {k: v for k, v in detailed_activity.items() if v is not None}
+        clean_data = pick_fields({k: v for k, v in detailed_activity.items() if v is not None}, fields)
 
         print(f"✅ Loaded activity detail: {activity.get('name')}")
+        return cacheable_response(event, headers, dumps(clean_data), CACHE_ACTIVITY_DETAIL, etag=etag)
+
+    except ValueError as e:
+        # fields ไม่ถูกต้อง
         return {
-            'statusCode': 200,
+            'statusCode': 400,
             'headers': headers,
-            'body': json.dumps(clean_data, cls=DecimalEncoder, ensure_ascii=False)
+            'body': dumps({'error': 'พารามิเตอร์ fields ไม่ถูกต้อง', 'details': str(e)})
         }
 
     except ClientError as e:
@@ -171,7 +207,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล', 'details': str(e)})
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล', 'details': str(e)})
         }
 
     except Exception as e:
@@ -179,5 +215,5 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
+            'body': dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
         }
@@ -1,21 +1,49 @@
-import json
-import boto3
-import decimal
 from botocore.exceptions import ClientError
+from dynamoUtils import batch_get_items, parse_limit, encode_cursor
+from participationUtils import STATUS_REGISTERED, STATUS_WAITLISTED, participation_page, page_start_key, list_participations
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+from httpCompression import with_compression
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
 
-# Helper class to convert a DynamoDB item to JSON
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            if o % 1 > 0:
-                return float(o)
-            else:
-                return int(o)
-        return super(DecimalEncoder, self).default(o)
+def participant_row(participation, student_data):
+    """รวมข้อมูล participation กับข้อมูลนักศึกษา (student_data = None ถ้าดึงข้อมูลนักศึกษาไม่สำเร็จ)"""
+    if student_data is None:
+        student_fields = {
+            'studentName': 'ไม่พบข้อมูลนักศึกษา',
+            'studentYear': 0,
+            'studentDepartment': 'ไม่ระบุ',
+        }
+    else:
+        student_fields = {
+            'studentName': student_data.get('name', 'ไม่ระบุชื่อ'),
+            'studentYear': student_data.get('yearLevel', 0),
+            'studentDepartment': student_data.get('department', 'ไม่ระบุแผนก'),
+        }
+    return {
+        'participationId': participation.get('participationId'),
+        'status': participation.get('status', STATUS_REGISTERED),
+        'studentId': participation.get('studentId'),
+        **student_fields,
+        'isConfirmed': participation.get('isConfirmed', False),
+        'surveyCompleted': participation.get('surveyCompleted', False),
+        'registeredAt': participation.get('registeredAt'),
+        'confirmedAt': participation.get('confirmedAt'),
+        'surveyCompletedAt': participation.get('surveyCompletedAt')
+    }
 
+
+def load_student_map(participations):
+    """ข้อมูลนักศึกษาของ participations ด้วย BatchGetItem (None ถ้าดึงไม่สำเร็จ)"""
+    try:
+        return batch_get_items(
+            'Students', 'studentId', [p.get('studentId') for p in participations]
+        )
+    except Exception as e:
+        print(f"Error fetching students: {str(e)}")
+        return None
+
+
+@with_compression
 def lambda_handler(event, context):
     """
     GET /activities/{activityId}/participants
@@ -25,6 +53,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -45,83 +74,64 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': 'ต้องระบุรหัสกิจกรรม'})
+                'body': dumps({'error': 'ต้องระบุรหัสกิจกรรม'})
             }
         
         print(f"Fetching participants for activity: {activity_id}")
         
-        # เชื่อมต่อ DynamoDB tables
-        participations_table = dynamodb.Table('ActivityParticipations')
-        students_table = dynamodb.Table('Students')
-        
-        # ค้นหา participations ของกิจกรรมนี้
-        participations_response = participations_table.scan(
-            FilterExpression='activityId = :activityId',
-            ExpressionAttributeValues={
-                ':activityId': activity_id
+        # แบ่งหน้า (?limit=&nextToken=): query GSI ตาม activityId เรียง registeredAt ล่าสุดก่อน
+        # ไม่มี statistics/total (ต้องอ่านทุกแถว) ใช้ nextToken บอกว่ายังมีหน้าถัดไป
+        query_params = event.get('queryStringParameters') or {}
+        if query_params.get('limit'):
+            page, last_key = participation_page(
+                'activityId', activity_id, parse_limit(query_params['limit']),
+                page_start_key('activityId', activity_id, query_params.get('nextToken'))
+            )
+            student_map = load_student_map(page)
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': dumps({
+                    'activityId': activity_id,
+                    'participants': [
+                        participant_row(p, None if student_map is None else student_map.get(p.get('studentId'), {}))
+                        for p in page
+                    ],
+                    'nextToken': encode_cursor(last_key)
+                })
             }
-        )
         
-        participations = participations_response.get('Items', [])
+        # participations ของกิจกรรมนี้ (query GSI activityId)
+        participations = list_participations('activityId', activity_id)
         print(f"Found {len(participations)} participations")
         
         # สร้างรายการผู้เข้าร่วมพร้อมข้อมูลนักศึกษา
         participants = []
-        total_registered = len(participations)
+        waitlisted = [p for p in participations if p.get('status') == STATUS_WAITLISTED]
+        total_registered = len(participations) - len(waitlisted)
         total_confirmed = 0
         total_survey_completed = 0
         
+        # ดึงข้อมูลนักศึกษาทั้งหมดด้วย BatchGetItem
+        student_map = load_student_map(participations)
+        
         for participation in participations:
-            student_id = participation.get('studentId')
-            
-            # ดึงข้อมูลนักศึกษา
-            try:
-                student_response = students_table.get_item(
-                    Key={'studentId': student_id}
-                )
-                
-                student_data = student_response.get('Item', {})
-                
-                # รวมข้อมูล participation และ student
-                participant_info = {
-                    'participationId': participation.get('participationId'),
-                    'studentId': student_id,
-                    'studentName': student_data.get('name', 'ไม่ระบุชื่อ'),
-                    'studentYear': student_data.get('yearLevel', 0),
-                    'studentDepartment': student_data.get('department', 'ไม่ระบุแผนก'),
-                    'isConfirmed': participation.get('isConfirmed', False),
-                    'surveyCompleted': participation.get('surveyCompleted', False),
-                    'registeredAt': participation.get('registeredAt'),
-                    'confirmedAt': participation.get('confirmedAt'),
-                    'surveyCompletedAt': participation.get('surveyCompletedAt')
-                }
-                
-                # นับสถิติ
-                if participant_info['isConfirmed']:
-                    total_confirmed += 1
-                
-                if participant_info['surveyCompleted']:
-                    total_survey_completed += 1
-                
-                participants.append(participant_info)
-                
-            except Exception as e:
-                print(f"Error fetching student {student_id}: {str(e)}")
+            if student_map is None:
                 # เพิ่มข้อมูลแม้ไม่มีข้อมูลนักศึกษา
-                participant_info = {
-                    'participationId': participation.get('participationId'),
-                    'studentId': student_id,
-                    'studentName': 'ไม่พบข้อมูลนักศึกษา',
-                    'studentYear': 0,
-                    'studentDepartment': 'ไม่ระบุ',
-                    'isConfirmed': participation.get('isConfirmed', False),
-                    'surveyCompleted': participation.get('surveyCompleted', False),
-                    'registeredAt': participation.get('registeredAt'),
-                    'confirmedAt': participation.get('confirmedAt'),
-                    'surveyCompletedAt': participation.get('surveyCompletedAt')
-                }
-                
-                participants.append(participant_info)
+                participants.append(participant_row(participation, None))
+                continue
+            
+            # รวมข้อมูล participation และ student
+            participant_info = participant_row(participation, student_map.get(participation.get('studentId'), {}))
+            
+            # นับสถิติ
+            if participant_info['isConfirmed']:
+                total_confirmed += 1
+            
+            if participant_info['surveyCompleted']:
+                total_survey_completed += 1
+            
+            participants.append(participant_info)
         
         # เรียงตาม registeredAt (ล่าสุดก่อน)
         participants.sort(key=lambda x: x.get('registeredAt', ''), reverse=True)
@@ -133,7 +143,8 @@ def lambda_handler(event, context):
                 'totalRegistered': total_registered,
                 'totalConfirmed': total_confirmed,
                 'totalPending': total_registered - total_confirmed,
-                'totalSurveyCompleted': total_survey_completed
+                'totalSurveyCompleted': total_survey_completed,
+                'totalWaitlisted': len(waitlisted)
             },
             'participants': participants
         }
@@ -143,15 +154,22 @@ def lambda_handler(event, context):
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': dumps(result)
         }
         
+    except ValueError as e:
+        # limit หรือ nextToken ไม่ถูกต้อง
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'error': 'พารามิเตอร์ limit หรือ nextToken ไม่ถูกต้อง', 'details': str(e)})
+        }
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล',
                 'details': str(e)
             })
@@ -161,7 +179,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด',
                 'details': str(e)
             })
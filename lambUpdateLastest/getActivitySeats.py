@@ -0,0 +1,68 @@
+from botocore.exceptions import ClientError
+from dynamoUtils import batch_get_items, BATCH_GET_LIMIT
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+
+# ที่นั่งของกิจกรรมแยกจาก getActivities/getActivityDetail
+# registeredCount เปลี่ยนทุกการลงทะเบียน จึงไม่อยู่ใน catalog ที่ cache ตาม version ของ Activities
+# endpoint นี้อ่านสดทุกครั้ง (BatchGetItem ตาม id ที่หน้าเว็บแสดงอยู่ อ่านเฉพาะ SEAT_ATTRIBUTES)
+SEAT_ATTRIBUTES = ['capacity', 'registeredCount']
+
+
+def seat_info(activity):
+    """capacity / registeredCount / available ของกิจกรรม (capacity ว่าง = ไม่จำกัดที่นั่ง)"""
+    capacity = activity.get('capacity')
+    registered = activity.get('registeredCount') or 0
+    return {
+        'capacity': capacity,
+        'registeredCount': registered,
+        'available': max(capacity - registered, 0) if capacity else None,
+    }
+
+
+def lambda_handler(event, context):
+    """
+    GET /activities/seats?ids=A1,A2,...
+    คืน {activityId: {capacity, registeredCount, available}} (id ที่ไม่พบจะไม่อยู่ใน response)
+    """
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+        'Access-Control-Allow-Methods': 'GET,OPTIONS',
+        'Cache-Control': 'no-store'
+    }
+
+    if event.get('httpMethod') == 'OPTIONS':
+        return {'statusCode': 200, 'headers': headers, 'body': ''}
+
+    try:
+        raw_ids = (event.get('queryStringParameters') or {}).get('ids') or ''
+        activity_ids = list(dict.fromkeys(i.strip() for i in raw_ids.split(',') if i.strip()))
+        if not activity_ids or len(activity_ids) > BATCH_GET_LIMIT:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': dumps({'error': f'ต้องระบุ ids ของกิจกรรม 1-{BATCH_GET_LIMIT} รายการ'})
+            }
+
+        activities = batch_get_items('Activities', 'activityId', activity_ids, SEAT_ATTRIBUTES)
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': dumps({activity_id: seat_info(activity) for activity_id, activity in activities.items()})
+        }
+
+    except ClientError as e:
+        print('DynamoDB Error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล', 'details': str(e)})
+        }
+    except Exception as e:
+        print('Unexpected Error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
+        }
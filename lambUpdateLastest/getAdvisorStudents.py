@@ -1,41 +1,34 @@
-import json
-import boto3
-import decimal
 from botocore.exceptions import ClientError
+from dynamoUtils import client_query_items, client_scan_items, encode_cursor, cursor_offset, parse_limit
+from refCache import get_reference_items
+from progressSummary import get_summaries, year_level_of
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+from httpCompression import with_compression
 
-# สร้าง DynamoDB client
-dynamodb = boto3.resource('dynamodb')
 
-# Helper class to convert a DynamoDB item to JSON
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            if o % 1 > 0:  # ถ้าเป็นเลขทศนิยม
-                return float(o)
-            else:  # ถ้าเป็นเลขจำนวนเต็ม
-                return int(o)
-        return super(DecimalEncoder, self).default(o)
+SORT_KEYS = {
+    # progress = สัดส่วนทักษะบังคับที่ได้ต่อทักษะบังคับทั้งหมด (ไม่เกิน 1)
+    'progress': lambda s: min(s['completedRequiredSkills'] / s['requiredSkills'], 1.0) if s['requiredSkills'] else 1.0,
+    'year': lambda s: s.get('yearLevel', 1),
+    'name': lambda s: s.get('name', ''),
+}
 
-def count_required_skills_by_year(all_skills, year_level):
+def count_required_skills_by_year(all_skills):
     """
-    นับจำนวนทักษะบังคับตามชั้นปี
+    นับจำนวนทักษะบังคับของทุกชั้นปีในรอบเดียว คืน dict {yearLevel: จำนวน}
     ทักษะจะถือว่าบังคับถ้า isRequired = True และ yearLevel == ชั้นปีของนักศึกษา
     """
-    required_count = 0
+    required_counts = {}
     
     for skill in all_skills:
-        # ตรวจสอบว่าเป็นทักษะบังคับและเหมาะสำหรับชั้นปีนี้
-        is_required = skill.get('isRequired', False)
-        skill_year_level = skill.get('yearLevel', 1)
-        
-        # ทักษะจะบังคับถ้า isRequired = True และ yearLevel == ชั้นปีของนักศึกษา
-        if is_required and skill_year_level == year_level:
-            required_count += 1
-            print(f"  - Required skill: {skill.get('name', skill.get('skillId'))} (Year {skill_year_level})")
+        if skill.get('isRequired', False):
+            year_level = skill.get('yearLevel', 1)
+            required_counts[year_level] = required_counts.get(year_level, 0) + 1
     
-    print(f"Total required skills for year {year_level}: {required_count}")
-    return required_count
+    print(f"Required skills by year: {required_counts}")
+    return required_counts
 
+@with_compression
 def lambda_handler(event, context):
     # ดึง advisorId จาก path parameters
     advisor_id = event.get('pathParameters', {}).get('advisorId')
@@ -43,74 +36,92 @@ def lambda_handler(event, context):
     if not advisor_id:
         return {
             'statusCode': 400,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'ต้องระบุรหัสอาจารย์ที่ปรึกษา'})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'ต้องระบุรหัสอาจารย์ที่ปรึกษา'})
         }
     
+    # เรียงลำดับและแบ่งหน้าฝั่ง server (?sortBy=progress|year|name&order=asc|desc&limit=&nextToken=)
+    query_params = event.get('queryStringParameters') or {}
     try:
-        # ค้นหานักศึกษาที่มีอาจารย์ที่ปรึกษาตามที่ระบุ
-        students_table = dynamodb.Table('Students')
-        skills_table = dynamodb.Table('Skills')
-        completed_skills_table = dynamodb.Table('CompletedSkills')
-        
+        limit = parse_limit(query_params['limit']) if query_params.get('limit') else None
+        offset = cursor_offset(query_params.get('nextToken'))
+    except ValueError as e:
+        # limit หรือ nextToken ไม่ถูกต้อง
+        return {
+            'statusCode': 400,
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'พารามิเตอร์ limit หรือ nextToken ไม่ถูกต้อง', 'details': str(e)})
+        }
+    
+    try:
+        # ค้นหานักศึกษาที่มีอาจารย์ที่ปรึกษาตามที่ระบุ (อ่านผ่าน client path: ตัวเลขเป็น int/float เลย)
         # พยายามใช้ query กับ GSI ก่อน
         try:
             print(f"Querying students for advisor {advisor_id} using advisorId-index GSI")
-            response = students_table.query(
+            students = list(client_query_items(
+                'Students',
                 IndexName='advisorId-index',  # ใช้ชื่อ index ใหม่
                 KeyConditionExpression='advisorId = :advisor_id',
                 ExpressionAttributeValues={
                     ':advisor_id': advisor_id
                 }
-            )
+            ))
         except ClientError as e:
             # ถ้าไม่สามารถใช้ query ได้ (เช่น GSI ยังไม่พร้อมใช้งาน) ให้ใช้ scan แทน
             print(f"GSI query failed, falling back to scan: {str(e)}")
-            response = students_table.scan(
+            students = list(client_scan_items(
+                'Students',
                 FilterExpression='advisorId = :advisor_id',
                 ExpressionAttributeValues={
                     ':advisor_id': advisor_id
                 }
-            )
+            ))
         
-        students = response.get('Items', [])
         print(f"Found {len(students)} students for advisor {advisor_id}")
         
-        # ดึงข้อมูลทักษะทั้งหมดเพื่อคำนวณ requiredSkills ตาม yearLevel
-        skills_response = skills_table.scan()
-        all_skills = skills_response.get('Items', [])
-        print(f"Found {len(all_skills)} skills in Skills table")
+        # นับทักษะบังคับต่อชั้นปีครั้งเดียว (Skills มาจาก cache)
+        required_counts = count_required_skills_by_year(get_reference_items('Skills'))
+        
+        # ดึง ProgressSummary ของนักศึกษาทุกคนในครั้งเดียว (แทน query CompletedSkills ทีละคน)
+        summaries = get_summaries(
+            [student['studentId'] for student in students],
+            {student['studentId']: year_level_of(student) for student in students}
+        )
         
         # ดึงข้อมูลทักษะเพิ่มเติมสำหรับแต่ละนักศึกษา
         for student in students:
-            student_year_level = student.get('yearLevel', 1)
-            
-            # คำนวณจำนวนทักษะบังคับสำหรับชั้นปีของนักศึกษา
-            required_skills_count = count_required_skills_by_year(all_skills, student_year_level)
-            student['requiredSkills'] = required_skills_count
-            
-            print(f"Student {student['studentId']} (Year {student_year_level}) has {required_skills_count} required skills")
+            student['requiredSkills'] = required_counts.get(student.get('yearLevel', 1), 0)
             
             # นับจำนวนทักษะที่นักศึกษาได้รับ
-            try:
-                skills_response = completed_skills_table.query(
-                    KeyConditionExpression='studentId = :student_id',
-                    ExpressionAttributeValues={
-                        ':student_id': student['studentId']
-                    }
-                )
-                
-                student['completedSkills'] = len(skills_response.get('Items', []))
-                
-            except Exception as e:
-                print(f"Error fetching skills for student {student['studentId']}: {str(e)}")
-                student['completedSkills'] = 0
+            progress = summaries.get(student['studentId'], {})
+            student['completedRequiredSkills'] = int(progress.get('completedRequiredSkills', 0))
+            student['completedSkills'] = int(
+                progress.get('completedRequiredSkills', 0) + progress.get('completedOptionalSkills', 0)
+            )
+        
+        sort_by = query_params.get('sortBy')
+        if sort_by in SORT_KEYS:
+            students.sort(key=SORT_KEYS[sort_by], reverse=query_params.get('order') == 'desc')
+        
+        if limit is not None:
+            page = students[offset:offset + limit]
+            next_offset = offset + limit
+            
+            return {
+                'statusCode': 200,
+                'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+                'body': dumps({
+                    'students': page,
+                    'total': len(students),
+                    'nextToken': encode_cursor({'offset': next_offset}) if next_offset < len(students) else None
+                })
+            }
         
-        # ใช้ DecimalEncoder เพื่อแปลงค่า Decimal
+        # แปลงค่า Decimal ด้วย jsonUtils.dumps
         return {
             'statusCode': 200,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(students, cls=DecimalEncoder)
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps(students)
         }
         
     except Exception as e:
@@ -119,6 +130,6 @@ def lambda_handler(event, context):
         traceback.print_exc()
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดในการดึงข้อมูลนักศึกษา', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการดึงข้อมูลนักศึกษา', 'details': str(e)})
         }
\ No newline at end of file
@@ -1,20 +1,8 @@
-import json
-import boto3
-import decimal
 from botocore.exceptions import ClientError
+from refCache import get_reference_items
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+from httpCache import cacheable_response, CACHE_SKILLS
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
-
-# Helper class to convert a DynamoDB item to JSON
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            if o % 1 > 0:
-                return float(o)
-            else:
-                return int(o)
-        return super(DecimalEncoder, self).default(o)
 
 def lambda_handler(event, context):
     """
@@ -25,6 +13,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -40,31 +29,23 @@ def lambda_handler(event, context):
     try:
         print('Fetching all skills from Skills table')
         
-        # Connect to Skills table
-        skills_table = dynamodb.Table('Skills')
-        
-        # Scan all skills
-        response = skills_table.scan()
-        
-        skills = response.get('Items', [])
+        # ดึง skills ทั้งหมดจาก cache (scan ใหม่เมื่อ cache หมดอายุ)
+        skills = get_reference_items('Skills')
         print(f'Found {len(skills)} skills total')
         
         # Log skills for debugging
         for skill in skills:
             print(f'Skill {skill.get("skillId")}: {skill.get("name")} (isRequired: {skill.get("isRequired")})')
         
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps(skills, cls=DecimalEncoder)
-        }
+        # ETag จากเนื้อหา: เปิดซ้ำได้ 304 (ไม่มี body) ถ้า Skills ไม่เปลี่ยน
+        return cacheable_response(event, headers, dumps(skills), CACHE_SKILLS)
         
     except ClientError as e:
         print(f'DynamoDB error: {str(e)}')
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล',
                 'details': str(e)
             })
@@ -74,7 +55,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด',
                 'details': str(e)
             })
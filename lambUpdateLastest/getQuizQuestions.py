@@ -1,10 +1,85 @@
+import os
 import json
-import boto3
+import time
 import random
 from botocore.exceptions import ClientError
+from dynamoUtils import scan_items, query_items, index_missing
+from refCache import get_reference_map
+from quizToken import issue_quiz_token, QuizTokenConfigError
+from awsClients import dynamodb
+from jsonUtils import dumps, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+
+QUESTIONS_PER_QUIZ = 10
+TIME_LIMIT_MINUTES = 15
+QUIZ_POOL_TTL = int(os.getenv('QUIZ_POOL_TTL', '600'))  # วินาที
+QUESTIONS_SKILL_INDEX = os.getenv('QUESTIONS_SKILL_INDEX', 'skillId-index')
+SKILL_COUNTS_TABLE = os.getenv('SKILL_COUNTS_TABLE', 'StudentSkillActivityCounts')
+REQUIRED_CONFIRMED_ACTIVITIES = 3
+
+# คลังคำถามต่อ skillId ที่อยู่ข้าม warm invocation: skillId -> {'questions': [...], 'loadedAt': float}
+_question_pools = {}
+
+
+def decode_options(raw_options):
+    """
+    แปลง options ให้เป็น list ของ string
+    รองรับทั้ง list ปกติ และ string JSON แบบ DynamoDB ('[{"S": "A. ..."}, ...]')
+    """
+    if isinstance(raw_options, str):
+        try:
+            raw_options = json.loads(raw_options)
+        except ValueError:
+            return [raw_options]
+    if not isinstance(raw_options, list):
+        return []
+    return [opt.get('S', '') if isinstance(opt, dict) else str(opt) for opt in raw_options]
+
+
+def load_question_items(skill_id):
+    """อ่านคำถามของ skill ด้วย query บน GSI (ถ้ายังไม่ได้สร้าง GSI ใช้ scan แทน ดู createQuizQuestionIndex.py)"""
+    try:
+        return list(query_items(
+            'QuizQuestions',
+            IndexName=QUESTIONS_SKILL_INDEX,
+            KeyConditionExpression='skillId = :skillId',
+            ExpressionAttributeValues={':skillId': skill_id}
+        ))
+    except ClientError as e:
+        if not index_missing(e):
+            raise
+        print(f"GSI query failed, falling back to scan: {str(e)}")
+        return list(scan_items(
+            'QuizQuestions',
+            FilterExpression='skillId = :skillId',
+            ExpressionAttributeValues={':skillId': skill_id}
+        ))
+
+
+def get_question_pool(skill_id):
+    """คืนคลังคำถามของ skill จาก cache (โหลดใหม่เมื่อหมดอายุ)"""
+    now = time.time()
+    pool = _question_pools.get(skill_id)
+    if pool and now - pool['loadedAt'] < QUIZ_POOL_TTL:
+        return pool['questions']
+
+    # ลบ pool ที่หมดอายุแล้วออก เพื่อไม่ให้ container เก็บของเก่าไว้
+    for expired_id in [k for k, v in _question_pools.items() if now - v['loadedAt'] >= QUIZ_POOL_TTL]:
+        del _question_pools[expired_id]
+
+    questions = [
+        {
+            'questionId': q['questionId'],
+            'question': q['question'],
+            'options': decode_options(q.get('options')),
+            'difficulty': q.get('difficulty', 'medium'),
+            'correctAnswer': q.get('correctAnswer')
+        }
+        for q in load_question_items(skill_id)
+    ]
+    _question_pools[skill_id] = {'questions': questions, 'loadedAt': now}
+    print(f"Loaded {len(questions)} questions for {skill_id} into pool")
+    return questions
 
 def lambda_handler(event, context):
     """
@@ -15,6 +90,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -35,50 +111,44 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': 'ต้องระบุ skillId'})
+                'body': dumps({'error': 'ต้องระบุ skillId'})
             }
         
         # ตรวจสอบว่านักศึกษามีสิทธิ์ทำแบบทดสอบหรือไม่
-        student_id = event.get('queryStringParameters', {}).get('studentId') if event.get('queryStringParameters') else None
+        # token ของรอบทำแบบทดสอบผูกกับนักศึกษา จึงต้องระบุ studentId เสมอ
+        student_id = (event.get('queryStringParameters') or {}).get('studentId')
+        
+        if not student_id:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': dumps({'error': 'ต้องระบุ studentId'})
+            }
         
-        if student_id:
-            # ตรวจสอบว่าเข้าร่วมกิจกรรมครบ 3 ครั้งแล้วหรือไม่
-            if not check_quiz_eligibility(student_id, skill_id):
-                return {
-                    'statusCode': 403,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'ยังไม่มีสิทธิ์ทำแบบทดสอบ ต้องเข้าร่วมกิจกรรมครบ 3 ครั้งก่อน'})
-                }
+        # ตรวจสอบว่าเข้าร่วมกิจกรรมครบ 3 ครั้งแล้วหรือไม่
+        if not check_quiz_eligibility(student_id, skill_id):
+            return {
+                'statusCode': 403,
+                'headers': headers,
+                'body': dumps({'error': 'ยังไม่มีสิทธิ์ทำแบบทดสอบ ต้องเข้าร่วมกิจกรรมครบ 3 ครั้งก่อน'})
+            }
         
         # ดึงข้อมูลทักษะเพื่อแสดงชื่อ
-        skills_table = dynamodb.Table('Skills')
-        skill_response = skills_table.get_item(
-            Key={'skillId': skill_id}
-        )
-        skill_info = skill_response.get('Item', {})
+        skill_info = get_reference_map('Skills', 'skillId').get(skill_id, {})
         skill_name = skill_info.get('name', 'ทักษะ')
         
-        # ดึงคำถามจากฐานข้อมูล
-        questions_table = dynamodb.Table('QuizQuestions')
-        
-        response = questions_table.scan(
-            FilterExpression='skillId = :skillId',
-            ExpressionAttributeValues={
-                ':skillId': skill_id
-            }
-        )
-        
-        questions = response.get('Items', [])
+        # ดึงคำถามจากคลังคำถามใน cache
+        questions = get_question_pool(skill_id)
         
         if not questions:
             return {
                 'statusCode': 404,
                 'headers': headers,
-                'body': json.dumps({'error': 'ไม่พบคำถามสำหรับทักษะนี้'})
+                'body': dumps({'error': 'ไม่พบคำถามสำหรับทักษะนี้'})
             }
         
         # สุ่มคำถาม 10 ข้อ (หรือทั้งหมดถ้ามีน้อยกว่า 10)
-        num_questions = min(10, len(questions))
+        num_questions = min(QUESTIONS_PER_QUIZ, len(questions))
         selected_questions = random.sample(questions, num_questions)
         
         # ลบคำตอบที่ถูกต้องออกก่อนส่งให้ client
@@ -92,16 +162,20 @@ def lambda_handler(event, context):
             }
             quiz_questions.append(quiz_question)
         
+        # token ของรอบนี้ (เก็บ answer key ไว้ให้ submitQuizAnswers ตรวจโดยไม่ต้องอ่านตารางซ้ำ)
+        quiz_token = issue_quiz_token(student_id, skill_id, selected_questions, TIME_LIMIT_MINUTES)
+        
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'skillId': skill_id,
                 'skillName': skill_name,
                 'questions': quiz_questions,
                 'totalQuestions': len(quiz_questions),
-                'timeLimit': 15,  # 15 นาที
-                'passingScore': 70
+                'timeLimit': TIME_LIMIT_MINUTES,  # 15 นาที
+                'passingScore': 70,
+                'quizToken': quiz_token
             })
         }
         
@@ -110,47 +184,38 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล'})
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล'})
+        }
+    except QuizTokenConfigError as e:
+        print(f"Configuration error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'error': 'ระบบแบบทดสอบยังไม่ได้ตั้งค่า (QUIZ_TOKEN_SECRET)'})
         }
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด'})
+            'body': dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด'})
         }
 
 def check_quiz_eligibility(student_id, skill_id):
     """
     ตรวจสอบว่านักศึกษามีสิทธิ์ทำแบบทดสอบหรือไม่
+    อ่านจากตัวนับกิจกรรมที่ยืนยันแล้วต่อ (studentId, skillId) ซึ่ง verifyActivityCode อัปเดตให้
     """
     try:
-        # ตรวจสอบจำนวนกิจกรรมที่เข้าร่วม
-        participations_table = dynamodb.Table('ActivityParticipations')
-        activities_table = dynamodb.Table('Activities')
-        
-        # ค้นหา participations ของนักศึกษา
-        participations_response = participations_table.scan(
-            FilterExpression='studentId = :studentId',
-            ExpressionAttributeValues={
-                ':studentId': student_id
-            }
+        counts_table = dynamodb.Table(SKILL_COUNTS_TABLE)
+        response = counts_table.get_item(
+            Key={'studentId': student_id, 'skillId': skill_id}
         )
-        
-        confirmed_activities = []
-        for participation in participations_response.get('Items', []):
-            if participation.get('isConfirmed'):
-                # ดึงข้อมูลกิจกรรม
-                activity_response = activities_table.get_item(
-                    Key={'activityId': participation['activityId']}
-                )
-                activity = activity_response.get('Item')
-                if activity and activity.get('skillId') == skill_id:
-                    confirmed_activities.append(activity)
+        confirmed_count = response.get('Item', {}).get('confirmedCount', 0)
         
         # ต้องเข้าร่วมกิจกรรมครบ 3 ครั้ง
-        return len(confirmed_activities) >= 3
+        return confirmed_count >= REQUIRED_CONFIRMED_ACTIVITIES
         
     except Exception as e:
         print(f"Error checking eligibility: {str(e)}")
-        return False
\ No newline at end of file
+        return False
@@ -1,9 +1,16 @@
 import json
-import boto3
 from botocore.exceptions import ClientError
+from refCache import get_reference_items
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+from httpCache import cacheable_response, CACHE_SKILLS
 
-# สร้าง DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+
+def load_required_skills(year_level):
+    """ทักษะบังคับของชั้นปี (จาก cache ของ Skills ใช้ร่วมกับ getStudentOverview)"""
+    return [
+        skill for skill in get_reference_items('Skills')
+        if skill.get('isRequired') is True and skill.get('yearLevel') == year_level
+    ]
 
 def lambda_handler(event, context):
     print('Event received:', json.dumps(event))
@@ -15,44 +22,36 @@ def lambda_handler(event, context):
         print('No yearLevel provided')
         return {
             'statusCode': 400,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'ต้องระบุชั้นปีที่ศึกษา'})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'ต้องระบุชั้นปีที่ศึกษา'})
         }
     
     print(f'Looking up required skills for year level: {year_level}')
     
     try:
         # ค้นหาทักษะที่บังคับสำหรับชั้นปีที่ระบุ
-        skills_table = dynamodb.Table('Skills')
-        
-        response = skills_table.scan(
-            FilterExpression='isRequired = :isRequired AND yearLevel = :yearLevel',
-            ExpressionAttributeValues={
-                ':isRequired': True,
-                ':yearLevel': int(year_level)
-            }
-        )
-        
-        required_skills = response.get('Items', [])
+        year_level_num = int(year_level)
+        required_skills = load_required_skills(year_level_num)
         print(f'Found {len(required_skills)} required skills for year level {year_level}')
         
-        return {
-            'statusCode': 200,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(required_skills, default=str)
-        }
+        return cacheable_response(
+            event,
+            {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            dumps(required_skills),
+            CACHE_SKILLS
+        )
         
     except ClientError as e:
         print('Error:', str(e))
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'Failed to fetch required skills', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'Failed to fetch required skills', 'details': str(e)})
         }
     except Exception as e:
         print('Unexpected error:', str(e))
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดในการดึงข้อมูลทักษะที่บังคับ', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการดึงข้อมูลทักษะที่บังคับ', 'details': str(e)})
         }
\ No newline at end of file
@@ -1,21 +1,82 @@
-import json
-import boto3
-import decimal
 from botocore.exceptions import ClientError
+from dynamoUtils import batch_get_items, parse_limit, encode_cursor
+from participationUtils import participation_page, page_start_key, list_participations, STATUS_REGISTERED
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+from httpCompression import with_compression
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
 
-# Helper class to convert a DynamoDB item to JSON
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            if o % 1 > 0:
-                return float(o)
-            else:
-                return int(o)
-        return super(DecimalEncoder, self).default(o)
+def combine_participation(activity, participation):
+    """รวมข้อมูลกิจกรรมกับสถานะการเข้าร่วมของนักศึกษาเป็น 1 รายการใน response"""
+    return {
+        # ข้อมูลจาก Activities table
+        'activityId': activity.get('activityId'),
+        'name': activity.get('name'),
+        'description': activity.get('description'),
+        'location': activity.get('location'),
+        'startDateTime': activity.get('startDateTime'),
+        'endDateTime': activity.get('endDateTime'),
+        'organizerId': activity.get('organizerId'),
+        'skillId': activity.get('skillId'),
+        'qrCode': activity.get('qrCode'),
+        
+        # ข้อมูลจาก ActivityParticipations table
+        'participationId': participation.get('participationId'),
+        'status': participation.get('status', STATUS_REGISTERED),   # waitlisted = รายชื่อสำรอง ยังไม่ได้ที่นั่ง
+        'isConfirmed': participation.get('isConfirmed', False),
+        'surveyCompleted': participation.get('surveyCompleted', False),
+        'registeredAt': participation.get('registeredAt'),
+        'confirmedAt': participation.get('confirmedAt'),
+        'surveyCompletedAt': participation.get('surveyCompletedAt')
+    }
+
+def load_student_activities(student_id):
+    """
+    กิจกรรมที่นักศึกษาลงทะเบียน รวมข้อมูลกิจกรรมกับสถานะการเข้าร่วม
+    เรียงตามวันที่เริ่มกิจกรรม (ใหม่ก่อน) ใช้ร่วมกับ getStudentOverview
+    """
+    # participations ของนักศึกษา (query GSI studentId เหมือนแบบแบ่งหน้า)
+    participations = list_participations('studentId', student_id)
+    print(f"Found {len(participations)} participations")
+    
+    if not participations:
+        return []
+    
+    # ดึงข้อมูล activities ทั้งหมดที่เกี่ยวข้องด้วย BatchGetItem
+    activity_map = batch_get_items(
+        'Activities', 'activityId', [p.get('activityId') for p in participations]
+    )
+    print(f"Fetched {len(activity_map)} activities")
+    
+    # รวมข้อมูล activities กับ participations
+    result = []
+    
+    for participation in participations:
+        activity_id = participation.get('activityId')
+        activity = activity_map.get(activity_id)
+        if activity:
+            result.append(combine_participation(activity, participation))
+        else:
+            print(f"Activity {activity_id} not found in Activities table")
+    
+    # เรียงตามวันที่เริ่มกิจกรรม (ใหม่ก่อน)
+    result.sort(key=lambda x: x.get('startDateTime', ''), reverse=True)
+    return result
 
+def load_student_activities_page(student_id, limit, start_key=None):
+    """
+    กิจกรรมของนักศึกษา 1 หน้า (query GSI studentId เรียงตาม activityId) คืน (activities, last_key)
+    """
+    participations, last_key = participation_page('studentId', student_id, limit, start_key)
+    activity_map = batch_get_items(
+        'Activities', 'activityId', [p.get('activityId') for p in participations]
+    )
+    result = [
+        combine_participation(activity_map[p.get('activityId')], p)
+        for p in participations if p.get('activityId') in activity_map
+    ]
+    return result, last_key
+
+@with_compression
 def lambda_handler(event, context):
     """
     GET /students/{studentId}/activities
@@ -25,6 +86,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -45,102 +107,44 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
+                'body': dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
             }
         
-        # เชื่อมต่อ DynamoDB tables
-        participations_table = dynamodb.Table('ActivityParticipations')
-        activities_table = dynamodb.Table('Activities')
-        
-        # ค้นหา participations ของนักศึกษา โดยใช้ scan เนื่องจากยังไม่มี GSI
-        print(f"Searching for participations with studentId: {student_id} (as string)")
-        
-        participations_response = participations_table.scan(
-            FilterExpression='studentId = :studentId',
-            ExpressionAttributeValues={
-                ':studentId': student_id  # ใช้เป็น string ตามที่ตั้งค่าใน DynamoDB
-            }
-        )
-        
-        participations = participations_response.get('Items', [])
-        print(f"Found {len(participations)} participations")
-        
-        # Debug: แสดง participations ที่พบ
-        for i, p in enumerate(participations[:3]):  # แสดง 3 รายการแรก
-            print(f"Participation {i+1}: {json.dumps(p, cls=DecimalEncoder)}")
-        
-        if not participations:
-            # Debug: ลองดู participations ทั้งหมดในตาราง
-            print("No participations found, checking all participations in table...")
-            all_participations = participations_table.scan(Limit=10)
-            print(f"Total participations in table: {all_participations.get('Count', 0)}")
-            
-            for i, p in enumerate(all_participations.get('Items', [])[:3]):
-                print(f"Sample participation {i+1}: {json.dumps(p, cls=DecimalEncoder)}")
-            
+        # แบ่งหน้า (?limit=&nextToken=) ต่อจาก ExclusiveStartKey ของ GSI
+        query_params = event.get('queryStringParameters') or {}
+        if query_params.get('limit'):
+            activities, last_key = load_student_activities_page(
+                student_id, parse_limit(query_params['limit']),
+                page_start_key('studentId', student_id, query_params.get('nextToken'))
+            )
             return {
                 'statusCode': 200,
-                'headers': headers,  
-                'body': json.dumps([], cls=DecimalEncoder)
+                'headers': headers,
+                'body': dumps({'activities': activities, 'nextToken': encode_cursor(last_key)})
             }
         
-        # รวมข้อมูล activities กับ participations
-        result = []
-        
-        for participation in participations:
-            activity_id = participation.get('activityId')
-            print(f"Fetching activity: {activity_id}")
-            
-            # ดึงข้อมูล activity
-            activity_response = activities_table.get_item(
-                Key={'activityId': activity_id}
-            )
-            
-            activity = activity_response.get('Item')
-            if activity:
-                print(f"Found activity: {activity.get('name', 'No name')}")
-                # รวมข้อมูล
-                combined_data = {
-                    # ข้อมูลจาก Activities table
-                    'activityId': activity.get('activityId'),
-                    'name': activity.get('name'),
-                    'description': activity.get('description'),
-                    'location': activity.get('location'),
-                    'startDateTime': activity.get('startDateTime'),
-                    'endDateTime': activity.get('endDateTime'),
-                    'organizerId': activity.get('organizerId'),
-                    'skillId': activity.get('skillId'),
-                    'qrCode': activity.get('qrCode'),
-                    
-                    # ข้อมูลจาก ActivityParticipations table
-                    'participationId': participation.get('participationId'),
-                    'isConfirmed': participation.get('isConfirmed', False),
-                    'surveyCompleted': participation.get('surveyCompleted', False),
-                    'registeredAt': participation.get('registeredAt'),
-                    'confirmedAt': participation.get('confirmedAt'),
-                    'surveyCompletedAt': participation.get('surveyCompletedAt')
-                }
-                
-                result.append(combined_data)
-            else:
-                print(f"Activity {activity_id} not found in Activities table")
-        
-        # เรียงตามวันที่เริ่มกิจกรรม (ใหม่ก่อน)
-        result.sort(key=lambda x: x.get('startDateTime', ''), reverse=True)
+        result = load_student_activities(student_id)
         
         print(f"Returning {len(result)} activities to client")
         
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': dumps(result)
         }
         
+    except ValueError as e:
+        # limit หรือ nextToken ไม่ถูกต้อง
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'error': 'พารามิเตอร์ limit หรือ nextToken ไม่ถูกต้อง', 'details': str(e)})
+        }
     except ClientError as e:
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล',
                 'details': str(e)
             })
@@ -149,7 +153,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด',
                 'details': str(e)
             })
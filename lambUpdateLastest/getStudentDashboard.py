@@ -0,0 +1,96 @@
+import time
+from botocore.exceptions import ClientError
+from getStudentInfo import load_student_info
+from getStudentSkillsSummary import load_skills_summary
+from ioPool import gather
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+
+
+def timed(func, *args):
+    """เรียก func แล้วคืน (ผลลัพธ์, เวลาที่ใช้เป็นมิลลิวินาที)"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+def server_timing(durations):
+    """สร้างค่า header Server-Timing เช่น info;dur=12.3, summary;dur=8.1"""
+    return ', '.join(f'{name};dur={duration:.1f}' for name, duration in durations.items())
+
+def lambda_handler(event, context):
+    """
+    GET /students/{studentId}/dashboard
+    ข้อมูลทั้งหมดที่หน้า dashboard ต้องใช้ตอนเปิดครั้งแรก (info, summary) ใน response เดียว
+    อ่านแต่ละส่วนพร้อมกัน และรายงานเวลาของแต่ละส่วนใน header Server-Timing
+    """
+    started = time.perf_counter()
+
+    # CORS headers (ต้อง expose Server-Timing ให้ browser อ่านได้ข้าม origin)
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+        'Access-Control-Allow-Methods': 'GET,OPTIONS',
+        'Access-Control-Expose-Headers': 'Server-Timing',
+        'Timing-Allow-Origin': '*'
+    }
+
+    # Handle preflight OPTIONS request
+    if event.get('httpMethod') == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': ''
+        }
+
+    student_id = (event.get('pathParameters') or {}).get('studentId')
+    if not student_id:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'success': False, 'error': 'ต้องระบุรหัสนักศึกษา'})
+        }
+
+    try:
+        # ทั้งสองส่วนไม่ขึ้นต่อกัน จึงอ่านพร้อมกัน
+        # (หน้าเว็บไม่ได้แสดงรายการทักษะทั้งหมด จึงไม่โหลด load_student_skills)
+        loaders = {
+            'info': load_student_info,
+            'summary': load_skills_summary,
+        }
+        results = gather({
+            name: (lambda loader=loader: timed(loader, student_id)) for name, loader in loaders.items()
+        })
+
+        durations = {name: duration for name, (_, duration) in results.items()}
+        data = {name: result for name, (result, _) in results.items()}
+
+        if not data['info']:
+            return {
+                'statusCode': 404,
+                'headers': headers,
+                'body': dumps({'success': False, 'error': 'ไม่พบข้อมูลนักศึกษา'})
+            }
+
+        durations['total'] = (time.perf_counter() - started) * 1000
+        print(f"Dashboard for {student_id}: {server_timing(durations)}")
+
+        return {
+            'statusCode': 200,
+            'headers': dict(headers, **{'Server-Timing': server_timing(durations)}),
+            'body': dumps({'success': True, 'data': data})
+        }
+
+    except ClientError as e:
+        print('DynamoDB Error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'success': False, 'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล', 'details': str(e)})
+        }
+    except Exception as e:
+        print('Unexpected error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'success': False, 'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
+        }
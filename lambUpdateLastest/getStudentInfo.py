@@ -1,9 +1,31 @@
 import json
-import boto3
 from botocore.exceptions import ClientError
+from awsClients import dynamodb
+from jsonUtils import dumps, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+
+def load_student_info(student_id):
+    """ข้อมูลพื้นฐานของนักศึกษา (ใช้ร่วมกับ getStudentOverview) คืน None ถ้าไม่พบ"""
+    # ดึงข้อมูลนักศึกษาจากตาราง Students
+    students_table = dynamodb.Table('Students')
+    student_response = students_table.get_item(
+        Key={'studentId': student_id}
+    )
+    
+    student_data = student_response.get('Item', {})
+    
+    if not student_data:
+        return None
+    
+    # สร้างข้อมูลที่จะส่งกลับ
+    return {
+        'studentId': student_id,
+        'name': student_data.get('name', ''),
+        'yearLevel': student_data.get('yearLevel', 1),
+        'department': student_data.get('department', ''),
+        'advisorId': student_data.get('advisorId', ''),
+        'requiredSkills': student_data.get('requiredSkills', 0)
+    }
 
 def lambda_handler(event, context):
     print('Event received:', json.dumps(event))
@@ -15,57 +37,41 @@ def lambda_handler(event, context):
         print('No studentId provided')
         return {
             'statusCode': 400,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
         }
     
     print(f'Looking up info for student: {student_id}')
     
     try:
-        # ดึงข้อมูลนักศึกษาจากตาราง Students
-        students_table = dynamodb.Table('Students')
-        student_response = students_table.get_item(
-            Key={'studentId': student_id}
-        )
+        student_info = load_student_info(student_id)
         
-        student_data = student_response.get('Item', {})
-        
-        if not student_data:
+        if not student_info:
             return {
                 'statusCode': 404,
-                'headers': {'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'error': 'ไม่พบข้อมูลนักศึกษา'})
+                'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+                'body': dumps({'error': 'ไม่พบข้อมูลนักศึกษา'})
             }
         
-        # สร้างข้อมูลที่จะส่งกลับ
-        student_info = {
-            'studentId': student_id,
-            'name': student_data.get('name', ''),
-            'yearLevel': student_data.get('yearLevel', 1),
-            'department': student_data.get('department', ''),
-            'advisorId': student_data.get('advisorId', ''),
-            'requiredSkills': student_data.get('requiredSkills', 0)
-        }
-        
-        print('Student info:', json.dumps(student_info, default=str))
+        print('Student info:', dumps(student_info))
         
         return {
             'statusCode': 200,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(student_info, default=str)
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps(student_info)
         }
         
     except ClientError as e:
         print('Error:', str(e))
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'Failed to fetch student info', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'Failed to fetch student info', 'details': str(e)})
         }
     except Exception as e:
         print('Unexpected error:', str(e))
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'Failed to fetch student info', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'Failed to fetch student info', 'details': str(e)})
         }
\ No newline at end of file
@@ -0,0 +1,118 @@
+from botocore.exceptions import ClientError
+from getStudentInfo import load_student_info
+from getRequiredSkills import load_required_skills
+from getStudentActivities import load_student_activities
+from getStudentSkills import load_student_skills
+from refCache import get_reference_items
+from ioPool import gather
+from jsonUtils import dumps, JSON_CONTENT_TYPE
+
+# ส่วนข้อมูลที่เลือกได้ด้วย ?include=info,requiredSkills,activities,skills
+SECTIONS = ('info', 'requiredSkills', 'activities', 'skills')
+
+
+def parse_include(query_params):
+    """แปลง ?include= เป็นชุดของ section (ไม่ระบุ = ทุก section) คืน None ถ้ามีชื่อที่ไม่รู้จัก"""
+    include = (query_params or {}).get('include')
+    if not include:
+        return set(SECTIONS)
+
+    sections = {name.strip() for name in include.split(',') if name.strip()}
+    if not sections or not sections.issubset(SECTIONS):
+        return None
+    return sections
+
+def lambda_handler(event, context):
+    """
+    GET /students/{studentId}/overview
+    รวมข้อมูลนักศึกษา ทักษะบังคับ กิจกรรม และทักษะที่ได้รับไว้ใน response เดียว
+    (แทนการเรียก /info -> /requiredSkills -> /activities -> /skills ต่อกัน 4 ครั้ง)
+    """
+
+    # CORS headers
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+        'Access-Control-Allow-Methods': 'GET,OPTIONS'
+    }
+
+    # Handle preflight OPTIONS request
+    if event.get('httpMethod') == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': ''
+        }
+
+    student_id = (event.get('pathParameters') or {}).get('studentId')
+    if not student_id:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
+        }
+
+    sections = parse_include(event.get('queryStringParameters'))
+    if sections is None:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'error': f"include ต้องเป็น {', '.join(SECTIONS)}"})
+        }
+
+    try:
+        # อ่านทุกตารางพร้อมกัน ทักษะบังคับต้องรู้ชั้นปีจาก info ก่อน
+        # จึงโหลด Skills เข้า cache ไปพร้อมกันแล้วค่อยกรองหลังได้ info
+        calls = {}
+        if 'info' in sections or 'requiredSkills' in sections:
+            calls['info'] = lambda: load_student_info(student_id)
+        if 'requiredSkills' in sections:
+            calls['skillsCache'] = lambda: get_reference_items('Skills')
+        if 'activities' in sections:
+            calls['activities'] = lambda: load_student_activities(student_id)
+        if 'skills' in sections:
+            calls['skills'] = lambda: load_student_skills(student_id)
+
+        results = gather(calls)
+
+        student_info = results.get('info')
+        if 'info' in calls and not student_info:
+            return {
+                'statusCode': 404,
+                'headers': headers,
+                'body': dumps({'error': 'ไม่พบข้อมูลนักศึกษา'})
+            }
+
+        overview = {'studentId': student_id}
+        if 'info' in sections:
+            overview['info'] = student_info
+        if 'requiredSkills' in sections:
+            overview['requiredSkills'] = load_required_skills(int(student_info.get('yearLevel', 1)))
+        if 'activities' in sections:
+            overview['activities'] = results['activities']
+        if 'skills' in sections:
+            overview['skills'] = results['skills']
+
+        print(f"Overview for {student_id}: {', '.join(sorted(sections))}")
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': dumps(overview)
+        }
+
+    except ClientError as e:
+        print('DynamoDB Error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการเข้าถึงฐานข้อมูล', 'details': str(e)})
+        }
+    except Exception as e:
+        print('Unexpected error:', str(e))
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
+        }
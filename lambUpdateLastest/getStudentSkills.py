@@ -1,9 +1,40 @@
 import json
-import boto3
 from botocore.exceptions import ClientError
+from dynamoUtils import batch_get_items
+from awsClients import dynamodb
+from jsonUtils import dumps, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+
+def load_student_skills(student_id):
+    """ทักษะที่นักศึกษาได้รับพร้อมรายละเอียด (ใช้ร่วมกับ getStudentOverview)"""
+    # ค้นหาทักษะที่นักศึกษาได้รับ
+    completed_skills_table = dynamodb.Table('CompletedSkills')
+    
+    response = completed_skills_table.query(
+        KeyConditionExpression='studentId = :studentId',
+        ExpressionAttributeValues={
+            ':studentId': student_id
+        }
+    )
+    
+    # ดึงรายละเอียดทักษะเพิ่มเติมจากตาราง Skills (BatchGetItem ครั้งเดียว)
+    completed_items = response.get('Items', [])
+    skill_map = batch_get_items(
+        'Skills', 'skillId', [item.get('skillId') for item in completed_items]
+    )
+    
+    skills = []
+    for item in completed_items:
+        skill_data = skill_map.get(item.get('skillId'))
+        
+        if skill_data:
+            item_with_details = dict(item)
+            item_with_details['skillName'] = skill_data.get('name')
+            item_with_details['skillDescription'] = skill_data.get('description')
+            item_with_details['skillCategory'] = skill_data.get('category')
+            skills.append(item_with_details)
+    
+    return skills
 
 def lambda_handler(event, context):
     print('Event received:', json.dumps(event))
@@ -15,63 +46,34 @@ def lambda_handler(event, context):
         print('No studentId provided')
         return {
             'statusCode': 400,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'ต้องระบุรหัสนักศึกษา'})
         }
     
     print(f'Looking up skills for student: {student_id}')
     
     try:
-        # ค้นหาทักษะที่นักศึกษาได้รับ
-        completed_skills_table = dynamodb.Table('CompletedSkills')
-        skills_table = dynamodb.Table('Skills')
-        
-        response = completed_skills_table.query(
-            KeyConditionExpression='studentId = :studentId',
-            ExpressionAttributeValues={
-                ':studentId': student_id
-            }
-        )
-        
-        print('Query result:', json.dumps(response, default=str))
-        
-        # ดึงรายละเอียดทักษะเพิ่มเติมจากตาราง Skills
-        skills = []
-        for item in response.get('Items', []):
-            skill_id = item.get('skillId')
-            skill_response = skills_table.get_item(
-                Key={'skillId': skill_id}
-            )
-            
-            skill_data = skill_response.get('Item')
-            print('Skill data:', json.dumps(skill_data, default=str))
-            
-            if skill_data:
-                item_with_details = dict(item)
-                item_with_details['skillName'] = skill_data.get('name')
-                item_with_details['skillDescription'] = skill_data.get('description')
-                item_with_details['skillCategory'] = skill_data.get('category')
-                skills.append(item_with_details)
+        skills = load_student_skills(student_id)
         
-        print('Final skills data:', json.dumps(skills, default=str))
+        print('Final skills data:', dumps(skills))
         
         return {
             'statusCode': 200,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(skills, default=str)
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps(skills)
         }
         
     except ClientError as e:
         print('Error:', str(e))
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'Failed to fetch student skills', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'Failed to fetch student skills', 'details': str(e)})
         }
     except Exception as e:
         print('Unexpected error:', str(e))
         return {
             'statusCode': 500,
-            'headers': {'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': 'Failed to fetch student skills', 'details': str(e)})
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': JSON_CONTENT_TYPE},
+            'body': dumps({'error': 'Failed to fetch student skills', 'details': str(e)})
         }
\ No newline at end of file
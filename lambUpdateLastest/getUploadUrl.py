@@ -1,10 +1,11 @@
 import json, os, mimetypes
 from datetime import datetime, timezone
 from uuid import uuid4
-import boto3
+from awsClients import client
+from jsonUtils import dumps, JSON_CONTENT_TYPE
 
 # ---------- Config ----------
-s3 = boto3.client("s3")
+s3 = client("s3")
 BUCKET = os.getenv("BUCKET", "achievehub-activity-images")
 KEY_PREFIX = os.getenv("KEY_PREFIX", "activities")
 ALLOWED_ORIGIN = os.getenv("ALLOWED_ORIGIN", "*")
@@ -15,12 +16,13 @@ ALLOWED_EXT = {".png", ".jpg", ".jpeg", ".webp"}
 def _cors_headers():
     return {
         "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
+        "Content-Type": JSON_CONTENT_TYPE,
         "Access-Control-Allow-Headers": "Content-Type,Authorization",
         "Access-Control-Allow-Methods": "OPTIONS,GET,POST,PUT",
     }
 
 def respond_ok(body: dict, status: int = 200):
-    return {"statusCode": status, "headers": _cors_headers(), "body": json.dumps(body)}
+    return {"statusCode": status, "headers": _cors_headers(), "body": dumps(body)}
 
 def respond_err(status: int, message: str):
     return respond_ok({"error": message}, status)
@@ -0,0 +1,67 @@
+import hashlib
+
+# ETag + conditional GET (If-None-Match -> 304) สำหรับ endpoint ที่ข้อมูลเหมือนกันทุกคน (catalog)
+# - content_etag: hash จาก body ที่จะส่ง (ต้องสร้าง body ก่อน แต่ประหยัด bandwidth)
+# - version_etag: hash จาก version ของตาราง (refCache.read_version) ตอบ 304 ได้โดยไม่ต้องอ่านตารางหลัก
+
+# Cache-Control ต่อ route (browser เก็บไว้ใช้ได้ตาม max-age แล้วค่อย revalidate ด้วย ETag)
+CACHE_SKILLS = 'public, max-age=3600'            # Skills เปลี่ยนไม่กี่ครั้งต่อเทอม
+CACHE_ACTIVITIES = 'public, max-age=60'           # มีกิจกรรมใหม่ได้ตลอด (ที่นั่งอ่านจาก getActivitySeats)
+CACHE_ACTIVITY_DETAIL = 'public, max-age=300'
+
+
+def _digest(data):
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:32]
+
+
+def content_etag(body):
+    """strong ETag จากเนื้อหา body"""
+    return f'"{_digest(body)}"'
+
+
+def version_etag(*parts):
+    """strong ETag จาก version ของข้อมูล + ตัวแปรของ request (เช่น query string) ที่มีผลต่อ body"""
+    return f'"v-{_digest("|".join(str(part) for part in parts))}"'
+
+
+def request_header(event, name):
+    """ค่า header ของ request (name ตัวพิมพ์เล็ก; API Gateway ส่งชื่อ header ตามที่ client ส่งมา) ไม่มี = ''"""
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value or ''
+    return ''
+
+
+def etag_matches(event, etag):
+    """request ส่ง If-None-Match ที่ตรงกับ etag มาหรือไม่ (รองรับหลายค่าและ W/ ตาม RFC 9110 weak comparison)"""
+    if_none_match = request_header(event, 'if-none-match').strip()
+    if not if_none_match:
+        return False
+    if if_none_match == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return etag in (tag[2:] if tag.startswith('W/') else tag for tag in candidates)
+
+
+def not_modified(headers, etag, cache_control):
+    """response 304 (ไม่มี body) ให้ client ใช้ของที่ cache ไว้"""
+    return {
+        'statusCode': 304,
+        'headers': dict(headers, ETag=etag, **{'Cache-Control': cache_control}),
+        'body': ''
+    }
+
+
+def cacheable_response(event, headers, body, cache_control, etag=None):
+    """
+    response 200 พร้อม ETag + Cache-Control หรือ 304 ถ้า If-None-Match ตรงกับ ETag
+    etag ไม่ระบุ = คำนวณจาก body
+    """
+    etag = etag or content_etag(body)
+    if etag_matches(event, etag):
+        return not_modified(headers, etag, cache_control)
+    return {
+        'statusCode': 200,
+        'headers': dict(headers, ETag=etag, **{'Cache-Control': cache_control}),
+        'body': body
+    }
@@ -0,0 +1,104 @@
+import os
+import gzip
+import base64
+import functools
+from httpCache import request_header
+
+# บีบอัด response body ตาม Accept-Encoding ของ client (สำหรับ endpoint ที่คืน list ขนาดใหญ่)
+# API Gateway (proxy integration) ต้องได้ body เป็น base64 พร้อม isBase64Encoded = True
+# และต้องตั้ง binaryMediaTypes ของ API ให้ครอบคลุม response ที่บีบอัด เพื่อให้ถอด base64 ก่อนส่งให้ client
+# - ตั้งเฉพาะ type ของ response (เช่น application/json) ไม่ใช้ */* ที่ทำให้ request body ทุกแบบถูก encode
+# - request ที่ Content-Type ตรงกับ binaryMediaTypes จะมา base64 (isBase64Encoded) handler ที่รับ POST
+#   จึงอ่าน body ผ่าน jsonUtils.event_body ซึ่งถอด base64 ให้
+# ทุก response ของ endpoint ที่บีบอัดได้มี Vary: Accept-Encoding และ ETag แบบ weak (W/)
+# เพราะ body ที่ส่งจริง (br / gzip / ไม่บีบ) ต่างกันตาม encoding แม้เนื้อหาเดียวกัน
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))   # body เล็กกว่านี้บีบแล้วไม่คุ้ม
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+
+# brotli เป็น optional dependency (ต้อง bundle มากับ deployment package)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def accepted_encodings(accept_encoding):
+    """แยก Accept-Encoding เป็น set ของ encoding ที่ client รับได้ (ตัดตัวที่ q=0 ออก)"""
+    accepted = set()
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token)
+    return accepted
+
+
+def choose_encoding(accept_encoding):
+    """เลือก encoding ที่จะใช้ (br ก่อน gzip) คืน None ถ้าไม่ต้องบีบอัด"""
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(event, response):
+    """บีบอัด response ของ Lambda proxy ถ้า client รองรับและ body ใหญ่พอ (ไม่งั้นคืน response เดิม)"""
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+
+    data = body.encode('utf-8')
+    if len(data) < COMPRESSION_MIN_BYTES:
+        return response
+
+    encoding = choose_encoding(request_header(event, 'accept-encoding'))
+    if not encoding:
+        return response
+
+    headers = dict(response.get('headers') or {})
+    headers['Content-Encoding'] = encoding
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compress_body(data, encoding)).decode('ascii'),
+        isBase64Encoded=True
+    )
+
+
+def weak_etag(etag):
+    """ETag แบบ weak (etag_matches เทียบแบบ weak comparison จึงตอบ 304 ได้เหมือนเดิม)"""
+    return etag if etag.startswith('W/') else f'W/{etag}'
+
+
+def vary_by_encoding(response):
+    """ใส่ Vary: Accept-Encoding และเปลี่ยน ETag เป็น weak ให้ทุก response (ทั้งที่บีบอัดและไม่บีบ, 304)"""
+    headers = dict(response.get('headers') or {})
+    headers['Vary'] = 'Accept-Encoding'
+    if headers.get('ETag'):
+        headers['ETag'] = weak_etag(headers['ETag'])
+    return dict(response, headers=headers)
+
+
+def with_compression(handler):
+    """decorator สำหรับ lambda_handler: บีบอัด response ตาม Accept-Encoding ของ request"""
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        return vary_by_encoding(compress_response(event, handler(event, context)))
+    return wrapper
@@ -0,0 +1,53 @@
+from awsClients import dynamodb
+
+# ของกลางสำหรับ migration ที่เพิ่ม GSI ให้ตารางเดิม (createParticipationIndex.py, createActivityQrIndex.py, createQuizQuestionIndex.py)
+# DynamoDB จะ backfill index จากข้อมูลเดิมให้เองระหว่างที่สถานะเป็น CREATING
+# UpdateTable สร้าง GSI ได้ครั้งละ 1 ตัว: รันซ้ำหลังตัวก่อนหน้า ACTIVE เพื่อสร้างตัวถัดไป
+
+
+def create_missing_indexes(table_name, indexes):
+    """
+    สร้าง GSI ตัวแรกที่ยังไม่มี (project ALL, key เป็น string) คืนสถานะของแต่ละ index
+    indexes: [(index_name, hash_key, range_key)] โดย range_key เป็น None ได้
+    """
+    table = dynamodb.Table(table_name)
+    table.load()
+
+    existing = {gsi['IndexName']: gsi for gsi in (table.global_secondary_indexes or [])}
+    statuses = {}
+    for index_name, hash_key, range_key in indexes:
+        if index_name in existing:
+            statuses[index_name] = existing[index_name]['IndexStatus']
+            print(f"{index_name} already exists ({statuses[index_name]})")
+            continue
+
+        if any(status != 'ACTIVE' for status in statuses.values()):
+            statuses[index_name] = 'PENDING'
+            print(f"{index_name} waits until the previous index is ACTIVE (run again later)")
+            continue
+
+        key_names = [name for name in (hash_key, range_key) if name]
+        gsi_spec = {
+            'IndexName': index_name,
+            'KeySchema': [
+                {'AttributeName': name, 'KeyType': key_type}
+                for name, key_type in zip(key_names, ('HASH', 'RANGE'))
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+        billing = (table.billing_mode_summary or {}).get('BillingMode', 'PROVISIONED')
+        if billing == 'PROVISIONED':
+            gsi_spec['ProvisionedThroughput'] = {
+                'ReadCapacityUnits': table.provisioned_throughput['ReadCapacityUnits'],
+                'WriteCapacityUnits': table.provisioned_throughput['WriteCapacityUnits']
+            }
+
+        table.meta.client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=[{'AttributeName': name, 'AttributeType': 'S'} for name in key_names],
+            GlobalSecondaryIndexUpdates=[{'Create': gsi_spec}]
+        )
+        print(f"Creating {index_name} on {table_name} (backfill runs in the background)")
+        statuses[index_name] = 'CREATING'
+
+    return statuses
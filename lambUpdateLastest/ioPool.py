@@ -0,0 +1,64 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Thread pool กลางสำหรับงาน I/O ที่ไม่ขึ้นต่อกัน (เช่น get_item หลายตาราง)
+# สร้างครั้งเดียวต่อ container แล้วใช้ซ้ำทุก invocation
+# ขนาด pool ต้องไม่เกิน MAX_POOL_CONNECTIONS ของ awsClients ไม่งั้น thread จะรอ connection กันเอง
+IO_POOL_SIZE = int(os.getenv('IO_POOL_SIZE', '8'))
+GATHER_TIMEOUT = float(os.getenv('GATHER_TIMEOUT', '10'))   # วินาทีต่อ call
+
+_executor = ThreadPoolExecutor(max_workers=IO_POOL_SIZE, thread_name_prefix='io')
+_local = threading.local()
+
+
+class GatherTimeout(TimeoutError):
+    """call ใน gather ใช้เวลาเกิน timeout ที่กำหนด"""
+
+    def __init__(self, name, timeout):
+        super().__init__(f"'{name}' did not finish within {timeout}s")
+        self.name = name
+        self.timeout = timeout
+
+
+def _run(func):
+    _local.in_pool = True
+    try:
+        return func()
+    finally:
+        _local.in_pool = False
+
+
+def gather(calls, timeout=None, timeouts=None):
+    """
+    รัน call ที่ไม่ขึ้นต่อกันพร้อมกันบน thread pool กลาง แล้วรอผลทั้งหมด
+    calls: {name: callable ไม่มี argument} เช่น {'activity': lambda: table.get_item(...)}
+    timeout: เวลารอสูงสุดต่อ call (วินาที), timeouts: กำหนดแยกราย call {name: วินาที}
+    คืน dict {name: ผลลัพธ์} ถ้า call ใดพังจะ raise exception ของ call นั้น (ตามลำดับที่ประกาศ)
+    และถ้าเกินเวลาจะ raise GatherTimeout
+    """
+    timeout = GATHER_TIMEOUT if timeout is None else timeout
+    timeouts = timeouts or {}
+
+    # ถูกเรียกซ้อนจากใน pool เอง: รันตรง ๆ กัน thread ใน pool รอกันเองจนค้าง
+    if getattr(_local, 'in_pool', False) or len(calls) <= 1:
+        return {name: func() for name, func in calls.items()}
+
+    started = time.monotonic()
+    futures = {name: _executor.submit(_run, func) for name, func in calls.items()}
+    results = {}
+    try:
+        for name, future in futures.items():
+            # นับเวลาจากตอน submit ไม่ใช่ตอนที่เริ่มรอ call นี้
+            call_timeout = timeouts.get(name, timeout)
+            remaining = max(0, started + call_timeout - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                raise GatherTimeout(name, call_timeout)
+    finally:
+        # call ที่ยังไม่เริ่มไม่ต้องรันแล้วถ้ามีตัวใดพัง
+        for future in futures.values():
+            future.cancel()
+    return results
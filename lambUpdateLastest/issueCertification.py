@@ -1,9 +1,9 @@
-import json
-import boto3
 import uuid
 from datetime import datetime, timezone, timedelta
-
-dynamodb = boto3.resource('dynamodb')
+from awsClients import dynamodb
+from participationUtils import find_participation
+from ioPool import gather
+from jsonUtils import dumps, JSON_CONTENT_TYPE
 
 ACTIVITIES_TABLE = 'Activities'
 STUDENTS_TABLE = 'Students'
@@ -13,6 +13,7 @@ CERTIFICATES_TABLE = 'Certificates'
 def lambda_handler(event, context):
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,OPTIONS'
     }
@@ -31,16 +32,23 @@ def lambda_handler(event, context):
         if not activity_id or not student_id:
             return _bad_request(headers, 'ต้องระบุ activityId และ studentId')
 
+        # อ่าน participation, certificate, activity และ student พร้อมกัน (ไม่ขึ้นต่อกัน)
+        cert_table = dynamodb.Table(CERTIFICATES_TABLE)
+        activities_table = dynamodb.Table(ACTIVITIES_TABLE)
+        students_table = dynamodb.Table(STUDENTS_TABLE)
+
+        reads = gather({
+            'participation': lambda: find_participation(student_id, activity_id),
+            'certificate': lambda: cert_table.get_item(Key={'studentId': student_id, 'activityId': activity_id}),
+            'activity': lambda: activities_table.get_item(Key={'activityId': activity_id}),
+            'student': lambda: students_table.get_item(Key={'studentId': student_id}),
+        })
+
         # 1) ตรวจสิทธิ์ใน ActivityParticipations
-        participations_table = dynamodb.Table(PARTICIPATIONS_TABLE)
-        part_resp = participations_table.get_item(
-            Key={'studentId': student_id, 'activityId': activity_id}
-        )
-        if 'Item' not in part_resp:
+        participation = reads['participation']
+        if not participation:
             return _bad_request(headers, 'ไม่พบบันทึกการเข้าร่วมกิจกรรม')
 
-        participation = part_resp['Item']
-
         if not participation.get('isConfirmed', False):
             return _bad_request(headers, 'ยังไม่ได้ยืนยันการเข้าร่วมกิจกรรม')
 
@@ -48,10 +56,7 @@ def lambda_handler(event, context):
             return _bad_request(headers, 'ต้องทำแบบประเมินกิจกรรมให้เรียบร้อยก่อนรับเกียรติบัตร')
 
         # 2) สร้างหรือดึง certificate record
-        cert_table = dynamodb.Table(CERTIFICATES_TABLE)
-        cert_resp = cert_table.get_item(
-            Key={'studentId': student_id, 'activityId': activity_id}
-        )
+        cert_resp = reads['certificate']
 
         thai_tz = timezone(timedelta(hours=7))
         now = datetime.now(thai_tz)
@@ -69,12 +74,9 @@ def lambda_handler(event, context):
             }
             cert_table.put_item(Item=cert_item)
 
-        # 3) ดึงข้อมูล Activity + Student
-        activities_table = dynamodb.Table(ACTIVITIES_TABLE)
-        students_table = dynamodb.Table(STUDENTS_TABLE)
-
-        act_resp = activities_table.get_item(Key={'activityId': activity_id})
-        stu_resp = students_table.get_item(Key={'studentId': student_id})
+        # 3) ข้อมูล Activity + Student
+        act_resp = reads['activity']
+        stu_resp = reads['student']
 
         activity = act_resp.get('Item', {}) if act_resp else {}
         student = stu_resp.get('Item', {}) if stu_resp else {}
@@ -99,7 +101,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({'success': True, 'certificate': result}, ensure_ascii=False)
+            'body': dumps({'success': True, 'certificate': result})
         }
 
     except Exception as e:
@@ -107,12 +109,12 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'success': False, 'message': 'เกิดข้อผิดพลาดภายในระบบ'}, ensure_ascii=False)
+            'body': dumps({'success': False, 'message': 'เกิดข้อผิดพลาดภายในระบบ'})
         }
 
 def _bad_request(headers, msg):
     return {
         'statusCode': 400,
         'headers': headers,
-        'body': json.dumps({'success': False, 'message': msg}, ensure_ascii=False)
+        'body': dumps({'success': False, 'message': msg})
     }
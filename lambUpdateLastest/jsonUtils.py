@@ -0,0 +1,53 @@
+import json
+import base64
+import binascii
+import datetime
+from decimal import Decimal
+
+# JSON encoder กลางสำหรับ response body ของทุก handler (แทน DecimalEncoder ที่ copy ไว้หลายไฟล์)
+# - Decimal ที่เป็นจำนวนเต็ม -> int, ที่มีทศนิยม -> float (ทั้งบวกและลบ)
+# - set -> list, datetime/date -> ISO 8601
+# - separators แบบ compact และ output เป็น UTF-8 (ไม่ escape ภาษาไทยเป็น \uXXXX)
+
+# ใส่ใน headers ของทุก response ให้ browser ถอดรหัสภาษาไทยเป็น UTF-8 เสมอ
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+# ใช้ orjson (C extension) ถ้ามีใน deployment package ไม่งั้นใช้ json ของ standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_default(o):
+    if isinstance(o, Decimal):
+        return int(o) if o == o.to_integral_value() else float(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if isinstance(o, (datetime.datetime, datetime.date)):
+        return o.isoformat()
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+_encoder = json.JSONEncoder(default=json_default, ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps(obj):
+    """แปลง obj เป็น JSON string สำหรับ response body"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return _encoder.encode(obj)
+
+
+def event_body(event):
+    """
+    request body ของ Lambda proxy เป็น string (ไม่มี body = '')
+    ถ้า API Gateway ส่งมาเป็น base64 (isBase64Encoded) จะถอดให้ก่อน ถอดไม่ได้คืน body เดิม (json.loads จะแจ้ง JSON ผิดเอง)
+    """
+    body = event.get('body') or ''
+    if body and event.get('isBase64Encoded'):
+        try:
+            return base64.b64decode(body, validate=True).decode('utf-8')
+        except (binascii.Error, UnicodeDecodeError):
+            return body
+    return body
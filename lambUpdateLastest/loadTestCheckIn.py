@@ -0,0 +1,136 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchUtils import require_local_endpoint, create_table, put_items, percentiles, timed_ms
+
+# Load test: นักศึกษา BENCH_STUDENTS คนสแกน QR เดียวกันพร้อมกันตอนเริ่มกิจกรรม
+# เรียก verifyActivityCode.lambda_handler ตรง ๆ จาก BENCH_CONCURRENCY thread (แทน Lambda ที่รันพร้อมกัน)
+# กับ DynamoDB จำลองในเครื่อง แต่ละคนสแกน BENCH_SCANS_PER_STUDENT ครั้ง (สแกนซ้ำต้องได้ 400)
+# ตรวจว่ายืนยันสำเร็จคนละครั้งพอดี และ confirmedCount ใน StudentSkillActivityCounts ไม่นับซ้ำ
+# ตารางสร้างแบบเดียวกับ production: ตารางหลักตามด้วย GSI จาก migration (createActivityQrIndex / createParticipationIndex)
+#
+# ผลที่วัดได้ (moto_server บนเครื่อง 1 vCPU, 500 คน x สแกน 2 ครั้ง = 1,000 request):
+#   concurrency 500: ยืนยัน 500, ปฏิเสธสแกนซ้ำ 500, error 0, ~35 scans/s, p50 5.2-5.5 s, p99 17-22 s
+#   concurrency 50:  ยืนยัน 500, ปฏิเสธสแกนซ้ำ 500, error 0, 54 scans/s, p50 876 ms, p99 1,593 ms
+#   latency เป็นของ server จำลองที่ทำงานบน core เดียว ไม่ใช่ตัวเลขของ DynamoDB จริง
+BENCH_STUDENTS = int(os.getenv('BENCH_STUDENTS', '500'))
+BENCH_CONCURRENCY = int(os.getenv('BENCH_CONCURRENCY', '500'))
+BENCH_SCANS_PER_STUDENT = int(os.getenv('BENCH_SCANS_PER_STUDENT', '2'))
+ACTIVITY_ID = 'ACT-LOADTEST'
+QR_CODE = 'QR-LOADTEST'
+SKILL_ID = 'SKILL-LOADTEST'
+
+# thread ทั้งหมดใช้ connection pool ของ awsClients ร่วมกัน (ต้องตั้งก่อน import awsClients)
+# endpoint ในเครื่องรับ request หลายร้อยพร้อมกันได้ช้ากว่า DynamoDB จริงมาก จึงขยาย timeout
+# (ตั้ง AWS_CONNECT_TIMEOUT / AWS_READ_TIMEOUT เองเพื่อดูพฤติกรรมตอน timeout + retry แบบ production)
+os.environ.setdefault('MAX_POOL_CONNECTIONS', str(BENCH_CONCURRENCY))
+os.environ.setdefault('AWS_CONNECT_TIMEOUT', '30')
+os.environ.setdefault('AWS_READ_TIMEOUT', '60')
+
+
+def run_migration(migrate, timeout=60):
+    """เรียก migration ซ้ำจนทุก index เป็น ACTIVE (UpdateTable สร้าง GSI ได้ครั้งละตัว)"""
+    deadline = time.time() + timeout
+    while True:
+        statuses = migrate()
+        if all(status == 'ACTIVE' for status in statuses.values()):
+            return statuses
+        if time.time() > deadline:
+            raise AssertionError(f'indexes not ACTIVE after {timeout}s: {statuses}')
+        time.sleep(1)
+
+
+def seed_tables(dynamodb, make_participation_id, skill_counts_table, migrations):
+    now = int(time.time())
+    activities = create_table(dynamodb, 'Activities', [('activityId', 'HASH')], {'activityId': 'S'})
+    activities.put_item(Item={
+        'activityId': ACTIVITY_ID,
+        'name': 'Load test activity',
+        'qrCode': QR_CODE,
+        'skillId': SKILL_ID,
+        'confirmStartEpoch': now - 600,
+        'confirmEndEpoch': now + 3600,
+    })
+
+    participations = create_table(
+        dynamodb, 'ActivityParticipations',
+        [('participationId', 'HASH'), ('activityId', 'RANGE')], {'participationId': 'S', 'activityId': 'S'}
+    )
+    put_items(participations, (
+        {
+            'participationId': make_participation_id(student_id, ACTIVITY_ID),
+            'activityId': ACTIVITY_ID,
+            'studentId': student_id,
+            'status': 'registered',
+            'isConfirmed': False,
+        }
+        for student_id in student_ids()
+    ))
+
+    for migrate in migrations:
+        run_migration(migrate)
+
+    create_table(
+        dynamodb, skill_counts_table, [('studentId', 'HASH'), ('skillId', 'RANGE')],
+        {'studentId': 'S', 'skillId': 'S'}
+    )
+    return participations
+
+
+def student_ids():
+    return [f'65{n:08d}' for n in range(BENCH_STUDENTS)]
+
+
+def load_test_check_in():
+    require_local_endpoint()
+    # import หลังตรวจ endpoint: awsClients สร้าง client ตอน import
+    from awsClients import dynamodb
+    from dynamoUtils import scan_items
+    from participationUtils import make_participation_id
+    from createActivityQrIndex import create_activity_qr_index
+    from createParticipationIndex import create_participation_index
+    import verifyActivityCode
+
+    seed_tables(dynamodb, make_participation_id, verifyActivityCode.SKILL_COUNTS_TABLE,
+                [create_activity_qr_index, create_participation_index])
+
+    def scan_qr(student_id):
+        event = {'httpMethod': 'POST', 'body': json.dumps({'qrCode': QR_CODE, 'studentId': student_id})}
+        response, elapsed = timed_ms(verifyActivityCode.lambda_handler, event, None)
+        return response['statusCode'], elapsed
+
+    scans = student_ids() * BENCH_SCANS_PER_STUDENT
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=BENCH_CONCURRENCY) as pool:
+        outcomes = list(pool.map(scan_qr, scans))
+    wall_seconds = time.perf_counter() - started
+
+    confirmed = sum(1 for status, _ in outcomes if status == 200)
+    rejected = sum(1 for status, _ in outcomes if status == 400)
+    failed = len(outcomes) - confirmed - rejected
+    confirmed_rows = sum(1 for item in scan_items('ActivityParticipations') if item.get('isConfirmed'))
+    counted = sum(int(item.get('confirmedCount', 0)) for item in scan_items(verifyActivityCode.SKILL_COUNTS_TABLE))
+
+    result = {
+        'scans': len(outcomes),
+        'concurrency': BENCH_CONCURRENCY,
+        'confirmed': confirmed,
+        'rejectedDuplicates': rejected,
+        'errors': failed,
+        'confirmedRows': confirmed_rows,
+        'skillCount': counted,
+        'wallSeconds': round(wall_seconds, 2),
+        'scansPerSecond': round(len(outcomes) / wall_seconds, 1),
+        'latencyMs': percentiles([elapsed for _, elapsed in outcomes]),
+    }
+    print(json.dumps(result, indent=2))
+
+    expected = BENCH_STUDENTS
+    if not (confirmed == confirmed_rows == counted == expected and failed == 0):
+        raise AssertionError(f'expected exactly {expected} confirmations without errors: {result}')
+    return result
+
+
+if __name__ == '__main__':
+    load_test_check_in()
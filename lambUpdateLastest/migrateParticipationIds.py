@@ -0,0 +1,82 @@
+from botocore.exceptions import ClientError
+from dynamoUtils import scan_items
+from participationUtils import PARTICIPATIONS_TABLE, make_participation_id
+from awsClients import dynamodb
+from jsonUtils import dumps
+
+# Migration: ย้าย participation เดิม (participationId แบบสุ่ม) ไปใช้ participationId แบบ deterministic
+# หลังรันแล้ว registerActivity กันลงทะเบียนซ้ำได้ด้วย ConditionExpression อย่างเดียว
+
+ASSESSMENTS_TABLE = 'Assessments'
+
+
+def _rank(item):
+    # ถ้าลงทะเบียนซ้ำไว้หลายแถว เก็บแถวที่ไปไกลที่สุด (ทำแบบประเมิน > ยืนยันแล้ว > ลงทะเบียน)
+    return (bool(item.get('surveyCompleted')), bool(item.get('isConfirmed')), item.get('registeredAt', ''))
+
+
+def migrate_participation_ids():
+    participations_table = dynamodb.Table(PARTICIPATIONS_TABLE)
+
+    groups = {}
+    for item in scan_items(PARTICIPATIONS_TABLE):
+        if item.get('studentId') and item.get('activityId'):
+            groups.setdefault((item['studentId'], item['activityId']), []).append(item)
+
+    renamed = {}   # participationId เดิม -> ใหม่
+    removed = 0
+
+    for (student_id, activity_id), items in groups.items():
+        new_id = make_participation_id(student_id, activity_id)
+        if len(items) == 1 and items[0]['participationId'] == new_id:
+            continue
+
+        keep = max(items, key=_rank)
+        if keep['participationId'] != new_id:
+            participations_table.put_item(Item=dict(keep, participationId=new_id))
+
+        for item in items:
+            if item['participationId'] == new_id:
+                continue
+            participations_table.delete_item(
+                Key={'participationId': item['participationId'], 'activityId': activity_id}
+            )
+            renamed[item['participationId']] = new_id
+            removed += 1
+
+    # อัปเดต participationId ที่อ้างอิงอยู่ใน Assessments
+    assessments_updated = 0
+    if renamed:
+        assessments_table = dynamodb.Table(ASSESSMENTS_TABLE)
+        for assessment in scan_items(ASSESSMENTS_TABLE, ProjectionExpression='assessmentId, participationId'):
+            new_id = renamed.get(assessment.get('participationId'))
+            if new_id:
+                assessments_table.update_item(
+                    Key={'assessmentId': assessment['assessmentId']},
+                    UpdateExpression='SET participationId = :participationId',
+                    ExpressionAttributeValues={':participationId': new_id}
+                )
+                assessments_updated += 1
+
+    print(f"Migrated {len(renamed)} participations ({removed} legacy rows removed, "
+          f"{assessments_updated} assessments updated)")
+    return {'migrated': len(renamed), 'assessmentsUpdated': assessments_updated}
+
+
+def lambda_handler(event, context):
+    try:
+        result = migrate_participation_ids()
+        return {
+            'statusCode': 200,
+            'body': dumps(dict(result, success=True))
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    migrate_participation_ids()
@@ -0,0 +1,293 @@
+import os
+import hashlib
+from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
+from dynamoUtils import (
+    dynamodb, scan_items, query_items, read_page, transact_write_items, cancellation_reasons, index_missing, cursor_key
+)
+
+# GSI บน ActivityParticipations (สร้างด้วย createParticipationIndex.py)
+# - PARTICIPATION_INDEX: partition key = studentId, sort key = activityId
+# - ACTIVITY_PARTICIPATION_INDEX: partition key = activityId, sort key = registeredAt (รายชื่อผู้เข้าร่วมเรียงตามเวลาลงทะเบียน)
+PARTICIPATIONS_TABLE = 'ActivityParticipations'
+PARTICIPATION_INDEX = os.getenv('PARTICIPATION_INDEX', 'studentId-activityId-index')
+ACTIVITY_PARTICIPATION_INDEX = os.getenv('ACTIVITY_PARTICIPATION_INDEX', 'activityId-registeredAt-index')
+
+
+def make_participation_id(student_id, activity_id):
+    """
+    participationId แบบ deterministic จาก (studentId, activityId)
+    ทำให้การลงทะเบียนซ้ำชน key เดิม และกันด้วย ConditionExpression ได้
+    """
+    digest = hashlib.sha256(f'{student_id}#{activity_id}'.encode('utf-8')).hexdigest()
+    return f"part{digest[:16]}"
+
+
+def find_participation(student_id, activity_id):
+    """
+    หา participation ของนักศึกษาในกิจกรรม ด้วย query บน GSI ครั้งเดียว
+    ถ้ายังไม่ได้สร้าง GSI จะ scan แทน (แบบเดิม) error อื่นจะ raise ต่อ
+    คืน item หรือ None
+    """
+    try:
+        return next(query_items(
+            PARTICIPATIONS_TABLE,
+            IndexName=PARTICIPATION_INDEX,
+            KeyConditionExpression=Key('studentId').eq(student_id) & Key('activityId').eq(activity_id)
+        ), None)
+    except ClientError as e:
+        if not index_missing(e):
+            raise
+        print(f"GSI query failed, falling back to scan: {str(e)}")
+        return next(scan_items(
+            PARTICIPATIONS_TABLE,
+            FilterExpression='studentId = :studentId AND activityId = :activityId',
+            ExpressionAttributeValues={
+                ':studentId': student_id,
+                ':activityId': activity_id
+            }
+        ), None)
+
+
+def participation_page(key_name, key_value, limit, start_key=None):
+    """
+    participation 1 หน้า (สำหรับ API แบบ ?limit=&nextToken=) ของนักศึกษา (key_name='studentId')
+    หรือของกิจกรรม (key_name='activityId') ด้วย query บน GSI ที่ตรงกัน
+    - studentId: เรียงตาม activityId
+    - activityId: เรียงตาม registeredAt (ล่าสุดก่อน)
+    ถ้ายังไม่ได้สร้าง GSI จะ scan แทน (ลำดับตาม scan)
+    คืน (items, last_key)
+    """
+    table = dynamodb.Table(PARTICIPATIONS_TABLE)
+    if key_name == 'activityId':
+        index_name, forward = ACTIVITY_PARTICIPATION_INDEX, False
+    else:
+        index_name, forward = PARTICIPATION_INDEX, True
+    try:
+        return read_page(
+            table.query, limit, start_key,
+            IndexName=index_name,
+            KeyConditionExpression=Key(key_name).eq(key_value),
+            ScanIndexForward=forward
+        )
+    except ClientError as e:
+        if not index_missing(e):
+            raise
+        print(f"GSI query failed, falling back to scan: {str(e)}")
+        return read_page(table.scan, limit, start_key, FilterExpression=Attr(key_name).eq(key_value))
+
+
+def page_start_key(key_name, key_value, token):
+    """
+    ExclusiveStartKey ของ participation_page จาก nextToken (ไม่มี token -> None)
+    ต้องมี key ตรงตาม GSI ที่ใช้ (หรือ key ของตารางเมื่อ scan แทน) และเป็นของ key_value เดียวกัน ไม่งั้น -> ValueError
+    """
+    table_keys = ('participationId', 'activityId')
+    index_keys = table_keys + (('registeredAt',) if key_name == 'activityId' else ('studentId',))
+    start_key = cursor_key(token, [index_keys, table_keys])
+    if start_key is not None and key_name in start_key and start_key[key_name] != key_value:
+        raise ValueError(f'invalid nextToken: issued for another {key_name}')
+    return start_key
+
+
+def list_participations(key_name, key_value):
+    """
+    participation ทั้งหมดของนักศึกษา (key_name='studentId') หรือของกิจกรรม (key_name='activityId')
+    ด้วย query บน GSI ที่ตรงกัน (อ่านทุกหน้า) ลำดับเดียวกับ participation_page
+    (GSI ของ activityId มีเฉพาะแถวที่มี registeredAt ซึ่ง registerActivity ใส่ให้ทุกแถว)
+    ถ้ายังไม่ได้สร้าง GSI จะ scan แทน
+    """
+    if key_name == 'activityId':
+        index_name, forward = ACTIVITY_PARTICIPATION_INDEX, False
+    else:
+        index_name, forward = PARTICIPATION_INDEX, True
+    try:
+        return list(query_items(
+            PARTICIPATIONS_TABLE,
+            IndexName=index_name,
+            KeyConditionExpression=Key(key_name).eq(key_value),
+            ScanIndexForward=forward
+        ))
+    except ClientError as e:
+        if not index_missing(e):
+            raise
+        print(f"GSI query failed, falling back to scan: {str(e)}")
+        return list(scan_items(PARTICIPATIONS_TABLE, FilterExpression=Attr(key_name).eq(key_value)))
+
+
+# ---------- ที่นั่งจำกัด (capacity) และรายชื่อสำรอง (waitlist) ----------
+
+STATUS_REGISTERED = 'registered'
+STATUS_WAITLISTED = 'waitlisted'
+ACTIVITIES_TABLE = 'Activities'
+
+# เพิ่ม registeredCount ได้เฉพาะเมื่อยังไม่เต็ม (CAPACITY เป็น reserved word จึงต้องใช้ alias)
+_SEAT_UPDATE = {
+    'TableName': ACTIVITIES_TABLE,
+    'UpdateExpression': 'SET registeredCount = if_not_exists(registeredCount, :zero) + :one',
+    'ConditionExpression': 'attribute_not_exists(registeredCount) OR registeredCount < #capacity',
+    'ExpressionAttributeNames': {'#capacity': 'capacity'},
+    'ExpressionAttributeValues': {':zero': 0, ':one': 1},
+}
+
+
+def register_with_capacity(participation_item):
+    """
+    ลงทะเบียนกิจกรรมที่มี capacity
+    ใส่ participation + เพิ่ม registeredCount ใน transaction เดียว กันที่นั่งเกินเมื่อมีคนลงพร้อมกัน
+    ถ้าเต็มแล้วจะบันทึกเป็นรายชื่อสำรองแทน
+    คืนค่า STATUS_REGISTERED / STATUS_WAITLISTED หรือ None ถ้าลงทะเบียนซ้ำ
+    """
+    activity_id = participation_item['activityId']
+    try:
+        transact_write_items([
+            {'Put': {
+                'TableName': PARTICIPATIONS_TABLE,
+                'Item': dict(participation_item, status=STATUS_REGISTERED),
+                'ConditionExpression': 'attribute_not_exists(participationId)'
+            }},
+            {'Update': dict(_SEAT_UPDATE, Key={'activityId': activity_id})}
+        ])
+        return STATUS_REGISTERED
+    except ClientError as e:
+        reasons = cancellation_reasons(e)
+        if not reasons:
+            raise
+        if reasons[0] == 'ConditionalCheckFailed':
+            return None
+        if reasons[1] != 'ConditionalCheckFailed':
+            raise
+
+    # กิจกรรมเต็ม -> ต่อคิวสำรอง (ลำดับตาม waitlistedAt)
+    try:
+        dynamodb.Table(PARTICIPATIONS_TABLE).put_item(
+            Item=dict(participation_item, status=STATUS_WAITLISTED,
+                      waitlistedAt=participation_item['registeredAt']),
+            ConditionExpression='attribute_not_exists(participationId)'
+        )
+        return STATUS_WAITLISTED
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
+        raise
+
+
+def release_seat(participation, released_at):
+    """
+    ยกเลิกการลงทะเบียนกิจกรรมที่มี capacity
+    ถ้ามีรายชื่อสำรอง: ลบ participation และเลื่อนคิวลำดับแรกขึ้นมาใน transaction เดียว (ส่งที่นั่งต่อโดยตรง
+    registeredCount ไม่ลด คนที่ลงทะเบียนใหม่จึงแซงคิวไม่ได้) ไม่มีคิว: ลบ participation และคืนที่นั่ง
+    (รายชื่อสำรองไม่ได้ถือที่นั่ง จึงลบอย่างเดียว)
+    คืน participation ที่ถูกเลื่อนขึ้นมา หรือ None
+    ถ้า participation ที่ยกเลิกไม่ผ่านเงื่อนไข (เช่น ถูกยืนยันพร้อมกัน) จะ raise ClientError (TransactionCanceledException)
+    """
+    activity_id = participation['activityId']
+    key = {'participationId': participation['participationId'], 'activityId': activity_id}
+
+    if participation.get('status') == STATUS_WAITLISTED:
+        dynamodb.Table(PARTICIPATIONS_TABLE).delete_item(Key=key)
+        return None
+
+    delete = {'Delete': {
+        'TableName': PARTICIPATIONS_TABLE,
+        'Key': key,
+        'ConditionExpression': 'attribute_exists(participationId) AND isConfirmed = :notConfirmed',
+        'ExpressionAttributeValues': {':notConfirmed': False}
+    }}
+
+    for candidate in waitlist(activity_id):
+        try:
+            transact_write_items([delete, _promote_action(candidate, released_at)])
+            print(f"Promoted {candidate['studentId']} from waitlist of {activity_id}")
+            return candidate
+        except ClientError as e:
+            reasons = cancellation_reasons(e)
+            if reasons[:2] != ['None', 'ConditionalCheckFailed']:
+                raise
+            # คนนี้ถูกเลื่อน/ยกเลิกไปแล้ว ลองคนถัดไป
+
+    transact_write_items([
+        delete,
+        {'Update': {
+            'TableName': ACTIVITIES_TABLE,
+            'Key': {'activityId': activity_id},
+            'UpdateExpression': 'SET registeredCount = registeredCount - :one',
+            'ConditionExpression': 'registeredCount > :zero',
+            'ExpressionAttributeValues': {':zero': 0, ':one': 1}
+        }}
+    ])
+    # มีคนต่อคิวระหว่างที่อ่านรายชื่อสำรองกับตอนคืนที่นั่ง -> ให้คิวได้ที่นั่งนี้ก่อน
+    return promote_from_waitlist(activity_id, released_at)
+
+
+def _promote_action(candidate, promoted_at):
+    """action ใน transaction ที่เปลี่ยนรายชื่อสำรองเป็นลงทะเบียนแล้ว (ต้องยังเป็น waitlisted อยู่)"""
+    return {'Update': {
+        'TableName': PARTICIPATIONS_TABLE,
+        'Key': {'participationId': candidate['participationId'], 'activityId': candidate['activityId']},
+        'UpdateExpression': 'SET #status = :registered, promotedAt = :now, updatedAt = :now',
+        'ConditionExpression': '#status = :waitlisted',
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ExpressionAttributeValues': {
+            ':registered': STATUS_REGISTERED,
+            ':waitlisted': STATUS_WAITLISTED,
+            ':now': promoted_at
+        }
+    }}
+
+
+def waitlist(activity_id):
+    """
+    รายชื่อสำรองของกิจกรรมตามลำดับคิว (อ่านทีละหน้าเท่าที่ใช้)
+    query GSI activityId เรียงตาม registeredAt (= waitlistedAt ของรายชื่อสำรอง)
+    ถ้ายังไม่ได้สร้าง GSI จะ scan แล้วเรียงตาม waitlistedAt แทน
+    """
+    found = False
+    try:
+        for item in query_items(
+            PARTICIPATIONS_TABLE,
+            IndexName=ACTIVITY_PARTICIPATION_INDEX,
+            KeyConditionExpression=Key('activityId').eq(activity_id),
+            FilterExpression=Attr('status').eq(STATUS_WAITLISTED),
+            ScanIndexForward=True
+        ):
+            found = True
+            yield item
+        return
+    except ClientError as e:
+        if found or not index_missing(e):
+            raise
+        print(f"GSI query failed, falling back to scan: {str(e)}")
+
+    yield from sorted(
+        scan_items(
+            PARTICIPATIONS_TABLE,
+            FilterExpression=Attr('activityId').eq(activity_id) & Attr('status').eq(STATUS_WAITLISTED)
+        ),
+        key=lambda p: p.get('waitlistedAt', '')
+    )
+
+
+def promote_from_waitlist(activity_id, promoted_at):
+    """
+    เลื่อนรายชื่อสำรองลำดับแรกขึ้นมาแทนที่นั่งที่ว่าง (participation + registeredCount ใน transaction เดียว)
+    คืน participation ที่ถูกเลื่อน หรือ None ถ้าไม่มีคิว/ที่นั่งถูกคนอื่นใช้ไปแล้ว
+    """
+    for candidate in waitlist(activity_id):
+        try:
+            transact_write_items([
+                _promote_action(candidate, promoted_at),
+                {'Update': dict(_SEAT_UPDATE, Key={'activityId': activity_id})}
+            ])
+            print(f"Promoted {candidate['studentId']} from waitlist of {activity_id}")
+            return candidate
+        except ClientError as e:
+            reasons = cancellation_reasons(e)
+            if not reasons:
+                raise
+            if reasons[1] == 'ConditionalCheckFailed':
+                # ที่นั่งถูกใช้ไปแล้ว
+                return None
+            # คนนี้ถูกเลื่อน/ยกเลิกไปแล้ว ลองคนถัดไป
+
+    return None
@@ -0,0 +1,204 @@
+import os
+from datetime import datetime, timezone, timedelta
+from botocore.exceptions import ClientError
+from dynamoUtils import dynamodb, batch_get_items, query_items
+from refCache import get_reference_items, get_reference_map
+from ioPool import gather
+
+# สรุปความคืบหน้าทักษะต่อนักศึกษา (1 item ต่อคน) ที่อัปเดตทีละนิดเมื่อได้ทักษะใหม่
+# ใช้แทนการ scan Skills + query CompletedSkills ทุกครั้งที่เปิด dashboard
+PROGRESS_SUMMARY_TABLE = os.getenv('PROGRESS_SUMMARY_TABLE', 'ProgressSummary')
+
+THAI_TZ = timezone(timedelta(hours=7))
+
+
+DEFAULT_YEAR_LEVEL = 1    # ใช้เมื่อไม่มี Students item หรือไม่มี yearLevel
+
+
+def year_level_of(student):
+    """ชั้นปีจาก Students item (อ่านไม่ได้ = DEFAULT_YEAR_LEVEL)"""
+    try:
+        return int((student or {}).get('yearLevel') or DEFAULT_YEAR_LEVEL)
+    except (TypeError, ValueError):
+        return DEFAULT_YEAR_LEVEL
+
+
+def student_year_level(student_id):
+    """ชั้นปีของนักศึกษาจากตาราง Students (None ถ้าไม่มีนักศึกษาคนนี้)"""
+    response = dynamodb.Table('Students').get_item(
+        Key={'studentId': student_id}, ProjectionExpression='studentId, yearLevel'
+    )
+    item = response.get('Item')
+    return year_level_of(item) if item else None
+
+
+def student_year_levels(student_ids):
+    """ชั้นปีของนักศึกษาหลายคนด้วย BatchGetItem คืน dict {studentId: yearLevel} (เฉพาะคนที่มีใน Students)"""
+    students = batch_get_items('Students', 'studentId', student_ids, ['yearLevel'])
+    return {student_id: year_level_of(student) for student_id, student in students.items()}
+
+
+def is_current(summary, year_level):
+    """summary ยังใช้ได้ไหม: ต้องมีอยู่และคำนวณจากชั้นปีเดียวกับใน Students ตอนนี้ (ชั้นปีเปลี่ยน = ทักษะบังคับเปลี่ยน)"""
+    return bool(summary) and year_level_of(summary) == year_level
+
+
+def required_skill_ids(year_level):
+    """skillId ของทักษะบังคับสำหรับชั้นปีนี้ (จาก cache ของ Skills)"""
+    return {
+        skill['skillId'] for skill in get_reference_items('Skills')
+        if skill.get('isRequired') is True and skill.get('yearLevel') == year_level
+    }
+
+
+def build_summary(student_id, completed_skill_ids, year_level):
+    """คำนวณ summary ใหม่ทั้งก้อนจากรายการ skillId ที่นักศึกษาได้แล้ว (year_level จาก Students)"""
+    required_ids = required_skill_ids(year_level)
+    completed_ids = set(completed_skill_ids)
+
+    summary = {
+        'studentId': student_id,
+        'yearLevel': year_level,
+        'totalRequiredSkills': len(required_ids),
+        'completedRequiredSkills': len(completed_ids & required_ids),
+        'completedOptionalSkills': len(completed_ids - required_ids),
+        'updatedAt': datetime.now(THAI_TZ).isoformat(),
+    }
+    # String Set ของ DynamoDB ห้ามว่าง จึงใส่เฉพาะตอนที่มีค่า
+    if completed_ids:
+        summary['completedSkillIds'] = completed_ids
+    if required_ids - completed_ids:
+        summary['pendingSkillIds'] = required_ids - completed_ids
+    return summary
+
+
+def rebuild_summary(student_id, year_level=None):
+    """
+    อ่าน CompletedSkills ของนักศึกษาแล้วเขียน summary ใหม่ทับของเดิม
+    year_level ไม่ระบุ = อ่านจาก Students (ไม่มีนักศึกษาคนนี้ -> ดู _rebuild)
+    """
+    if year_level is None:
+        year_level = student_year_level(student_id)
+    return _rebuild(student_id, year_level)
+
+
+def _rebuild(student_id, year_level):
+    """
+    rebuild ด้วยชั้นปีจาก Students ที่อ่านมาแล้ว
+    year_level None = ไม่มีนักศึกษาคนนี้: คำนวณให้ (ชั้นปี DEFAULT_YEAR_LEVEL) แต่ไม่บันทึก กัน GET สร้างแถวขยะ
+    """
+    completed = query_items(
+        'CompletedSkills',
+        KeyConditionExpression='studentId = :studentId',
+        ExpressionAttributeValues={':studentId': student_id},
+        ProjectionExpression='skillId'
+    )
+    skill_ids = [item['skillId'] for item in completed]
+    if year_level is None:
+        print(f"[progressSummary] student {student_id} not found, summary is not saved")
+        return build_summary(student_id, skill_ids, DEFAULT_YEAR_LEVEL)
+
+    summary = build_summary(student_id, skill_ids, year_level)
+    dynamodb.Table(PROGRESS_SUMMARY_TABLE).put_item(Item=summary)
+    return summary
+
+
+def record_completed_skill(student_id, skill_id):
+    """
+    อัปเดต summary เมื่อได้ทักษะใหม่ (เรียกจาก submitQuizAnswers.await_skill_to_completed)
+    ใช้ ConditionExpression กันนับซ้ำ ถ้าเงื่อนไขไม่ผ่าน (ยังไม่มี summary / ข้อมูลไม่ตรง) จะ rebuild ให้
+    summary ที่คำนวณจากชั้นปีเก่าจะ rebuild ตอนอ่านครั้งถัดไป (get_summary / get_summaries)
+    """
+    table = dynamodb.Table(PROGRESS_SUMMARY_TABLE)
+    now_str = datetime.now(THAI_TZ).isoformat()
+    year_level = student_year_level(student_id)
+    if year_level is None:
+        print(f"[progressSummary] student {student_id} not found, summary is not updated")
+        return
+
+    if skill_id in required_skill_ids(year_level):
+        update = {
+            'UpdateExpression': 'ADD completedRequiredSkills :one, completedSkillIds :skillSet '
+                                'DELETE pendingSkillIds :skillSet SET updatedAt = :now',
+            'ConditionExpression': 'contains(pendingSkillIds, :skillId)',
+        }
+    else:
+        update = {
+            'UpdateExpression': 'ADD completedOptionalSkills :one, completedSkillIds :skillSet SET updatedAt = :now',
+            'ConditionExpression': 'attribute_exists(studentId) AND '
+                                   '(attribute_not_exists(completedSkillIds) OR NOT contains(completedSkillIds, :skillId))',
+        }
+
+    try:
+        table.update_item(
+            Key={'studentId': student_id},
+            ExpressionAttributeValues={
+                ':one': 1,
+                ':skillSet': {skill_id},
+                ':skillId': skill_id,
+                ':now': now_str
+            },
+            **update
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        rebuild_summary(student_id, year_level)
+
+
+def get_summary(student_id):
+    """
+    อ่าน summary ของนักศึกษาพร้อมชั้นปีปัจจุบันจาก Students (2 get_item พร้อมกัน)
+    ยังไม่มี summary หรือชั้นปีเปลี่ยนไปแล้ว -> rebuild (ไม่มีนักศึกษาคนนี้ = คำนวณแต่ไม่บันทึก)
+    """
+    reads = gather({
+        'summary': lambda: dynamodb.Table(PROGRESS_SUMMARY_TABLE).get_item(Key={'studentId': student_id}).get('Item'),
+        'yearLevel': lambda: student_year_level(student_id),
+    })
+    if is_current(reads['summary'], reads['yearLevel']):
+        return reads['summary']
+    return _rebuild(student_id, reads['yearLevel'])
+
+
+def get_summaries(student_ids, year_levels=None):
+    """
+    อ่าน summary หลายคนด้วย BatchGetItem คืน dict {studentId: summary}
+    คนที่ยังไม่มี summary หรือชั้นปีไม่ตรงกับ Students จะ rebuild พร้อมกันด้วย ioPool.gather
+    year_levels: {studentId: yearLevel} จาก Students item ที่อ่านมาแล้ว (ไม่ระบุ = อ่านจาก Students ด้วย BatchGetItem)
+    คนที่ไม่อยู่ใน year_levels ถือว่าไม่มีใน Students: ใช้ summary ที่มีอยู่ หรือคำนวณให้โดยไม่บันทึก
+    """
+    summaries = batch_get_items(PROGRESS_SUMMARY_TABLE, 'studentId', student_ids)
+    if year_levels is None:
+        year_levels = student_year_levels(student_ids)
+
+    stale = [
+        student_id for student_id in dict.fromkeys(student_ids)
+        if student_id and not (
+            is_current(summaries.get(student_id), year_levels[student_id]) if student_id in year_levels
+            else student_id in summaries
+        )
+    ]
+    if not stale:
+        return summaries
+
+    summaries.update(gather({
+        student_id: (lambda student_id=student_id: _rebuild(student_id, year_levels.get(student_id)))
+        for student_id in stale
+    }))
+    return summaries
+
+
+def pending_skill_details(summary):
+    """รายละเอียดทักษะบังคับที่ยังขาด (ชื่อ/หมวด จาก cache ของ Skills)"""
+    skill_map = get_reference_map('Skills', 'skillId')
+    details = []
+    for skill_id in sorted(summary.get('pendingSkillIds') or []):
+        skill_data = skill_map.get(skill_id)
+        if skill_data:
+            details.append({
+                'id': skill_id,
+                'name': skill_data.get('name'),
+                'category': skill_data.get('category'),
+                'requiredActivities': skill_data.get('requiredActivities', 3),  # ดึงค่า requiredActivities
+            })
+    return details
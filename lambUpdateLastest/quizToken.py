@@ -0,0 +1,131 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import secrets
+
+# Token ของรอบการทำแบบทดสอบ (quiz session)
+# getQuizQuestions ออก token ที่เก็บ questionId ที่สุ่มได้ + answer key ที่ป้องกันด้วย HMAC
+# submitQuizAnswers ตรวจ token แล้วให้คะแนนได้ทันทีโดยไม่ต้องอ่าน QuizQuestions ซ้ำ
+
+# ต้องตั้งค่า: ถ้าว่าง การออก/ตรวจ token จะ raise QuizTokenConfigError (handler ตอบ 500 และ log สาเหตุ)
+QUIZ_TOKEN_SECRET = os.getenv('QUIZ_TOKEN_SECRET', '')
+QUIZ_TOKEN_GRACE_SECONDS = int(os.getenv('QUIZ_TOKEN_GRACE_SECONDS', '120'))  # เผื่อเวลา network ตอนส่ง
+
+ANSWER_LETTERS = 'abcdefgh'
+
+
+class QuizTokenError(Exception):
+    """token ไม่ถูกต้อง ถูกแก้ไข หรือหมดอายุ"""
+
+
+class QuizTokenConfigError(RuntimeError):
+    """ไม่ได้ตั้งค่า QUIZ_TOKEN_SECRET"""
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _sign(data):
+    if not QUIZ_TOKEN_SECRET:
+        raise QuizTokenConfigError('QUIZ_TOKEN_SECRET environment variable must be set for getQuizQuestions/submitQuizAnswers')
+    return hmac.new(QUIZ_TOKEN_SECRET.encode('utf-8'), data, hashlib.sha256).digest()
+
+
+def normalize_answer(answer):
+    """ใช้ตัวอักษรตัวแรก (ตัวพิมพ์เล็ก) เป็นคำตอบ เช่น 'B. xxx' -> 'b'"""
+    if not answer:
+        return ''
+    answer = str(answer).strip().lower()
+    return answer[0] if answer else ''
+
+
+def _answer_digest(nonce, question_id, answer):
+    message = f'{nonce}|{question_id}|{normalize_answer(answer)}'.encode('utf-8')
+    return _b64encode(_sign(message)[:12])
+
+
+def issue_quiz_token(student_id, skill_id, questions, time_limit_minutes):
+    """
+    สร้าง token สำหรับรอบทำแบบทดสอบ
+    questions: list ของ dict ที่มี questionId และ correctAnswer
+    answer key เก็บเป็น HMAC ของคำตอบ (client อ่าน token ได้แต่ไม่รู้คำตอบ)
+    token ผูกกับนักศึกษาเสมอ (student_id ว่าง -> ValueError)
+    """
+    if not student_id:
+        raise ValueError('student_id is required to issue a quiz token')
+    issued_at = int(time.time())
+    nonce = secrets.token_hex(8)
+    payload = {
+        'sid': student_id,
+        'sk': skill_id,
+        'iat': issued_at,
+        'exp': issued_at + int(time_limit_minutes) * 60,
+        'n': nonce,
+        'q': [q['questionId'] for q in questions],
+        'k': [_answer_digest(nonce, q['questionId'], q.get('correctAnswer')) for q in questions],
+        'o': [len(q.get('options') or []) or 4 for q in questions],
+    }
+    body = _b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    return f"{body}.{_b64encode(_sign(body.encode('ascii')))}"
+
+
+def verify_quiz_token(token, student_id, skill_id):
+    """ตรวจลายเซ็น เจ้าของ และเวลา แล้วคืน payload ของ token"""
+    try:
+        body, signature = token.split('.', 1)
+        expected = _b64encode(_sign(body.encode('ascii')))
+        if not hmac.compare_digest(signature, expected):
+            raise QuizTokenError('invalid signature')
+        payload = json.loads(_b64decode(body))
+    except QuizTokenError:
+        raise
+    except (ValueError, AttributeError) as e:
+        raise QuizTokenError(f'malformed token: {e}')
+
+    if payload.get('sk') != skill_id:
+        raise QuizTokenError('token was issued for a different skill')
+    if not payload.get('sid'):
+        raise QuizTokenError('token has no student')
+    if payload['sid'] != student_id:
+        raise QuizTokenError('token was issued for a different student')
+    if time.time() > payload['exp'] + QUIZ_TOKEN_GRACE_SECONDS:
+        raise QuizTokenError('quiz time limit exceeded')
+    return payload
+
+
+def grade_answers(payload, answers):
+    """
+    ให้คะแนนจาก answer key ใน token
+    คืน list ของ dict {questionId, selectedAnswer, correctAnswer, isCorrect} ตามลำดับคำถามใน token
+    """
+    selected_by_id = {a.get('questionId'): a.get('selectedAnswer') for a in answers if a.get('questionId')}
+    nonce = payload['n']
+    results = []
+
+    for question_id, digest, option_count in zip(payload['q'], payload['k'], payload['o']):
+        selected = selected_by_id.get(question_id)
+
+        # หาตัวอักษรที่ถูกจาก digest (มีแค่ไม่กี่ตัวเลือกต่อข้อ)
+        correct = None
+        for letter in ANSWER_LETTERS[:option_count]:
+            if hmac.compare_digest(_answer_digest(nonce, question_id, letter), digest):
+                correct = letter.upper()
+                break
+
+        is_correct = bool(selected) and correct is not None and normalize_answer(selected) == correct.lower()
+        results.append({
+            'questionId': question_id,
+            'selectedAnswer': selected,
+            'correctAnswer': correct,
+            'isCorrect': is_correct
+        })
+
+    return results
@@ -0,0 +1,56 @@
+from botocore.exceptions import ClientError
+from dynamoUtils import scan_items
+from refCache import invalidate
+from progressSummary import PROGRESS_SUMMARY_TABLE, build_summary, year_level_of
+from awsClients import dynamodb
+from jsonUtils import dumps
+
+# Bulk rebuild ของ ProgressSummary ทุกคน (เฉพาะนักศึกษาที่มีใน Students)
+# รันเมื่อมีการแก้ทักษะบังคับ (isRequired / yearLevel ใน Skills) หรือครั้งแรกหลัง deploy
+# เลื่อนชั้นปีของนักศึกษา (yearLevel ใน Students) ไม่ต้องรัน: get_summary / get_summaries เทียบ yearLevel
+# กับ Students ทุกครั้งที่อ่านแล้ว rebuild ให้เอง แต่รันหลังเลื่อนชั้นปีทั้งรุ่นได้เพื่อไม่ให้ request แรกช้า
+
+
+def rebuild_all_summaries():
+    # ต้องใช้นิยามทักษะล่าสุด ไม่ใช่ของที่ค้างใน cache
+    invalidate('Skills')
+
+    completed_by_student = {}
+    for item in scan_items('CompletedSkills', ProjectionExpression='studentId, skillId'):
+        completed_by_student.setdefault(item['studentId'], []).append(item['skillId'])
+
+    year_levels = {
+        item['studentId']: year_level_of(item)
+        for item in scan_items('Students', ProjectionExpression='studentId, yearLevel')
+    }
+    student_ids = set(year_levels)
+
+    with dynamodb.Table(PROGRESS_SUMMARY_TABLE).batch_writer(overwrite_by_pkeys=['studentId']) as batch:
+        for student_id in student_ids:
+            batch.put_item(Item=build_summary(
+                student_id,
+                completed_by_student.get(student_id, []),
+                year_levels[student_id]
+            ))
+
+    print(f"Rebuilt {len(student_ids)} progress summaries in {PROGRESS_SUMMARY_TABLE}")
+    return len(student_ids)
+
+
+def lambda_handler(event, context):
+    try:
+        rebuilt = rebuild_all_summaries()
+        return {
+            'statusCode': 200,
+            'body': dumps({'success': True, 'summariesRebuilt': rebuilt})
+        }
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': dumps({'success': False, 'error': str(e)})
+        }
+
+
+if __name__ == '__main__':
+    rebuild_all_summaries()
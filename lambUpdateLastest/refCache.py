@@ -0,0 +1,121 @@
+import os
+import time
+import threading
+from botocore.exceptions import ClientError
+from dynamoUtils import dynamodb, scan_items
+
+# Cache ข้อมูลอ้างอิง (Skills / PLOs / Locations) ที่อยู่ระดับ module
+# ข้อมูลพวกนี้เปลี่ยนไม่กี่ครั้งต่อเทอม จึงเก็บไว้ข้าม warm invocation ได้
+
+REF_CACHE_TTL = int(os.getenv('REF_CACHE_TTL', '900'))   # วินาที
+
+# (ไม่บังคับ) ตารางเก็บเลข version ของข้อมูลอ้างอิง: {'tableName': 'Skills', 'version': 3}
+# ถ้าตั้งค่าไว้ เมื่อ TTL หมดจะเช็ค version ก่อน ถ้ายังเท่าเดิมก็ใช้ของเดิมต่อโดยไม่ต้อง scan ใหม่
+REF_VERSION_TABLE = os.getenv('REF_VERSION_TABLE', '')
+
+_cache = {}   # table_name -> {'items': [...], 'maps': {}, 'loadedAt': float, 'version': ...}
+_stats = {'hits': 0, 'misses': 0, 'revalidated': 0}
+_lock = threading.Lock()
+
+
+def read_version(table_name):
+    """เลข version ปัจจุบันของตาราง (None ถ้าไม่ได้ตั้ง REF_VERSION_TABLE หรือยังไม่มี version)"""
+    if not REF_VERSION_TABLE:
+        return None
+    response = dynamodb.Table(REF_VERSION_TABLE).get_item(Key={'tableName': table_name})
+    return response.get('Item', {}).get('version')
+
+
+def bump_version(table_name):
+    """
+    เพิ่ม version ของตารางหลังแก้ข้อมูล ให้ cache / ETag ที่อิง version รู้ว่าข้อมูลเปลี่ยนแล้ว
+    ถ้าเขียนไม่สำเร็จแค่ log ไว้ (ข้อมูลหลักถูกเขียนไปแล้ว) cache จะหมดอายุเองตาม TTL
+    """
+    if not REF_VERSION_TABLE:
+        return
+    try:
+        dynamodb.Table(REF_VERSION_TABLE).update_item(
+            Key={'tableName': table_name},
+            UpdateExpression='ADD version :one',
+            ExpressionAttributeValues={':one': 1}
+        )
+    except ClientError as e:
+        print(f"[refCache] failed to bump version of {table_name}: {str(e)}")
+
+
+def _get_entry(table_name, optional=False):
+    """
+    optional=True: ถ้าอ่านตารางไม่ได้ (ไม่มีตาราง / scan ล้มเหลว) จะ cache ผลว่างไว้ตาม REF_CACHE_TTL
+    (negative cache) ไม่ให้ทุก request ลอง scan ที่ล้มเหลวซ้ำ
+    """
+    now = time.time()
+    entry = _cache.get(table_name)
+
+    if entry and now - entry['loadedAt'] < REF_CACHE_TTL:
+        with _lock:
+            _stats['hits'] += 1
+        return entry
+
+    with _lock:
+        entry = _cache.get(table_name)
+        if entry and now - entry['loadedAt'] < REF_CACHE_TTL:
+            _stats['hits'] += 1
+            return entry
+
+        version = None
+        try:
+            version = read_version(table_name)
+            if entry and version is not None and version == entry['version']:
+                # TTL หมดแต่ข้อมูลยังไม่เปลี่ยน -> ต่ออายุ cache
+                entry['loadedAt'] = now
+                _stats['revalidated'] += 1
+                return entry
+
+            _stats['misses'] += 1
+            entry = {
+                'items': list(scan_items(table_name)),
+                'maps': {},
+                'loadedAt': now,
+                'version': version,
+            }
+        except ClientError as e:
+            if not optional:
+                raise
+            print(f"[refCache] cannot load {table_name}, caching empty result for {REF_CACHE_TTL}s: {str(e)}")
+            entry = {'items': [], 'maps': {}, 'loadedAt': now, 'version': None}
+        _cache[table_name] = entry
+        print(f"[refCache] loaded {len(entry['items'])} items from {table_name} "
+              f"(version={version}, stats={cache_stats()})")
+        return entry
+
+
+def get_reference_items(table_name, optional=False):
+    """คืน item ทั้งหมดของตารางอ้างอิง (ห้ามแก้ไข list/item ที่ได้กลับไป)"""
+    return _get_entry(table_name, optional)['items']
+
+
+def get_reference_map(table_name, key_name, optional=False):
+    """
+    คืน dict {key: item} ของตารางอ้างอิง (สร้างครั้งเดียวต่อการโหลด)
+    optional=True: ตารางที่อ่านไม่ได้ถือเป็นว่าง (ดู _get_entry)
+    """
+    entry = _get_entry(table_name, optional)
+    if key_name not in entry['maps']:
+        entry['maps'][key_name] = {item[key_name]: item for item in entry['items'] if key_name in item}
+    return entry['maps'][key_name]
+
+
+def invalidate(table_name=None):
+    """ล้าง cache ของตารางที่ระบุ (หรือทั้งหมด)"""
+    with _lock:
+        if table_name:
+            _cache.pop(table_name, None)
+        else:
+            _cache.clear()
+
+
+def cache_stats():
+    """สถิติ hit/miss ของ container นี้ (ผู้เรียกที่ถือ _lock อยู่แล้วอ่านได้เลย)"""
+    total = _stats['hits'] + _stats['misses'] + _stats['revalidated']
+    hit_rate = (_stats['hits'] + _stats['revalidated']) / total if total else 0.0
+    return dict(_stats, hitRate=round(hit_rate, 3))
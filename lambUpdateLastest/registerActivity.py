@@ -1,16 +1,19 @@
 import json
-import boto3
-import uuid
 from datetime import datetime
 from botocore.exceptions import ClientError
+from dynamoUtils import batch_get_keys
+from participationUtils import (
+    make_participation_id, register_with_capacity, STATUS_REGISTERED, STATUS_WAITLISTED
+)
+from awsClients import dynamodb
+from jsonUtils import dumps, event_body, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
 
 def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'POST,OPTIONS'
     }
@@ -29,10 +32,10 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'message': 'Missing request body'})
+                'body': dumps({'success': False, 'message': 'Missing request body'})
             }
         
-        request_body = json.loads(event.get('body'))
+        request_body = json.loads(event_body(event))
         
         # ดึงข้อมูลจาก request
         activity_id = request_body.get('activityId')
@@ -42,48 +45,32 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'message': 'activityId และ studentId จำเป็นต้องระบุ'})
+                'body': dumps({'success': False, 'message': 'activityId และ studentId จำเป็นต้องระบุ'})
             }
         
         # เชื่อมต่อ DynamoDB tables
-        activities_table = dynamodb.Table('Activities')
         participations_table = dynamodb.Table('ActivityParticipations')
-        students_table = dynamodb.Table('Students')
         
-        # ตรวจสอบว่ามีกิจกรรมนี้อยู่จริง
-        activity_response = activities_table.get_item(Key={'activityId': activity_id})
-        if 'Item' not in activity_response:
-            return {
-                'statusCode': 404,
-                'headers': headers,
-                'body': json.dumps({'success': False, 'message': 'ไม่พบกิจกรรมที่ระบุ'})
-            }
+        # ตรวจสอบว่ามีกิจกรรมและนักศึกษานี้อยู่จริง (BatchGetItem ครั้งเดียว)
+        found = batch_get_keys({
+            'Activities': [{'activityId': activity_id}],
+            'Students': [{'studentId': student_id}]
+        })
         
-        activity = activity_response['Item']
-        
-        # ตรวจสอบว่ามีนักศึกษานี้อยู่จริง
-        student_response = students_table.get_item(Key={'studentId': student_id})
-        if 'Item' not in student_response:
+        if not found['Activities']:
             return {
                 'statusCode': 404,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'message': 'ไม่พบข้อมูลนักศึกษา'})
+                'body': dumps({'success': False, 'message': 'ไม่พบกิจกรรมที่ระบุ'})
             }
         
-        # ตรวจสอบว่าได้ลงทะเบียนกิจกรรมนี้แล้วหรือไม่
-        existing_participation = participations_table.scan(
-            FilterExpression='activityId = :activityId AND studentId = :studentId',
-            ExpressionAttributeValues={
-                ':activityId': activity_id,
-                ':studentId': student_id
-            }
-        )
+        activity = found['Activities'][0]
         
-        if existing_participation.get('Items'):
+        if not found['Students']:
             return {
-                'statusCode': 400,
+                'statusCode': 404,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'message': 'คุณได้ลงทะเบียนกิจกรรมนี้แล้ว'})
+                'body': dumps({'success': False, 'message': 'ไม่พบข้อมูลนักศึกษา'})
             }
         
         # ตรวจสอบว่ากิจกรรมยังไม่ผ่านมา
@@ -91,11 +78,11 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'message': 'ไม่สามารถลงทะเบียนกิจกรรมที่ผ่านมาแล้วได้'})
+                'body': dumps({'success': False, 'message': 'ไม่สามารถลงทะเบียนกิจกรรมที่ผ่านมาแล้วได้'})
             }
         
-        # สร้าง participation record ใหม่
-        participation_id = f"part{str(uuid.uuid4()).replace('-', '')[:8]}"
+        # สร้าง participation record ใหม่ (participationId คำนวณจาก studentId + activityId)
+        participation_id = make_participation_id(student_id, activity_id)
         current_time = datetime.now().isoformat() + 'Z'
         
         participation_item = {
@@ -109,16 +96,52 @@ def lambda_handler(event, context):
             'updatedAt': current_time
         }
         
-        # บันทึกลง DynamoDB
-        participations_table.put_item(Item=participation_item)
+        duplicate_response = {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({'success': False, 'message': 'คุณได้ลงทะเบียนกิจกรรมนี้แล้ว'})
+        }
+        
+        if activity.get('capacity'):
+            # กิจกรรมจำกัดที่นั่ง: ลงทะเบียน + นับที่นั่งใน transaction เดียว (เต็มแล้วเข้าคิวสำรอง)
+            status = register_with_capacity(participation_item)
+            if status is None:
+                return duplicate_response
+        else:
+            # บันทึกลง DynamoDB - ถ้ามี key นี้อยู่แล้วแปลว่าลงทะเบียนซ้ำ
+            status = STATUS_REGISTERED
+            try:
+                participations_table.put_item(
+                    Item=dict(participation_item, status=status),
+                    ConditionExpression='attribute_not_exists(participationId)'
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                    return duplicate_response
+                raise
+        
+        if status == STATUS_WAITLISTED:
+            print(f'Activity {activity_id} is full, student {student_id} added to waitlist')
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': dumps({
+                    'success': True,
+                    'waitlisted': True,
+                    'message': 'กิจกรรมนี้เต็มแล้ว คุณอยู่ในรายชื่อสำรอง ระบบจะเลื่อนให้อัตโนมัติเมื่อมีที่ว่าง',
+                    'participationId': participation_id,
+                    'activityName': activity.get('name', '')
+                })
+            }
         
         print(f'Successfully registered student {student_id} for activity {activity_id}')
         
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
+                'waitlisted': False,
                 'message': 'ลงทะเบียนเข้าร่วมกิจกรรมสำเร็จ',
                 'participationId': participation_id,
                 'activityName': activity.get('name', ''),
@@ -130,21 +153,21 @@ def lambda_handler(event, context):
         return {
             'statusCode': 400,
             'headers': headers,
-            'body': json.dumps({'success': False, 'message': 'รูปแบบ JSON ไม่ถูกต้อง'})
+            'body': dumps({'success': False, 'message': 'รูปแบบ JSON ไม่ถูกต้อง'})
         }
     except ClientError as e:
         print('DynamoDB Error:', str(e))
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'success': False, 'message': 'เกิดข้อผิดพลาดในฐานข้อมูล', 'details': str(e)})
+            'body': dumps({'success': False, 'message': 'เกิดข้อผิดพลาดในฐานข้อมูล', 'details': str(e)})
         }
     except Exception as e:
         print('Unexpected error:', str(e))
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'success': False, 'message': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
+            'body': dumps({'success': False, 'message': 'เกิดข้อผิดพลาดที่ไม่คาดคิด', 'details': str(e)})
         }
 
 def is_future_activity(start_date_time):
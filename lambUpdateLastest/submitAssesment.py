@@ -1,22 +1,12 @@
 import json
-import boto3
 import decimal
 import uuid
 from datetime import datetime, timezone, timedelta
 from botocore.exceptions import ClientError
+from participationUtils import find_participation
+from awsClients import dynamodb
+from jsonUtils import dumps, event_body, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
-
-# Helper class to convert a DynamoDB item to JSON
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            if o % 1 > 0:
-                return float(o)
-            else:
-                return int(o)
-        return super(DecimalEncoder, self).default(o)
 
 def lambda_handler(event, context):
     """
@@ -27,6 +17,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -45,13 +36,13 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'ข้อมูลไม่ครบถ้วน'
                 })
             }
         
-        request_body = json.loads(event.get('body'))
+        request_body = json.loads(event_body(event))
         
         # Get activityId from path parameters
         activity_id = event.get('pathParameters', {}).get('activityId')
@@ -60,7 +51,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'ต้องระบุรหัสกิจกรรม'
                 })
@@ -72,7 +63,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'ต้องระบุรหัสนักศึกษา'
                 })
@@ -85,7 +76,7 @@ def lambda_handler(event, context):
                 return {
                     'statusCode': 400,
                     'headers': headers,
-                    'body': json.dumps({
+                    'body': dumps({
                         'success': False,
                         'message': f'ข้อมูลการประเมิน {rating} ไม่ถูกต้อง (ต้องเป็นตัวเลข 1-5)'
                     })
@@ -98,27 +89,18 @@ def lambda_handler(event, context):
         
         # Step 1: Check if student participated in this activity
         print("Step 1: Checking student participation...")
-        participations_response = participations_table.scan(
-            FilterExpression='studentId = :studentId AND activityId = :activityId',
-            ExpressionAttributeValues={
-                ':studentId': student_id,
-                ':activityId': activity_id
-            }
-        )
-        
-        participations = participations_response.get('Items', [])
+        participation = find_participation(student_id, activity_id)
         
-        if not participations:
+        if not participation:
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'คุณไม่ได้เข้าร่วมกิจกรรมนี้'
                 })
             }
         
-        participation = participations[0]
         participation_id = participation['participationId']
         
         # Step 2: Check if already confirmed participation
@@ -126,7 +108,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'กรุณายืนยันการเข้าร่วมกิจกรรมก่อนทำแบบประเมิน'
                 })
@@ -137,7 +119,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'คุณได้ทำแบบประเมินกิจกรรมนี้แล้ว'
                 })
@@ -219,7 +201,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 200,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': True,
                     'message': f'ส่งแบบประเมิน "{activity_name}" สำเร็จ! ขอบคุณสำหรับความคิดเห็น',
                     'assessmentId': assessment_data['assessmentId'],
@@ -233,7 +215,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 500,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'เกิดข้อผิดพลาดในการบันทึกข้อมูล'
                 })
@@ -243,7 +225,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 400,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'success': False,
                 'message': 'รูปแบบข้อมูลไม่ถูกต้อง'
             })
@@ -253,7 +235,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'success': False,
                 'message': 'เกิดข้อผิดพลาดที่ไม่คาดคิด'
             })
@@ -1,11 +1,12 @@
 import json
-import boto3
 import uuid
 from datetime import datetime
 from botocore.exceptions import ClientError
+from quizToken import verify_quiz_token, grade_answers, QuizTokenError, QuizTokenConfigError
+from progressSummary import record_completed_skill
+from awsClients import dynamodb
+from jsonUtils import dumps, event_body, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
 
 def lambda_handler(event, context):
     """
@@ -16,6 +17,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -34,73 +36,38 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': 'Missing request body'})
+                'body': dumps({'error': 'Missing request body'})
             }
         
-        request_data = json.loads(event['body'])
+        request_data = json.loads(event_body(event))
         student_id = request_data.get('studentId')
         skill_id = request_data.get('skillId')
         answers = request_data.get('answers', [])
         started_at = request_data.get('startedAt')
+        quiz_token = request_data.get('quizToken')
         
-        if not all([student_id, skill_id, answers]):
+        if not all([student_id, skill_id, answers, quiz_token]):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': 'ข้อมูลไม่ครบถ้วน'})
+                'body': dumps({'error': 'ข้อมูลไม่ครบถ้วน'})
             }
         
-        # ดึงคำตอบที่ถูกต้องจากฐานข้อมูล
-        questions_table = dynamodb.Table('QuizQuestions')
-        correct_answers = {}
-        
-        for answer in answers:
-            question_id = answer.get('questionId')
-            if question_id:
-                response = questions_table.get_item(
-                    Key={'questionId': question_id}
-                )
-                question = response.get('Item')
-                if question:
-                    correct_answers[question_id] = question.get('correctAnswer')
-        
-        # คำนวณคะแนน
-        total_questions = len(answers)
-        correct_count = 0
-        detailed_answers = []
+        # ตรวจ token ของรอบทำแบบทดสอบ (ลายเซ็น, เจ้าของ, เวลาที่กำหนด)
+        try:
+            token_payload = verify_quiz_token(quiz_token, student_id, skill_id)
+        except QuizTokenError as e:
+            print(f"Rejected quiz token: {str(e)}")
+            return {
+                'statusCode': 403,
+                'headers': headers,
+                'body': dumps({'error': 'รอบการทำแบบทดสอบไม่ถูกต้องหรือหมดเวลาแล้ว'})
+            }
         
-        for answer in answers:
-            question_id = answer.get('questionId')
-            selected_answer = answer.get('selectedAnswer')
-            correct_answer = correct_answers.get(question_id)
-            
-            # Debug: แสดงการเปรียบเทียบ
-            print(f"Question: {question_id}")
-            print(f"Selected: '{selected_answer}'")
-            print(f"Correct: '{correct_answer}'")
-            
-            # เปรียบเทียบคำตอบ (ไม่สนใจช่องว่างและตัวพิมพ์)
-            is_correct = False
-            if selected_answer and correct_answer:
-                # ลบช่องว่างและแปลงเป็นตัวพิมพ์เล็ก
-                selected_clean = selected_answer.strip().lower()[0]
-                correct_clean = correct_answer.strip().lower()
-                is_correct = selected_clean == correct_clean
-                
-                # Debug: แสดงผลการเปรียบเทียบ
-                print(f"Selected clean: '{selected_clean}'")
-                print(f"Correct clean: '{correct_clean}'")
-                print(f"Is correct: {is_correct}")
-            
-            if is_correct:
-                correct_count += 1
-            
-            detailed_answers.append({
-                'questionId': question_id,
-                'selectedAnswer': selected_answer,
-                'correctAnswer': correct_answer,
-                'isCorrect': is_correct
-            })
+        # คำนวณคะแนนจาก answer key ใน token (ไม่ต้องอ่าน QuizQuestions)
+        detailed_answers = grade_answers(token_payload, answers)
+        total_questions = len(detailed_answers)
+        correct_count = sum(1 for a in detailed_answers if a['isCorrect'])
         
         # คำนวณคะแนนเปอร์เซ็นต์
         score = (correct_count / total_questions * 100) if total_questions > 0 else 0
@@ -118,7 +85,7 @@ def lambda_handler(event, context):
             'totalQuestions': total_questions,
             'correctAnswers': correct_count,
             'isPassed': is_passed,
-            'startedAt': started_at or datetime.utcnow().isoformat() + 'Z',
+            'startedAt': started_at or datetime.utcfromtimestamp(token_payload['iat']).isoformat() + 'Z',
             'completedAt': datetime.utcnow().isoformat() + 'Z',
             'answers': detailed_answers
         }
@@ -132,7 +99,7 @@ def lambda_handler(event, context):
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'attemptId': attempt_id,
                 'score': int(score),
                 'totalQuestions': total_questions,
@@ -148,21 +115,28 @@ def lambda_handler(event, context):
         return {
             'statusCode': 400,
             'headers': headers,
-            'body': json.dumps({'error': 'Invalid JSON format'})
+            'body': dumps({'error': 'Invalid JSON format'})
         }
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดในการบันทึกข้อมูล'})
+            'body': dumps({'error': 'เกิดข้อผิดพลาดในการบันทึกข้อมูล'})
+        }
+    except QuizTokenConfigError as e:
+        print(f"Configuration error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': dumps({'error': 'ระบบแบบทดสอบยังไม่ได้ตั้งค่า (QUIZ_TOKEN_SECRET)'})
         }
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด'})
+            'body': dumps({'error': 'เกิดข้อผิดพลาดที่ไม่คาดคิด'})
         }
 
 def await_skill_to_completed(student_id, skill_id, score):
@@ -193,6 +167,9 @@ def await_skill_to_completed(student_id, skill_id, score):
             
             completed_skills_table.put_item(Item=completed_skill_record)
             print(f"Added completed skill: {skill_id} for student: {student_id}")
+            
+            # อัปเดต ProgressSummary ของนักศึกษาแบบ incremental
+            record_completed_skill(student_id, skill_id)
         else:
             # ถ้ามีแล้ว ให้อัปเดตคะแนนถ้าคะแนนใหม่สูงกว่า
             existing_score = existing_response['Item'].get('FinalScore', 0)
@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activityIndex import build_index, parse_filters, parse_time_window, match, facet_counts, select, window_mask  # noqa: E402
+from dynamoUtils import encode_cursor, cursor_after  # noqa: E402
+
+DAY = 24 * 60 * 60
+ACTIVITIES = [
+    # ใส่ไม่เรียง: index ต้องเรียงตาม activityId เอง
+    {'activityId': 'A3', 'plo': ['PLO2'], 'skillCategory': 'soft_skill', 'yearLevel': 2,
+     'startEpoch': 3 * DAY, 'endEpoch': 3 * DAY + 3600, 'registeredCount': 7},
+    {'activityId': 'A1', 'plo': '["PLO1","PLO2"]', 'skillCategory': 'Hard Skill', 'yearLevel': 1,
+     'startEpoch': 1 * DAY, 'endEpoch': 1 * DAY + 3600},
+    {'activityId': 'A2', 'plo': 'PLO1', 'skillCategory': 'hardskill', 'yearLevel': '1',
+     'startEpoch': 2 * DAY, 'endEpoch': 2 * DAY + 3600},
+    {'activityId': 'A4', 'skillCategory': 'multi'},    # ไม่มีเวลา / PLO / yearLevel
+]
+
+
+def _ids(index, mask):
+    activities, _ = select(index, mask)
+    return [activity['activityId'] for activity in activities]
+
+
+class ActivityIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = build_index(ACTIVITIES)
+
+    def test_build_index_sorts_by_id_and_drops_seat_fields(self):
+        self.assertEqual(self.index['ids'], ['A1', 'A2', 'A3', 'A4'])
+        self.assertNotIn('registeredCount', self.index['activities'][2])
+
+    def test_match_ands_facets_and_ors_values(self):
+        self.assertEqual(_ids(self.index, match(self.index, {})), ['A1', 'A2', 'A3', 'A4'])
+        self.assertEqual(_ids(self.index, match(self.index, parse_filters({'plo': 'plo1'}))), ['A1', 'A2'])
+        self.assertEqual(_ids(self.index, match(self.index, parse_filters({'plo': 'PLO1,PLO2'}))), ['A1', 'A2', 'A3'])
+        self.assertEqual(
+            _ids(self.index, match(self.index, parse_filters({'plo': 'PLO2', 'skillCategory': 'hard'}))), ['A1']
+        )
+        self.assertEqual(_ids(self.index, match(self.index, parse_filters({'yearLevel': '1'}))), ['A1', 'A2'])
+        self.assertEqual(_ids(self.index, match(self.index, parse_filters({'plo': 'PLO9'}))), [])
+
+    def test_match_respects_base_and_skip(self):
+        base = window_mask(self.index, {'startMin': 2 * DAY})
+        filters = parse_filters({'plo': 'PLO1'})
+        self.assertEqual(_ids(self.index, match(self.index, filters, base=base)), ['A2'])
+        self.assertEqual(_ids(self.index, match(self.index, filters, skip='plo', base=base)), ['A2', 'A3'])
+
+    def test_facet_counts_ignore_the_facets_own_filter(self):
+        counts = facet_counts(self.index, parse_filters({'plo': 'PLO1', 'skillCategory': 'hard skill'}))
+
+        # plo นับจากกิจกรรม hard skill ทั้งหมด (ไม่ใช้ filter plo ของตัวเอง)
+        self.assertEqual(counts['plo'], {'PLO1': 2, 'PLO2': 1})
+        # skillCategory นับจากกิจกรรมที่มี PLO1
+        self.assertEqual(counts['skillCategory'], {'hard skill': 2})
+        self.assertEqual(counts['yearLevel'], {'1': 2})
+
+    def test_facet_counts_without_filters(self):
+        counts = facet_counts(self.index, {})
+        self.assertEqual(counts['skillCategory'], {'hard skill': 2, 'soft skill': 1, 'multi-skill': 1})
+        self.assertEqual(counts['yearLevel'], {'1': 2, '2': 1})
+
+    def test_window_mask(self):
+        self.assertEqual(_ids(self.index, window_mask(self.index, {})), ['A1', 'A2', 'A3', 'A4'])
+        self.assertEqual(_ids(self.index, window_mask(self.index, {'startMin': 2 * DAY})), ['A2', 'A3'])
+        self.assertEqual(_ids(self.index, window_mask(self.index, {'startMax': 2 * DAY})), ['A1', 'A2'])
+        # from/to คาบเกี่ยว: A1 จบหลัง from, A3 เริ่มหลัง to
+        self.assertEqual(
+            _ids(self.index, window_mask(self.index, {'endMin': 1 * DAY + 1800, 'startMax': 2 * DAY + 60})),
+            ['A1', 'A2']
+        )
+
+    def test_parse_time_window_rounds_upcoming_to_the_minute(self):
+        window = parse_time_window({'upcoming': 'true', 'from': '86400'}, now=125)
+        self.assertEqual(window, {'startMin': 120, 'endMin': 86400})
+
+    def test_select_pages_after_an_id(self):
+        mask = match(self.index, {})
+        page, has_more = select(self.index, mask, limit=2)
+        self.assertEqual([a['activityId'] for a in page], ['A1', 'A2'])
+        self.assertTrue(has_more)
+
+        page, has_more = select(self.index, mask, after='A2', limit=2)
+        self.assertEqual([a['activityId'] for a in page], ['A3', 'A4'])
+        self.assertFalse(has_more)
+
+        # activityId ที่ไม่มีใน index (เช่น ถูกลบไประหว่างหน้า) ต่อจากตำแหน่งที่ควรอยู่
+        page, _ = select(self.index, mask, after='A25')
+        self.assertEqual([a['activityId'] for a in page], ['A3', 'A4'])
+
+    def test_cursor_after(self):
+        self.assertIsNone(cursor_after(None))
+        self.assertEqual(cursor_after(encode_cursor({'after': 'A2'})), 'A2')
+        for position in ({'after': 3}, {'offset': 1}, ['A2'], 'A2'):
+            with self.assertRaises(ValueError):
+                cursor_after(encode_cursor(position))
+        with self.assertRaises(ValueError):
+            cursor_after('not-base64!')
+
+
+if __name__ == '__main__':
+    unittest.main()
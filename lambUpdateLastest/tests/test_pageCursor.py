@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import getStudentActivities  # noqa: E402
+import getActivityParticipants  # noqa: E402
+from dynamoUtils import encode_cursor  # noqa: E402
+from participationUtils import page_start_key  # noqa: E402
+
+STUDENT_KEY = {'participationId': 'part1', 'activityId': 'A1', 'studentId': '6500000001'}
+ACTIVITY_KEY = {'participationId': 'part1', 'activityId': 'A1', 'registeredAt': '2026-01-01T00:00:00Z'}
+TABLE_KEY = {'participationId': 'part1', 'activityId': 'A1'}
+
+
+class PageStartKeyTest(unittest.TestCase):
+
+    def test_accepts_index_and_table_keys(self):
+        self.assertIsNone(page_start_key('studentId', '6500000001', None))
+        self.assertEqual(page_start_key('studentId', '6500000001', encode_cursor(STUDENT_KEY)), STUDENT_KEY)
+        self.assertEqual(page_start_key('activityId', 'A1', encode_cursor(ACTIVITY_KEY)), ACTIVITY_KEY)
+        # LastEvaluatedKey ตอน scan แทน GSI
+        self.assertEqual(page_start_key('studentId', '6500000001', encode_cursor(TABLE_KEY)), TABLE_KEY)
+
+    def test_rejects_other_shapes(self):
+        invalid = [
+            ['part1', 'A1'],
+            {'offset': 10},
+            dict(STUDENT_KEY, extra='x'),
+            ACTIVITY_KEY,                              # key ของ index อีกตัว
+            dict(STUDENT_KEY, participationId=1),
+            {'participationId': 'part1'},
+        ]
+        for position in invalid:
+            with self.assertRaises(ValueError, msg=position):
+                page_start_key('studentId', '6500000001', encode_cursor(position))
+
+    def test_rejects_cursor_of_another_query(self):
+        with self.assertRaises(ValueError):
+            page_start_key('studentId', '6500000002', encode_cursor(STUDENT_KEY))
+        with self.assertRaises(ValueError):
+            page_start_key('activityId', 'A2', encode_cursor(ACTIVITY_KEY))
+
+
+class HandlerCursorTest(unittest.TestCase):
+
+    def test_invalid_cursor_returns_400(self):
+        token = encode_cursor({'offset': 10})
+        student = getStudentActivities.lambda_handler({
+            'pathParameters': {'studentId': '6500000001'},
+            'queryStringParameters': {'limit': '10', 'nextToken': token}
+        }, None)
+        participants = getActivityParticipants.lambda_handler({
+            'pathParameters': {'activityId': 'A1'},
+            'queryStringParameters': {'limit': '10', 'nextToken': token}
+        }, None)
+        self.assertEqual(student['statusCode'], 400)
+        self.assertEqual(participants['statusCode'], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
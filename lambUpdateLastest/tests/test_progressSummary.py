@@ -0,0 +1,127 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.pop('AWS_ENDPOINT_URL_DYNAMODB', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boto3  # noqa: E402
+from moto import mock_aws  # noqa: E402
+import awsClients  # noqa: E402
+import dynamoUtils  # noqa: E402
+import refCache  # noqa: E402
+import progressSummary  # noqa: E402
+import getStudentInfo  # noqa: E402
+import getStudentDashboard  # noqa: E402
+import getStudentSkillsSummary  # noqa: E402
+from progressSummary import PROGRESS_SUMMARY_TABLE, get_summary, get_summaries  # noqa: E402
+
+# ProgressSummary บน moto (mock_aws): GET ต้องไม่สร้างแถวให้นักศึกษาที่ไม่มีใน Students
+# และ summary ต้อง rebuild เมื่อ yearLevel ใน Students เปลี่ยน
+SKILLS = [
+    {'skillId': 'S1', 'isRequired': True, 'yearLevel': 1},
+    {'skillId': 'S2', 'isRequired': True, 'yearLevel': 2},
+    {'skillId': 'S3', 'isRequired': True, 'yearLevel': 2},
+    {'skillId': 'S4', 'isRequired': False, 'yearLevel': 1},
+]
+
+
+class ProgressSummaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+
+        # session ใหม่หลัง import moto (session ที่สร้างก่อนหน้า เช่นของ awsClients ไม่ผ่าน mock)
+        session = boto3.session.Session(region_name='us-east-1')
+        self.dynamodb = session.resource('dynamodb')
+        for module in (dynamoUtils, refCache, progressSummary, getStudentInfo):
+            patcher = mock.patch.object(module, 'dynamodb', self.dynamodb)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(awsClients._clients, {'dynamodb': session.client('dynamodb')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        refCache.invalidate()
+        self.addCleanup(refCache.invalidate)
+
+        self.create_table('Students', 'studentId')
+        self.create_table('Skills', 'skillId')
+        self.create_table(PROGRESS_SUMMARY_TABLE, 'studentId')
+        self.create_table('CompletedSkills', 'studentId', 'skillId')
+
+        for skill in SKILLS:
+            self.dynamodb.Table('Skills').put_item(Item=skill)
+        self.dynamodb.Table('Students').put_item(Item={'studentId': '6500000001', 'name': 'A', 'yearLevel': 1})
+        for skill_id in ('S1', 'S2'):
+            self.dynamodb.Table('CompletedSkills').put_item(Item={'studentId': '6500000001', 'skillId': skill_id})
+
+    def create_table(self, name, hash_key, range_key=None):
+        keys = [(hash_key, 'HASH')] + ([(range_key, 'RANGE')] if range_key else [])
+        self.dynamodb.create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': key, 'KeyType': key_type} for key, key_type in keys],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'} for key, _ in keys],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    def stored_summaries(self):
+        return {item['studentId']: item for item in self.dynamodb.Table(PROGRESS_SUMMARY_TABLE).scan()['Items']}
+
+    def set_year_level(self, year_level):
+        self.dynamodb.Table('Students').update_item(
+            Key={'studentId': '6500000001'},
+            UpdateExpression='SET yearLevel = :year',
+            ExpressionAttributeValues={':year': year_level}
+        )
+
+    def test_summary_is_built_and_saved_for_existing_student(self):
+        summary = get_summary('6500000001')
+
+        self.assertEqual((summary['completedRequiredSkills'], summary['completedOptionalSkills']), (1, 1))
+        self.assertEqual(self.stored_summaries()['6500000001']['yearLevel'], 1)
+
+    def test_dashboard_of_unknown_student_writes_nothing(self):
+        response = getStudentDashboard.lambda_handler({'pathParameters': {'studentId': 'nobody'}}, None)
+
+        self.assertEqual(response['statusCode'], 404)
+        self.assertEqual(self.stored_summaries(), {})
+
+    def test_skills_summary_of_unknown_student_is_computed_without_saving(self):
+        response = getStudentSkillsSummary.lambda_handler({'pathParameters': {'studentId': 'ghost'}}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(self.stored_summaries(), {})
+
+    def test_summary_is_rebuilt_when_year_level_changes(self):
+        get_summary('6500000001')
+        self.set_year_level(2)
+
+        summary = get_summary('6500000001')
+
+        # ชั้นปี 2: บังคับ S2, S3 -> ได้ S2 แล้ว ส่วน S1 (บังคับของปี 1) นับเป็นทักษะเสริม
+        self.assertEqual(summary['yearLevel'], 2)
+        self.assertEqual(summary['totalRequiredSkills'], 2)
+        self.assertEqual((summary['completedRequiredSkills'], summary['completedOptionalSkills']), (1, 1))
+        self.assertEqual(summary['completedSkillIds'], {'S1', 'S2'})
+        self.assertEqual(self.stored_summaries()['6500000001']['pendingSkillIds'], {'S3'})
+
+    def test_get_summaries_rebuilds_stale_and_skips_unknown_students(self):
+        get_summary('6500000001')
+        self.set_year_level(2)
+
+        summaries = get_summaries(['6500000001', 'ghost'])
+
+        self.assertEqual(summaries['6500000001']['yearLevel'], 2)
+        self.assertEqual(summaries['ghost']['completedRequiredSkills'], 0)
+        self.assertEqual(set(self.stored_summaries()), {'6500000001'})
+        self.assertEqual(self.stored_summaries()['6500000001']['yearLevel'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('QUIZ_TOKEN_SECRET', 'test-secret')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quizToken  # noqa: E402
+from quizToken import (  # noqa: E402
+    issue_quiz_token, verify_quiz_token, grade_answers, QuizTokenError, QuizTokenConfigError, _b64encode, _b64decode
+)
+
+STUDENT_ID = '6500000001'
+SKILL_ID = 'SKILL001'
+QUESTIONS = [
+    {'questionId': 'Q1', 'correctAnswer': 'A', 'options': ['A. 1', 'B. 2', 'C. 3', 'D. 4']},
+    {'questionId': 'Q2', 'correctAnswer': 'C', 'options': ['A. 1', 'B. 2', 'C. 3']},
+    {'questionId': 'Q3', 'correctAnswer': 'B. สอง', 'options': ['A. 1', 'B. 2']},
+]
+
+
+def _edit_payload(token, **changes):
+    """แก้ payload ของ token โดยคงลายเซ็นเดิมไว้ (แบบที่ client แก้เอง)"""
+    body, signature = token.split('.', 1)
+    payload = dict(json.loads(_b64decode(body)), **changes)
+    return f"{_b64encode(json.dumps(payload).encode('utf-8'))}.{signature}"
+
+
+class VerifyQuizTokenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.token = issue_quiz_token(STUDENT_ID, SKILL_ID, QUESTIONS, 15)
+
+    def test_valid_token_returns_the_questions(self):
+        payload = verify_quiz_token(self.token, STUDENT_ID, SKILL_ID)
+        self.assertEqual(payload['q'], ['Q1', 'Q2', 'Q3'])
+
+    def test_forged_signature_is_rejected(self):
+        body, signature = self.token.split('.', 1)
+        forged = f"{body}.{'A' if signature[0] != 'A' else 'B'}{signature[1:]}"
+        with self.assertRaises(QuizTokenError):
+            verify_quiz_token(forged, STUDENT_ID, SKILL_ID)
+
+    def test_token_signed_with_another_secret_is_rejected(self):
+        with mock.patch.object(quizToken, 'QUIZ_TOKEN_SECRET', 'another-secret'):
+            other = issue_quiz_token(STUDENT_ID, SKILL_ID, QUESTIONS, 15)
+        with self.assertRaises(QuizTokenError):
+            verify_quiz_token(other, STUDENT_ID, SKILL_ID)
+
+    def test_changed_question_ids_are_rejected(self):
+        with self.assertRaises(QuizTokenError):
+            verify_quiz_token(_edit_payload(self.token, q=['Q9', 'Q2', 'Q3']), STUDENT_ID, SKILL_ID)
+
+    def test_extended_expiry_is_rejected(self):
+        with self.assertRaises(QuizTokenError):
+            verify_quiz_token(_edit_payload(self.token, exp=int(time.time()) + 86400), STUDENT_ID, SKILL_ID)
+
+    def test_expired_token_is_rejected(self):
+        expired_at = time.time() + 15 * 60 + quizToken.QUIZ_TOKEN_GRACE_SECONDS + 1
+        with mock.patch.object(quizToken.time, 'time', return_value=expired_at):
+            with self.assertRaises(QuizTokenError):
+                verify_quiz_token(self.token, STUDENT_ID, SKILL_ID)
+
+    def test_token_within_grace_period_is_accepted(self):
+        within_grace = time.time() + 15 * 60 + quizToken.QUIZ_TOKEN_GRACE_SECONDS - 5
+        with mock.patch.object(quizToken.time, 'time', return_value=within_grace):
+            self.assertEqual(verify_quiz_token(self.token, STUDENT_ID, SKILL_ID)['sid'], STUDENT_ID)
+
+    def test_token_of_another_student_is_rejected(self):
+        with self.assertRaises(QuizTokenError):
+            verify_quiz_token(self.token, '6500000002', SKILL_ID)
+
+    def test_token_of_another_skill_is_rejected(self):
+        with self.assertRaises(QuizTokenError):
+            verify_quiz_token(self.token, STUDENT_ID, 'SKILL002')
+
+    def test_malformed_token_is_rejected(self):
+        for token in ('', 'no-dot', 'a.b', None):
+            with self.assertRaises(QuizTokenError):
+                verify_quiz_token(token, STUDENT_ID, SKILL_ID)
+
+    def test_missing_secret_raises_config_error(self):
+        with mock.patch.object(quizToken, 'QUIZ_TOKEN_SECRET', ''):
+            with self.assertRaises(QuizTokenConfigError):
+                issue_quiz_token(STUDENT_ID, SKILL_ID, QUESTIONS, 15)
+            with self.assertRaises(QuizTokenConfigError):
+                verify_quiz_token(self.token, STUDENT_ID, SKILL_ID)
+
+
+class GradeAnswersTest(unittest.TestCase):
+
+    def setUp(self):
+        token = issue_quiz_token(STUDENT_ID, SKILL_ID, QUESTIONS, 15)
+        self.payload = verify_quiz_token(token, STUDENT_ID, SKILL_ID)
+
+    def test_grades_against_the_answer_key(self):
+        results = grade_answers(self.payload, [
+            {'questionId': 'Q1', 'selectedAnswer': 'A. 1'},
+            {'questionId': 'Q2', 'selectedAnswer': 'b'},
+            {'questionId': 'Q3', 'selectedAnswer': 'B'},
+        ])
+        self.assertEqual([r['isCorrect'] for r in results], [True, False, True])
+        self.assertEqual([r['correctAnswer'] for r in results], ['A', 'C', 'B'])
+
+    def test_unanswered_questions_count_as_wrong(self):
+        results = grade_answers(self.payload, [{'questionId': 'Q1', 'selectedAnswer': 'A'}])
+
+        self.assertEqual(len(results), len(QUESTIONS))
+        self.assertEqual([r['isCorrect'] for r in results], [True, False, False])
+        self.assertEqual([r['selectedAnswer'] for r in results], ['A', None, None])
+
+    def test_answers_to_questions_outside_the_token_are_ignored(self):
+        results = grade_answers(self.payload, [
+            {'questionId': 'Q9', 'selectedAnswer': 'A'},
+            {'questionId': 'Q1', 'selectedAnswer': 'A'},
+        ])
+        self.assertEqual([r['questionId'] for r in results], ['Q1', 'Q2', 'Q3'])
+        self.assertEqual(sum(1 for r in results if r['isCorrect']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
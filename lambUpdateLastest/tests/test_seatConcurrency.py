@@ -0,0 +1,215 @@
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.pop('AWS_ENDPOINT_URL_DYNAMODB', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boto3  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+from moto import mock_aws  # noqa: E402
+import awsClients  # noqa: E402
+import cancelRegistration  # noqa: E402
+import dynamoUtils  # noqa: E402
+import participationUtils  # noqa: E402
+from participationUtils import (  # noqa: E402
+    register_with_capacity, release_seat, make_participation_id,
+    PARTICIPATIONS_TABLE, PARTICIPATION_INDEX, ACTIVITY_PARTICIPATION_INDEX, STATUS_REGISTERED, STATUS_WAITLISTED
+)
+
+# ตาราง Activities/ActivityParticipations บน moto (mock_aws) ใช้ TransactWriteItems และ ConditionExpression จริง
+# ของ participationUtils (_SEAT_UPDATE ฯลฯ) ทดสอบว่าการลงทะเบียนพร้อมกันไม่ได้ที่นั่งเกิน capacity
+# moto ใน process ไม่ thread-safe จึงส่ง request ทีละตัวผ่าน lock (แทน DynamoDB ที่ตัดสินแต่ละ write แบบ atomic)
+# ลำดับของ request ระหว่าง thread ยังสลับกันได้ทุกแบบ
+
+
+def _serialize_requests(client, lock):
+    send = client._make_api_call
+
+    def locked(operation_name, params):
+        with lock:
+            return send(operation_name, params)
+
+    return mock.patch.object(client, '_make_api_call', locked)
+
+
+class SeatTestCase(unittest.TestCase):
+    ACTIVITY_ID = 'ACT001'
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+
+        # session ใหม่หลัง import moto (session ที่สร้างก่อนหน้า เช่นของ awsClients ไม่ผ่าน mock)
+        session = boto3.session.Session(region_name='us-east-1')
+        self.dynamodb = session.resource('dynamodb')
+        for module in (dynamoUtils, participationUtils, cancelRegistration):
+            patcher = mock.patch.object(module, 'dynamodb', self.dynamodb)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        client = session.client('dynamodb')
+        patcher = mock.patch.dict(awsClients._clients, {'dynamodb': client})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        lock = threading.Lock()
+        for client in (self.dynamodb.meta.client, client):
+            patcher = _serialize_requests(client, lock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.dynamodb.create_table(
+            TableName='Activities',
+            KeySchema=[{'AttributeName': 'activityId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'activityId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        self.dynamodb.create_table(
+            TableName=PARTICIPATIONS_TABLE,
+            KeySchema=[
+                {'AttributeName': 'participationId', 'KeyType': 'HASH'},
+                {'AttributeName': 'activityId', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': name, 'AttributeType': 'S'}
+                for name in ('participationId', 'activityId', 'studentId', 'registeredAt')
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': index_name,
+                    'KeySchema': [
+                        {'AttributeName': hash_key, 'KeyType': 'HASH'},
+                        {'AttributeName': range_key, 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+                for index_name, hash_key, range_key in (
+                    (PARTICIPATION_INDEX, 'studentId', 'activityId'),
+                    (ACTIVITY_PARTICIPATION_INDEX, 'activityId', 'registeredAt'),
+                )
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    def create_activity(self, capacity):
+        self.dynamodb.Table('Activities').put_item(Item={'activityId': self.ACTIVITY_ID, 'capacity': capacity})
+
+    def registered_count(self):
+        item = self.dynamodb.Table('Activities').get_item(Key={'activityId': self.ACTIVITY_ID})['Item']
+        return item.get('registeredCount', 0)
+
+    def participations(self):
+        return self.dynamodb.Table(PARTICIPATIONS_TABLE).scan()['Items']
+
+    def participation(self, student_id, n=0):
+        return {
+            'participationId': make_participation_id(student_id, self.ACTIVITY_ID),
+            'activityId': self.ACTIVITY_ID,
+            'studentId': student_id,
+            'registeredAt': f'2026-01-01T00:00:00.{n:06d}Z',
+            'isConfirmed': False,
+        }
+
+    def register_all(self, student_ids, workers=32):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda n: register_with_capacity(self.participation(student_ids[n], n)), range(len(student_ids))
+            ))
+
+    def stored(self, student_id):
+        return next(p for p in self.participations() if p['studentId'] == student_id)
+
+
+class RegisterWithCapacityConcurrencyTest(SeatTestCase):
+
+    def test_parallel_registrations_grant_exactly_capacity_seats(self):
+        capacity = 10
+        self.create_activity(capacity)
+        student_ids = [f'65{n:08d}' for n in range(200)]
+
+        statuses = self.register_all(student_ids)
+
+        self.assertEqual(statuses.count(STATUS_REGISTERED), capacity)
+        self.assertEqual(statuses.count(STATUS_WAITLISTED), len(student_ids) - capacity)
+        self.assertEqual(self.registered_count(), capacity)
+        registered = [p for p in self.participations() if p['status'] == STATUS_REGISTERED]
+        self.assertEqual(len(registered), capacity)
+
+    def test_parallel_duplicate_registrations_take_one_seat(self):
+        self.create_activity(5)
+
+        statuses = self.register_all(['6500000001'] * 50)
+
+        self.assertEqual(statuses.count(STATUS_REGISTERED), 1)
+        self.assertEqual(statuses.count(None), 49)
+        self.assertEqual(self.registered_count(), 1)
+
+
+class ReleaseSeatTest(SeatTestCase):
+
+    def test_freed_seat_goes_to_the_waitlist_before_newcomers(self):
+        self.create_activity(1)
+        self.register_all(['6500000001', '6500000002'], workers=1)
+
+        promoted = release_seat(self.stored('6500000001'), '2026-01-02T00:00:00+07:00')
+
+        self.assertEqual(promoted['studentId'], '6500000002')
+        self.assertEqual(self.stored('6500000002')['status'], STATUS_REGISTERED)
+        self.assertEqual(self.registered_count(), 1)
+        self.assertEqual(register_with_capacity(self.participation('6500000003', 3)), STATUS_WAITLISTED)
+
+    def test_release_without_waitlist_returns_the_seat(self):
+        self.create_activity(1)
+        self.register_all(['6500000001'], workers=1)
+
+        self.assertIsNone(release_seat(self.stored('6500000001'), '2026-01-02T00:00:00+07:00'))
+
+        self.assertEqual(self.registered_count(), 0)
+        self.assertEqual(self.participations(), [])
+
+    def test_release_of_confirmed_participation_is_cancelled(self):
+        self.create_activity(1)
+        self.register_all(['6500000001', '6500000002'], workers=1)
+        participation = self.stored('6500000001')
+        self.dynamodb.Table(PARTICIPATIONS_TABLE).update_item(
+            Key={'participationId': participation['participationId'], 'activityId': self.ACTIVITY_ID},
+            UpdateExpression='SET isConfirmed = :true',
+            ExpressionAttributeValues={':true': True}
+        )
+
+        with self.assertRaises(ClientError) as raised:
+            release_seat(participation, '2026-01-02T00:00:00+07:00')
+
+        self.assertEqual(dynamoUtils.cancellation_reasons(raised.exception)[0], 'ConditionalCheckFailed')
+        self.assertEqual(self.stored('6500000002')['status'], STATUS_WAITLISTED)
+        self.assertEqual(self.registered_count(), 1)
+
+    def test_cancel_returns_409_when_confirmed_meanwhile(self):
+        self.create_activity(1)
+        self.register_all(['6500000001'], workers=1)
+        stale = self.stored('6500000001')
+        self.dynamodb.Table(PARTICIPATIONS_TABLE).update_item(
+            Key={'participationId': stale['participationId'], 'activityId': self.ACTIVITY_ID},
+            UpdateExpression='SET isConfirmed = :true',
+            ExpressionAttributeValues={':true': True}
+        )
+
+        with mock.patch.object(cancelRegistration, 'find_participation', return_value=stale):
+            response = cancelRegistration.lambda_handler({
+                'httpMethod': 'POST',
+                'pathParameters': {'activityId': self.ACTIVITY_ID},
+                'body': '{"studentId": "6500000001"}'
+            }, None)
+
+        self.assertEqual(response['statusCode'], 409)
+        self.assertEqual(self.registered_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,26 @@
+import os
 import json
-import boto3
-import decimal
-from datetime import datetime, timedelta, timezone
-from botocore.exceptions import ClientError
+import time
+from datetime import datetime
+from botocore.exceptions import ClientError, BotoCoreError
+from dynamoUtils import scan_items, query_items, deserialize_item, index_missing
+from participationUtils import make_participation_id, STATUS_WAITLISTED
+from activityTime import THAI_TZ, to_epoch
+from awsClients import dynamodb
+from jsonUtils import dumps, event_body, JSON_CONTENT_TYPE
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+# ตัวนับกิจกรรมที่ยืนยันแล้วต่อ (studentId, skillId) ใช้ตรวจสิทธิ์ทำแบบทดสอบ
+SKILL_COUNTS_TABLE = os.getenv('SKILL_COUNTS_TABLE', 'StudentSkillActivityCounts')
+
+# GSI บน Activities (partition key = qrCode) สำหรับหา activity จาก QR Code
+QR_CODE_INDEX = os.getenv('QR_CODE_INDEX', 'qrCode-index')
+QR_CACHE_TTL = int(os.getenv('QR_CACHE_TTL', '300'))  # วินาที
+CHECKIN_WINDOW_MINUTES = 30
+
+# qrCode -> {'activity': {...}, 'loadedAt': float} อยู่ข้าม warm invocation
+# ตอนเริ่มกิจกรรมใหญ่ ๆ นักศึกษาหลายร้อยคนสแกน QR เดียวกัน จึงไม่ต้องอ่าน Activities ซ้ำ
+_qr_cache = {}
 
-# Helper class to convert a DynamoDB item to JSON
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, decimal.Decimal):
-            if o % 1 > 0:
-                return float(o)
-            else:
-                return int(o)
-        return super(DecimalEncoder, self).default(o)
 
 def lambda_handler(event, context):
     """
@@ -26,6 +31,7 @@ def lambda_handler(event, context):
     # CORS headers
     headers = {
         'Access-Control-Allow-Origin': '*',
+        'Content-Type': JSON_CONTENT_TYPE,
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
         'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
@@ -44,13 +50,13 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'ข้อมูลไม่ครบถ้วน'
                 })
             }
         
-        request_body = json.loads(event.get('body'))
+        request_body = json.loads(event_body(event))
         qr_code = request_body.get('qrCode')
         student_id = request_body.get('studentId')
         
@@ -58,7 +64,7 @@ def lambda_handler(event, context):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'ต้องระบุ QR Code และรหัสนักศึกษา'
                 })
@@ -67,139 +73,65 @@ def lambda_handler(event, context):
         print(f"Verifying QR Code: {qr_code} for student: {student_id}")
         
         # Connect to DynamoDB tables
-        activities_table = dynamodb.Table('Activities')
         participations_table = dynamodb.Table('ActivityParticipations')
         
-        # Step 1: Find activity by QR code
+        # Step 1: Find activity by QR code (cache -> GSI)
         print("Step 1: Finding activity by QR code...")
-        activities_response = activities_table.scan(
-            FilterExpression='qrCode = :qrCode',
-            ExpressionAttributeValues={
-                ':qrCode': qr_code
-            }
-        )
-        
-        activities = activities_response.get('Items', [])
+        activity = find_activity_by_qr(qr_code)
         
-        if not activities:
+        if not activity:
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
                     'message': 'ไม่พบกิจกรรมที่ตรงกับ QR Code นี้'
                 })
             }
         
-        activity = activities[0]  # เอากิจกรรมแรกที่เจอ
         activity_id = activity['activityId']
         
         print(f"Found activity: {activity.get('name')} (ID: {activity_id})")
         
-        # Step 2: Check if student is registered for this activity
-        print("Step 2: Checking student registration...")
-        participations_response = participations_table.scan(
-            FilterExpression='studentId = :studentId AND activityId = :activityId',
-            ExpressionAttributeValues={
-                ':studentId': student_id,
-                ':activityId': activity_id
-            }
-        )
-        
-        participations = participations_response.get('Items', [])
-        
-        if not participations:
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'message': 'คุณยังไม่ได้ลงทะเบียนกิจกรรมนี้'
-                })
-            }
-        
-        participation = participations[0]
-        participation_id = participation['participationId']
-        
-        print(f"Found participation: {participation_id}")
-        
-        # Step 3: Check if already confirmed
-        if participation.get('isConfirmed', False):
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'message': 'คุณได้ยืนยันการเข้าร่วมกิจกรรมนี้แล้ว'
-                })
-            }
-        
-        # Step 4: Check timing - can confirm from 30 minutes before start until 30 minutes after start
-        print("Step 4: Checking timing...")
+        # Step 2: Check timing - can confirm from 30 minutes before start until 30 minutes after start
+        print("Step 2: Checking timing...")
         
         # ใช้เวลาไทย (UTC+7)
-        thai_tz = timezone(timedelta(hours=7))
-        current_time = datetime.now(thai_tz)
-        
-        # Parse activity start time
-        activity_start_str = activity.get('startDateTime')
-        if activity_start_str:
-            # ถ้าข้อมูลใน database เป็นเวลาไทยอยู่แล้ว
-            try:
-                if activity_start_str.endswith('Z'):
-                    # ถ้ามี Z แสดงว่าเป็น UTC ให้แปลงเป็นไทย
-                    activity_start_str_clean = activity_start_str[:-1]
-                    activity_start_utc = datetime.fromisoformat(activity_start_str_clean)
-                    activity_start = activity_start_utc.replace(tzinfo=timezone.utc).astimezone(thai_tz)
-                elif '+07:00' in activity_start_str or '+0700' in activity_start_str:
-                    # ถ้าเป็นเวลาไทยอยู่แล้ว
-                    activity_start = datetime.fromisoformat(activity_start_str)
-                else:
-                    # ถ้าไม่มี timezone แสดงว่าเป็นเวลาไทยอยู่แล้ว
-                    activity_start = datetime.fromisoformat(activity_start_str)
-                    activity_start = activity_start.replace(tzinfo=thai_tz)
-                
-                # Allow confirmation from 30 minutes before start until 30 minutes after start
-                confirm_start = activity_start - timedelta(minutes=30)
-                confirm_end = activity_start + timedelta(minutes=30)
-                
-                print(f"Current time (Thai): {current_time}")
-                print(f"Activity start (Thai): {activity_start}")
-                print(f"Confirm window: {confirm_start} to {confirm_end}")
-                
-                if current_time < confirm_start:
-                    minutes_until = int((confirm_start - current_time).total_seconds() / 60)
-                    return {
-                        'statusCode': 400,
-                        'headers': headers,
-                        'body': json.dumps({
-                            'success': False,
-                            'message': f'ยังไม่ถึงเวลายืนยันการเข้าร่วม สามารถยืนยันได้ใน {minutes_until} นาที'
-                        })
-                    }
-                
-                if current_time > confirm_end:
-                    return {
-                        'statusCode': 400,
-                        'headers': headers,
-                        'body': json.dumps({
-                            'success': False,
-                            'message': 'หมดเวลายืนยันการเข้าร่วมแล้ว (สามารถยืนยันได้ภายใน 30 นาทีหลังเริ่มกิจกรรม)'
-                        })
-                    }
-            except Exception as e:
-                print(f"Error parsing activity time: {e}")
+        current_time = datetime.now(THAI_TZ)
+        now_epoch = int(current_time.timestamp())
         
-        # Step 5: Update participation record
-        print("Step 5: Updating participation record...")
+        confirm_window = get_confirm_window(activity)
+        if confirm_window:
+            confirm_start_epoch, confirm_end_epoch = confirm_window
+            
+            if now_epoch < confirm_start_epoch:
+                minutes_until = int((confirm_start_epoch - now_epoch) / 60)
+                return {
+                    'statusCode': 400,
+                    'headers': headers,
+                    'body': dumps({
+                        'success': False,
+                        'message': f'ยังไม่ถึงเวลายืนยันการเข้าร่วม สามารถยืนยันได้ใน {minutes_until} นาที'
+                    })
+                }
+            
+            if now_epoch > confirm_end_epoch:
+                return {
+                    'statusCode': 400,
+                    'headers': headers,
+                    'body': dumps({
+                        'success': False,
+                        'message': 'หมดเวลายืนยันการเข้าร่วมแล้ว (สามารถยืนยันได้ภายใน 30 นาทีหลังเริ่มกิจกรรม)'
+                    })
+                }
         
-        # บันทึกเป็นเวลาไทย - เลือกรูปแบบที่ตรงกับ database
-        # ตัวเลือก 1: ถ้า database ใช้รูปแบบ +07:00
+        # Step 3: Update participation record
+        # participationId คำนวณจาก (studentId, activityId) จึงเขียนตรงด้วย key ได้เลย ไม่ต้องค้นหาก่อน
+        # ConditionExpression ตรวจว่าลงทะเบียนแล้ว ไม่ใช่รายชื่อสำรอง และยังไม่ถูกยืนยัน (กันสแกนซ้ำพร้อมกัน)
+        print("Step 3: Updating participation record...")
+        participation_id = make_participation_id(student_id, activity_id)
         current_time_str = current_time.isoformat()
         
-        # ตัวเลือก 2: ถ้า database ยังใช้รูปแบบ Z แต่เป็นเวลาไทย (ไม่แนะนำ)
-        # current_time_str = current_time.strftime('%Y-%m-%dT%H:%M:%SZ')
-        
         try:
             # ตาราง ActivityParticipations ใช้ Composite Key: participationId + activityId
             participations_table.update_item(
@@ -208,43 +140,61 @@ def lambda_handler(event, context):
                     'activityId': activity_id
                 },
                 UpdateExpression='SET isConfirmed = :confirmed, confirmedAt = :confirmedAt, updatedAt = :updatedAt',
+                ConditionExpression='attribute_exists(participationId) AND '
+                                    '(attribute_not_exists(#status) OR #status <> :waitlisted) AND '
+                                    '(attribute_not_exists(isConfirmed) OR isConfirmed = :notConfirmed)',
+                ExpressionAttributeNames={'#status': 'status'},
                 ExpressionAttributeValues={
                     ':confirmed': True,
+                    ':notConfirmed': False,
+                    ':waitlisted': STATUS_WAITLISTED,
                     ':confirmedAt': current_time_str,
                     ':updatedAt': current_time_str
-                }
+                },
+                # ถ้าเงื่อนไขไม่ผ่าน ให้คืน item เดิมมาด้วย จะได้บอกเหตุผลได้โดยไม่ต้องอ่านซ้ำ
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
             )
-            
-            print(f"Successfully updated participation {participation_id}")
-            
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': True,
-                    'message': f'ยืนยันการเข้าร่วมกิจกรรม "{activity.get("name")}" สำเร็จ!',
-                    'activityId': activity_id,
-                    'activityName': activity.get('name'),
-                    'confirmedAt': current_time_str
-                })
-            }
-            
         except ClientError as e:
-            print(f"Error updating participation: {str(e)}")
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error updating participation: {str(e)}")
+                return {
+                    'statusCode': 500,
+                    'headers': headers,
+                    'body': dumps({
+                        'success': False,
+                        'message': 'เกิดข้อผิดพลาดในการบันทึกข้อมูล'
+                    })
+                }
             return {
-                'statusCode': 500,
+                'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': dumps({
                     'success': False,
-                    'message': 'เกิดข้อผิดพลาดในการบันทึกข้อมูล'
+                    'message': confirm_failed_message(e.response.get('Item'))
                 })
             }
         
+        print(f"Successfully updated participation {participation_id}")
+        
+        increment_skill_count(student_id, activity.get('skillId'), activity_id, current_time_str)
+        
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': dumps({
+                'success': True,
+                'message': f'ยืนยันการเข้าร่วมกิจกรรม "{activity.get("name")}" สำเร็จ!',
+                'activityId': activity_id,
+                'activityName': activity.get('name'),
+                'confirmedAt': current_time_str
+            })
+        }
+        
     except json.JSONDecodeError:
         return {
             'statusCode': 400,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'success': False,
                 'message': 'รูปแบบข้อมูลไม่ถูกต้อง'
             })
@@ -254,8 +204,100 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'success': False,
                 'message': 'เกิดข้อผิดพลาดที่ไม่คาดคิด'
             })
-        }
\ No newline at end of file
+        }
+
+def confirm_failed_message(old_item):
+    """
+    เหตุผลที่ยืนยันไม่ได้ จาก item เดิม (DynamoDB JSON จาก ReturnValuesOnConditionCheckFailure)
+    ไม่มี item = ยังไม่ได้ลงทะเบียน
+    """
+    if not old_item:
+        return 'คุณยังไม่ได้ลงทะเบียนกิจกรรมนี้'
+    participation = deserialize_item(old_item)
+    if participation.get('status') == STATUS_WAITLISTED:
+        return 'คุณอยู่ในรายชื่อสำรองของกิจกรรมนี้ ยังไม่สามารถยืนยันการเข้าร่วมได้'
+    return 'คุณได้ยืนยันการเข้าร่วมกิจกรรมนี้แล้ว'
+
+def increment_skill_count(student_id, skill_id, activity_id, updated_at):
+    """
+    เพิ่มตัวนับกิจกรรมที่ยืนยันแล้วของ (studentId, skillId) แบบ atomic
+    จำ activityId ที่นับแล้วไว้ใน activityIds: ถ้า botocore retry หลัง timeout ทั้งที่ครั้งแรกเขียนสำเร็จ จะไม่นับซ้ำ
+    ถ้าพลาดจะไม่ทำให้การยืนยันล้มเหลว (รัน backfillSkillActivityCounts เพื่อซ่อมได้)
+    """
+    if not skill_id:
+        return
+    try:
+        dynamodb.Table(SKILL_COUNTS_TABLE).update_item(
+            Key={'studentId': student_id, 'skillId': skill_id},
+            UpdateExpression='ADD confirmedCount :one, activityIds :activitySet SET updatedAt = :updatedAt',
+            ConditionExpression='attribute_not_exists(activityIds) OR NOT contains(activityIds, :activityId)',
+            ExpressionAttributeValues={
+                ':one': 1,
+                ':activitySet': {activity_id},
+                ':activityId': activity_id,
+                ':updatedAt': updated_at
+            }
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return    # กิจกรรมนี้นับไปแล้ว
+        print(f"Error updating skill activity count: {str(e)}")
+    except BotoCoreError as e:
+        # connection/timeout error: การยืนยันถูกบันทึกไปแล้ว ต้องตอบสำเร็จ
+        print(f"Error updating skill activity count: {str(e)}")
+
+def find_activity_by_qr(qr_code):
+    """หา activity จาก QR Code: ใช้ cache ก่อน ถ้าไม่มีค่อย query GSI (ยังไม่ได้สร้าง GSI -> scan, ดู createActivityQrIndex.py)"""
+    now = time.time()
+    cached = _qr_cache.get(qr_code)
+    if cached and now - cached['loadedAt'] < QR_CACHE_TTL:
+        return cached['activity']
+    
+    try:
+        activity = next(query_items(
+            'Activities',
+            IndexName=QR_CODE_INDEX,
+            KeyConditionExpression='qrCode = :qrCode',
+            ExpressionAttributeValues={':qrCode': qr_code}
+        ), None)
+    except ClientError as e:
+        if not index_missing(e):
+            raise
+        print(f"GSI query failed, falling back to scan: {str(e)}")
+        activity = next(scan_items(
+            'Activities',
+            FilterExpression='qrCode = :qrCode',
+            ExpressionAttributeValues={':qrCode': qr_code}
+        ), None)
+    
+    if activity:
+        _qr_cache[qr_code] = {'activity': activity, 'loadedAt': now}
+    return activity
+
+
+def get_confirm_window(activity):
+    """
+    ช่วงเวลาที่ยืนยันได้ (epoch seconds) = 30 นาทีก่อนเริ่มถึง 30 นาทีหลังเริ่ม
+    ใช้ค่า confirmStartEpoch/confirmEndEpoch ที่ addActivities คำนวณไว้ ถ้าไม่มีค่อยคำนวณจาก startDateTime
+    คืน None ถ้าไม่มีข้อมูลเวลา
+    """
+    if activity.get('confirmStartEpoch') is not None and activity.get('confirmEndEpoch') is not None:
+        return int(activity['confirmStartEpoch']), int(activity['confirmEndEpoch'])
+    
+    activity_start_str = activity.get('startDateTime')
+    if not activity_start_str:
+        return None
+    try:
+        start_epoch = to_epoch(activity_start_str)
+    except ValueError as e:
+        print(f"Error parsing activity time: {e}")
+        return None
+    
+    window = (start_epoch - CHECKIN_WINDOW_MINUTES * 60, start_epoch + CHECKIN_WINDOW_MINUTES * 60)
+    # เก็บไว้ใน activity ที่ cache ไว้ จะได้ไม่ต้อง parse ซ้ำ
+    activity['confirmStartEpoch'], activity['confirmEndEpoch'] = window
+    return window